@@ -0,0 +1,38 @@
+"""Add appointment keyset indexes
+
+Revision ID: 5e8b0c4d2a91
+Revises: 9d2f6a1c7b3e
+Create Date: 2026-10-18 11:03:27.118904
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5e8b0c4d2a91"
+down_revision: Union[str, None] = "9d2f6a1c7b3e"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    "ix_appointments_date_time_id": ["date", "time", "id"],
+    "ix_appointments_status_date_time_id": ["status", "date", "time", "id"],
+    "ix_appointments_employee_date_time_id": [
+        "employee_id", "date", "time", "id"
+    ],
+    "ix_appointments_vin_date_time_id": ["vin", "date", "time", "id"],
+}
+
+
+def upgrade() -> None:
+    for name, columns in INDEXES.items():
+        op.create_index(name, "appointments", columns, unique=False)
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="appointments")
@@ -0,0 +1,36 @@
+"""Add client prefix search indexes
+
+Revision ID: 9d2f6a1c7b3e
+Revises: 4c84cab5f818
+Create Date: 2026-10-18 10:12:41.503219
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9d2f6a1c7b3e"
+down_revision: Union[str, None] = "4c84cab5f818"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = {
+    "ix_clients_lower_name": "name",
+    "ix_clients_lower_email": "email",
+}
+
+
+def upgrade() -> None:
+    # text_pattern_ops lets LIKE 'prefix%' use the index under any collation.
+    ops = " text_pattern_ops" if op.get_bind().dialect.name == "postgresql" else ""
+    for name, column in INDEXES.items():
+        op.execute(f"CREATE INDEX {name} ON clients (lower({column}){ops})")
+
+
+def downgrade() -> None:
+    for name in INDEXES:
+        op.drop_index(name, table_name="clients")
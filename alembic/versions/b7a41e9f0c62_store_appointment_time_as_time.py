@@ -0,0 +1,43 @@
+"""Store appointment time as TIME
+
+Revision ID: b7a41e9f0c62
+Revises: 5e8b0c4d2a91
+Create Date: 2026-10-18 11:48:05.640273
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b7a41e9f0c62"
+down_revision: Union[str, None] = "5e8b0c4d2a91"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing values are "HH:MM:SS" or "HH:MM AM" strings, both of which
+    # PostgreSQL casts to TIME.
+    with op.batch_alter_table("appointments") as batch_op:
+        batch_op.alter_column(
+            "time",
+            existing_type=sa.String(),
+            type_=sa.Time(),
+            existing_nullable=False,
+            postgresql_using="time::time",
+        )
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("appointments") as batch_op:
+        batch_op.alter_column(
+            "time",
+            existing_type=sa.Time(),
+            type_=sa.String(),
+            existing_nullable=False,
+            postgresql_using="to_char(time, 'HH24:MI:SS')",
+        )
@@ -0,0 +1,43 @@
+"""Add the appointment rollup table of the dashboard summary
+
+Revision ID: e3c58d7a1f24
+Revises: b7a41e9f0c62
+Create Date: 2026-10-18 15:02:37.118204
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e3c58d7a1f24"
+down_revision: Union[str, None] = "b7a41e9f0c62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "appointment_rollups",
+        sa.Column("date", sa.Date(), nullable=False),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("service_type", sa.String(), nullable=False),
+        sa.Column("employee_id", sa.Integer(), nullable=False),
+        sa.Column("count", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("date", "status", "service_type", "employee_id"),
+    )
+    # Backfill; from here on the application keeps it up to date.
+    op.execute(
+        "INSERT INTO appointment_rollups "
+        "(date, status, service_type, employee_id, count) "
+        "SELECT date, status, service_type, employee_id, COUNT(*) "
+        "FROM appointments "
+        "GROUP BY date, status, service_type, employee_id"
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("appointment_rollups")
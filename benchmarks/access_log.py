@@ -0,0 +1,131 @@
+# backend/benchmarks/access_log.py
+"""
+Request throughput with the old body-buffering logging middleware vs the
+sampled ASGI access log.
+
+Both variants wrap the same small app and write their log lines to
+/dev/null, and requests are driven in-process through httpx's ASGI transport
+so the middleware cost is not hidden behind network overhead. Prints a JSON
+report. Example:
+
+    python benchmarks/access_log.py --requests 5000 --body-size 16384
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+
+import httpx
+from fastapi import FastAPI, Request
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from utils.access_log import AccessLogMiddleware, setup_access_log  # noqa: E402
+
+legacy_logger = logging.getLogger("benchmark.legacy")
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+
+    @app.post("/customers")
+    async def create_customer(payload: dict):
+        return {"id": 1, "name": payload.get("name")}
+
+    @app.get("/health")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def legacy_app() -> FastAPI:
+    app = build_app()
+
+    # The middleware formerly registered in main.py
+    @app.middleware("http")
+    async def log_request(request: Request, call_next):
+        body = await request.body()
+        legacy_logger.info(
+            f"Incoming Request: {request.method} {request.url} "
+            f"Body: {body.decode('utf-8')}"
+        )
+        response = await call_next(request)
+        return response
+
+    return app
+
+
+def access_log_app(sample_rate: float) -> FastAPI:
+    app = build_app()
+    app.add_middleware(
+        AccessLogMiddleware, sample_rate=sample_rate, body_paths=("/assist",)
+    )
+    return app
+
+
+async def run_variant(name: str, app: FastAPI, requests: int,
+                      concurrency: int, body_size: int) -> dict:
+    payload = {"name": "Jane Doe", "notes": "x" * body_size}
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        queue = asyncio.Queue()
+        for i in range(requests):
+            queue.put_nowait(i)
+
+        async def worker():
+            while not queue.empty():
+                i = queue.get_nowait()
+                if i % 2:
+                    await client.get("/health")
+                else:
+                    await client.post("/customers", json=payload)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+    return {
+        "variant": name,
+        "requests": requests,
+        "body_bytes": body_size,
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(requests / elapsed, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--body-size", type=int, default=16384)
+    parser.add_argument("--sample-rate", type=float, default=0.1)
+    args = parser.parse_args()
+
+    sink = logging.StreamHandler(open(os.devnull, "w"))
+    legacy_logger.addHandler(sink)
+    legacy_logger.setLevel(logging.INFO)
+    legacy_logger.propagate = False
+    setup_access_log(handlers=[sink])
+
+    variants = [
+        ("legacy_body_logging", legacy_app()),
+        ("access_log_full", access_log_app(1.0)),
+        (f"access_log_sampled_{args.sample_rate}",
+         access_log_app(args.sample_rate)),
+    ]
+    report = [
+        asyncio.run(run_variant(
+            name, app, args.requests, args.concurrency, args.body_size
+        ))
+        for name, app in variants
+    ]
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,167 @@
+# backend/benchmarks/assist_concurrency.py
+"""
+Concurrent-stream capacity of /assist: legacy sync endpoint vs async path.
+
+Starts the fake OpenAI server and the API (one uvicorn worker each, in child
+processes), opens `--streams` concurrent chats against each variant while probing /health, and prints a
+JSON report. Example:
+
+    python benchmarks/assist_concurrency.py --streams 500
+"""
+import argparse
+import asyncio
+import json
+import os
+import statistics
+import sys
+import time
+
+import httpx
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = 8901
+API_PORT = 8902
+
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{FAKE_PORT}/v1"
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-key")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark.db")
+
+from fastapi.responses import StreamingResponse  # noqa: E402
+from openai import OpenAI  # noqa: E402
+
+from benchmarks.fake_openai_server import (  # noqa: E402
+    start_server, stop_server,
+)
+from main import app  # noqa: E402
+from routes.assist import AssistRequest  # noqa: E402
+
+legacy_client = OpenAI(api_key=os.environ["OPENAI_API_KEY"])
+
+
+def legacy_assist(request: AssistRequest):
+    """The pre-async /assist: a sync generator over the blocking client."""
+
+    def generate():
+        stream = legacy_client.chat.completions.create(
+            model="gpt-4o-mini",
+            messages=[{"role": "user", "content": request.query}],
+            stream=True,
+        )
+        for chunk in stream:
+            if chunk.choices and chunk.choices[0].delta.content is not None:
+                yield chunk.choices[0].delta.content
+
+    return StreamingResponse(generate(), media_type="text/plain")
+
+
+app.add_api_route("/assist-legacy", legacy_assist, methods=["POST"])
+
+
+async def http_post(path: str, payload: dict, timeout: float) -> int:
+    """
+    POST over a fresh connection and drain the response; returns the status.
+
+    Plain asyncio streams keep the load generator cheap, so the server under
+    test and not the client's connection pool is what gets measured.
+    """
+    body = json.dumps(payload).encode()
+    reader, writer = await asyncio.open_connection("127.0.0.1", API_PORT)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+            + body
+        )
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        while await asyncio.wait_for(reader.read(65536), timeout):
+            pass
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def probe_health(client: httpx.AsyncClient, done: asyncio.Event):
+    latencies = []
+    while not done.is_set():
+        start = time.perf_counter()
+        try:
+            await client.get("/health")
+        except httpx.HTTPError:
+            pass
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(0.1)
+    return latencies
+
+
+async def run_variant(path: str, streams: int, timeout: float) -> dict:
+    base_url = f"http://127.0.0.1:{API_PORT}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout) as client:
+        await client.post(f"http://127.0.0.1:{FAKE_PORT}/stats/reset")
+
+        async def chat(i: int):
+            start = time.perf_counter()
+            try:
+                code = await http_post(
+                    path, {"query": f"{path} benchmark question {i}"}, timeout
+                )
+                return code == 200, time.perf_counter() - start
+            except (OSError, asyncio.TimeoutError):
+                return False, time.perf_counter() - start
+
+        done = asyncio.Event()
+        health_task = asyncio.create_task(probe_health(client, done))
+        start = time.perf_counter()
+        results = await asyncio.gather(*(chat(i) for i in range(streams)))
+        elapsed = time.perf_counter() - start
+        done.set()
+        health = await health_task
+        upstream = (await client.get(f"http://127.0.0.1:{FAKE_PORT}/stats")).json()
+
+    durations = sorted(d for ok, d in results if ok)
+    return {
+        "endpoint": path,
+        "streams": streams,
+        "completed": len(durations),
+        "wall_seconds": round(elapsed, 3),
+        "streams_per_second": round(len(durations) / elapsed, 1),
+        "peak_concurrent_upstream_streams": upstream["peak"],
+        "stream_seconds_p50": round(statistics.median(durations), 3)
+        if durations else None,
+        "stream_seconds_max": round(durations[-1], 3) if durations else None,
+        "health_ms_p50": round(statistics.median(health) * 1000, 1)
+        if health else None,
+        "health_ms_max": round(max(health) * 1000, 1) if health else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--streams", type=int, default=500)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--chunks", type=int, default=10)
+    parser.add_argument("--chunk-delay", type=float, default=0.2)
+    args = parser.parse_args()
+    os.environ["FAKE_OPENAI_CHUNKS"] = str(args.chunks)
+    os.environ["FAKE_OPENAI_CHUNK_DELAY"] = str(args.chunk_delay)
+
+    servers = [
+        start_server("benchmarks.fake_openai_server:app", FAKE_PORT),
+        start_server("benchmarks.assist_concurrency:app", API_PORT),
+    ]
+    try:
+        report = [
+            asyncio.run(run_variant(path, args.streams, args.timeout))
+            for path in ("/assist-legacy", "/assist")
+        ]
+    finally:
+        for server in servers:
+            stop_server(server)
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+# backend/benchmarks/async_reads.py
+"""
+Read-endpoint throughput: threadpool (sync session) vs async engine.
+
+Seeds a SQLite database, then runs the API under uvicorn once with
+DB_ASYNC_READS=0 and once with DB_ASYNC_READS=all. Every SQL statement
+sleeps `--latency-ms` in the thread that executes it (the threadpool worker
+or the aiosqlite connection thread), standing in for a slow PostgreSQL. The
+response cache is disabled so every request reaches the database. Example:
+
+    python benchmarks/async_reads.py --requests 2000 --concurrency 200
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import time
+from datetime import date, time as time_of_day, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+API_PORT = 8903
+
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-key")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./benchmark_reads.db")
+os.environ.setdefault("RESPONSE_CACHE_TTL", "0")
+os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+
+from sqlalchemy import event  # noqa: E402
+from sqlalchemy.engine import Engine  # noqa: E402
+
+from benchmarks.fake_openai_server import (  # noqa: E402
+    start_server, stop_server,
+)
+from benchmarks.harness import Request, run_load  # noqa: E402
+from main import app  # noqa: E402,F401
+from models.init_db import (  # noqa: E402
+    Appointment, Base, Client, Employee, SessionLocal, Vehicle, engine,
+)
+
+QUERY_LATENCY = float(os.getenv("BENCHMARK_QUERY_LATENCY_MS", "0")) / 1000
+
+
+def slow_statement(statement):
+    time.sleep(QUERY_LATENCY)
+
+
+@event.listens_for(Engine, "connect")
+def add_query_latency(dbapi_connection, connection_record):
+    if not QUERY_LATENCY:
+        return
+    if hasattr(dbapi_connection, "run_async"):
+        # aiosqlite: the callback runs in the connection's own thread
+        dbapi_connection.run_async(
+            lambda conn: conn.set_trace_callback(slow_statement)
+        )
+    else:
+        dbapi_connection.set_trace_callback(slow_statement)
+
+
+def seed(customers: int):
+    """Recreate the benchmark database with `customers` customers."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    today = date.today()
+    with SessionLocal() as db:
+        db.add_all(
+            Employee(
+                id=i, name=f"Tech {i}", email=f"tech{i}@example.com",
+                phone=f"555-1{i:04d}", password="x",
+            )
+            for i in range(1, 11)
+        )
+        for i in range(1, customers + 1):
+            vin = f"BENCHVIN{i:09d}"
+            db.add(Client(
+                id=i, name=f"Customer {i}", email=f"customer{i}@example.com",
+                phone=f"555-{i:07d}", password="x",
+            ))
+            db.add(Vehicle(
+                vin=vin, client_id=i, model="Air", year=2024, mileage=i,
+                warranty_exp=today + timedelta(days=700),
+                service_plan="Standard",
+            ))
+            db.add(Appointment(
+                vin=vin, date=today + timedelta(days=i % 30),
+                time=time_of_day(8 + i % 8, 30 * (i % 2)),
+                employee_id=1 + i % 10, service_type="Inspection",
+                status="Scheduled",
+            ))
+        db.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--latency-ms", type=float, default=250.0)
+    parser.add_argument("--pool-size", type=int, default=100)
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    seed(args.customers)
+    rng = random.Random(0)
+    requests = [
+        Request("GET", f"/customers/{rng.randint(1, args.customers)}")
+        if i % 2 else Request(
+            "GET", f"/appointments/?limit=20&employee_id={rng.randint(1, 10)}"
+        )
+        for i in range(args.requests)
+    ]
+    os.environ.update(
+        BENCHMARK_QUERY_LATENCY_MS=str(args.latency_ms),
+        DB_POOL_SIZE=str(args.pool_size),
+        DB_MAX_OVERFLOW="0",
+        DB_POOL_TIMEOUT=str(args.timeout),
+    )
+
+    report = []
+    for mode in ("0", "all"):
+        os.environ["DB_ASYNC_READS"] = mode
+        server = start_server("benchmarks.async_reads:app", API_PORT)
+        try:
+            result = asyncio.run(
+                run_load(API_PORT, requests, args.concurrency, args.timeout)
+            )
+        finally:
+            stop_server(server)
+        report.append({
+            "mode": "async" if mode == "all" else "threadpool",
+            "query_latency_ms": args.latency_ms,
+            "concurrency": args.concurrency,
+            "pool_size": args.pool_size,
+            **result,
+        })
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
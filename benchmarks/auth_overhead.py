@@ -0,0 +1,93 @@
+# backend/benchmarks/auth_overhead.py
+"""
+Per-request cost of get_current_user with and without the auth cache.
+
+Seeds a SQLite database with `--users` customers, issues one token each and
+authenticates `--requests` requests spread over those tokens, calling the
+dependency directly with a fresh session per request the way FastAPI does.
+Prints a JSON report. Example:
+
+    python benchmarks/auth_overhead.py --users 200 --requests 20000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+DB_PATH = os.path.join(tempfile.mkdtemp(), "auth_benchmark.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+
+from models.init_db import Base, Client, SessionLocal, engine  # noqa: E402
+from utils import auth  # noqa: E402
+from utils.auth_cache import AuthCache  # noqa: E402
+
+
+def seed(users: int) -> list:
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        db.add_all(
+            Client(
+                name=f"Customer {i}",
+                email=f"customer{i}@example.com",
+                phone="5550000000",
+                password="not-a-real-hash",
+            )
+            for i in range(users)
+        )
+        db.commit()
+        ids = [row.id for row in db.query(Client.id)]
+    return [
+        auth.create_access_token({"id": user_id, "role": "customer"})
+        for user_id in ids
+    ]
+
+
+def run_variant(name: str, cache: AuthCache, tokens: list,
+                requests: int) -> dict:
+    auth.auth_cache = cache
+    rng = random.Random(42)
+    latencies = []
+    for _ in range(requests):
+        token = rng.choice(tokens)
+        start = time.perf_counter()
+        db = SessionLocal()
+        try:
+            auth.get_current_user(token, db)
+        finally:
+            db.close()
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    return {
+        "variant": name,
+        "requests": requests,
+        "us_mean": round(statistics.fmean(latencies) * 1e6, 1),
+        "us_p50": round(latencies[len(latencies) // 2] * 1e6, 1),
+        "us_p99": round(latencies[int(len(latencies) * 0.99)] * 1e6, 1),
+        "requests_per_second": round(requests / sum(latencies), 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    tokens = seed(args.users)
+    report = [
+        run_variant("uncached", AuthCache(ttl=0), tokens, args.requests),
+        run_variant("cached", AuthCache(ttl=60), tokens, args.requests),
+    ]
+    print(json.dumps(report, indent=2))
+    os.remove(DB_PATH)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# backend/benchmarks/fake_openai_server.py
+"""
+Local stand-in for the OpenAI chat completions streaming API.
+
+Streams `FAKE_OPENAI_CHUNKS` server-sent events per request, sleeping
+`FAKE_OPENAI_CHUNK_DELAY` seconds between them, and keeps track of how many
+streams are open at once so benchmarks can report real concurrency.
+"""
+import asyncio
+import json
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+CHUNKS = int(os.getenv("FAKE_OPENAI_CHUNKS", "10"))
+CHUNK_DELAY = float(os.getenv("FAKE_OPENAI_CHUNK_DELAY", "0.2"))
+
+stats = {"active": 0, "peak": 0, "total": 0}
+
+
+def _event(content, finish_reason=None) -> str:
+    payload = {
+        "id": "chatcmpl-fake",
+        "object": "chat.completion.chunk",
+        "created": int(time.time()),
+        "model": "gpt-4o-mini",
+        "choices": [
+            {
+                "index": 0,
+                "delta": {} if content is None else {"content": content},
+                "finish_reason": finish_reason,
+            }
+        ],
+    }
+    return f"data: {json.dumps(payload)}\n\n"
+
+
+async def chat_completions(request):
+    body = await request.json()
+    query = body["messages"][-1]["content"]
+
+    async def events():
+        stats["active"] += 1
+        stats["total"] += 1
+        stats["peak"] = max(stats["peak"], stats["active"])
+        try:
+            for i in range(CHUNKS):
+                await asyncio.sleep(CHUNK_DELAY)
+                yield _event(f"[{query}:{i}] ")
+            yield _event(None, finish_reason="stop")
+            yield "data: [DONE]\n\n"
+        finally:
+            stats["active"] -= 1
+
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+
+async def get_stats(request):
+    return JSONResponse(stats)
+
+
+async def reset_stats(request):
+    stats.update(active=0, peak=0, total=0)
+    return JSONResponse(stats)
+
+
+app = Starlette(
+    routes=[
+        Route("/v1/chat/completions", chat_completions, methods=["POST"]),
+        Route("/stats", get_stats),
+        Route("/stats/reset", reset_stats, methods=["POST"]),
+    ]
+)
+
+
+def start_server(target: str, port: int) -> subprocess.Popen:
+    """
+    Run `module:app` under uvicorn in a child process and wait until it
+    accepts connections, so the server does not share a GIL with the caller.
+    """
+    root = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+    process = subprocess.Popen(
+        [
+            sys.executable, "-m", "uvicorn", target,
+            "--host", "127.0.0.1", "--port", str(port),
+            "--log-level", "warning",
+        ],
+        cwd=root,
+        # Keep the server's output off stdout, where benchmarks print reports
+        stdout=sys.stderr,
+        # Its own process group, so stop_server also reaches worker processes
+        start_new_session=True,
+    )
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError(f"{target} did not start on port {port}")
+
+
+def stop_server(process: subprocess.Popen, timeout: float = 10.0):
+    """
+    Stop a server from start_server along with any processes it spawned
+    (e.g. the password hashing pool), killing them if they do not exit
+    within `timeout` seconds.
+    """
+    try:
+        os.killpg(process.pid, signal.SIGTERM)
+        process.wait(timeout)
+    except subprocess.TimeoutExpired:
+        pass
+    except ProcessLookupError:
+        return
+    try:
+        os.killpg(process.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+    process.wait()
+
+
+if __name__ == "__main__":
+    uvicorn.run(app, host="127.0.0.1", port=int(os.getenv("PORT", "8901")))
@@ -0,0 +1,121 @@
+# backend/benchmarks/fuzzy_lookup.py
+"""
+Lookup latency of the trigram FuzzyIndex vs the linear extractOne scan.
+
+Builds caches of synthetic customer questions at several sizes and times
+near-duplicate (typo) lookups and misses. The linear scan is skipped above
+`--linear-max` keys because it takes seconds per lookup there. Example:
+
+    python benchmarks/fuzzy_lookup.py --sizes 100 10000 100000
+"""
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from faker import Faker  # noqa: E402
+from fuzzywuzzy import fuzz, process  # noqa: E402
+
+from utils.fuzzy_index import FuzzyIndex  # noqa: E402
+
+MODELS = [
+    "Lucid Air", "Air Pure", "Air Touring", "Air Grand Touring", "Gravity",
+    "Air Sapphire", "my car", "the Air", "my Gravity", "the sedan",
+]
+
+
+def make_queries(count: int, rng: random.Random) -> list:
+    """
+    Synthetic chat-widget questions: a model name mixed into Faker sentences
+    plus the occasional city or number, roughly as varied as real traffic.
+    """
+    fake = Faker()
+    fake.seed_instance(rng.randrange(2**32))
+    queries = set()
+    while len(queries) < count:
+        words = fake.sentence(nb_words=rng.randint(5, 10)).rstrip(".").split()
+        words.insert(rng.randrange(len(words) + 1), rng.choice(MODELS))
+        if rng.random() < 0.5:
+            words.append(f"in {fake.city()}")
+        if rng.random() < 0.3:
+            words.append(str(rng.randrange(2018, 2026)))
+        queries.add(" ".join(words))
+    return list(queries)
+
+
+def typo(text: str, rng: random.Random) -> str:
+    i = rng.randrange(len(text))
+    return text[:i] + rng.choice("abcdefghijklmnopqrstuvwxyz") + text[i + 1:]
+
+
+def time_lookups(lookup, queries) -> dict:
+    samples = []
+    hits = 0
+    for query in queries:
+        start = time.perf_counter()
+        hits += lookup(query) is not None
+        samples.append(time.perf_counter() - start)
+    samples.sort()
+    return {
+        "p50_us": round(statistics.median(samples) * 1e6, 1),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1] * 1e6, 1),
+        "hit_rate": round(hits / len(queries), 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=[100, 10000, 100000]
+    )
+    parser.add_argument("--lookups", type=int, default=200)
+    parser.add_argument("--linear-max", type=int, default=10000)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    report = []
+    for size in args.sizes:
+        rng = random.Random(args.seed)
+        keys = make_queries(size, rng)
+        lookups = args.lookups
+        near = [typo(rng.choice(keys), rng) for _ in range(lookups)]
+        misses = make_queries(lookups, random.Random(args.seed + 1))
+
+        index = FuzzyIndex(threshold=85)
+        start = time.perf_counter()
+        for key in keys:
+            index.add(key)
+        build_seconds = time.perf_counter() - start
+
+        def indexed(query):
+            return index.best_match(query)
+
+        row = {
+            "keys": size,
+            "index_build_seconds": round(build_seconds, 3),
+            "index_near_duplicate": time_lookups(indexed, near),
+            "index_miss": time_lookups(indexed, misses),
+        }
+        if size <= args.linear_max:
+            # The linear scan is slow enough that a handful of lookups is
+            # representative at the larger sizes.
+            sample = max(10, lookups * 100 // size) if size > 100 else lookups
+
+            def linear(query):
+                match = process.extractOne(query, keys, scorer=fuzz.ratio)
+                return match[0] if match and match[1] > 85 else None
+
+            row["linear_near_duplicate"] = time_lookups(linear, near[:sample])
+            row["linear_miss"] = time_lookups(linear, misses[:sample])
+        report.append(row)
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+# backend/benchmarks/harness.py
+"""
+Shared load generator of the benchmarks: raw asyncio HTTP/1.1 requests over
+fresh connections, so the client stays cheap and the server under test (not
+a client connection pool) is what gets measured.
+"""
+import asyncio
+import time
+from typing import NamedTuple
+
+
+class Request(NamedTuple):
+    method: str
+    path: str
+    body: bytes = b""
+    content_type: str = None
+
+
+async def http_request(port: int, request: Request, timeout: float) -> int:
+    """Send a request, drain the response and return its status code."""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        head = (
+            f"{request.method} {request.path} HTTP/1.1\r\n"
+            f"Host: 127.0.0.1\r\nConnection: close\r\n"
+        )
+        if request.content_type:
+            head += f"Content-Type: {request.content_type}\r\n"
+        if request.body or request.method == "POST":
+            head += f"Content-Length: {len(request.body)}\r\n"
+        writer.write(head.encode() + b"\r\n" + request.body)
+        await writer.drain()
+        status_line = await asyncio.wait_for(reader.readline(), timeout)
+        while await asyncio.wait_for(reader.read(65536), timeout):
+            pass
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+def percentile(values: list, fraction: float):
+    """Percentile of sorted durations in seconds, in milliseconds."""
+    if not values:
+        return None
+    return round(values[min(int(len(values) * fraction), len(values) - 1)]
+                 * 1000, 1)
+
+
+async def run_load(port: int, requests: list, concurrency: int,
+                   timeout: float) -> dict:
+    """
+    Send `requests` with `concurrency` of them in flight at a time.
+
+    Returns:
+        dict: Completed and failed counts, throughput and latency
+        percentiles (ms) of the successful requests.
+    """
+    queue = asyncio.Queue()
+    for request in requests:
+        queue.put_nowait(request)
+    latencies, errors = [], 0
+
+    async def worker():
+        nonlocal errors
+        while not queue.empty():
+            request = queue.get_nowait()
+            start = time.perf_counter()
+            try:
+                ok = await http_request(port, request, timeout) < 400
+            except (OSError, ValueError, IndexError, asyncio.TimeoutError):
+                ok = False
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    return {
+        "completed": len(latencies),
+        "errors": errors,
+        "wall_seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1),
+        "latency_ms_p50": percentile(latencies, 0.5),
+        "latency_ms_p95": percentile(latencies, 0.95),
+        "latency_ms_p99": percentile(latencies, 0.99),
+        "latency_ms_max": percentile(latencies, 1.0),
+    }
@@ -0,0 +1,122 @@
+# backend/benchmarks/json_encoding.py
+"""
+Per-row cost of encoding appointment lists as JSON: legacy vs fast path.
+
+Loads N appointments from an in-memory SQLite database, then times:
+
+- legacy: ORM objects -> AppointmentBase.model_validate per row ->
+  jsonable_encoder -> json.dumps (what GET /appointments used to do);
+- type_adapter: the same models dumped with TypeAdapter(list[...]).dump_json;
+- fast_path: column rows -> utils.json_response.dump_rows (orjson).
+
+The fetch (ORM entities vs plain columns) is timed separately. Prints a
+JSON report. Example:
+
+    python benchmarks/json_encoding.py --rows 1000 10000 100000
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from datetime import date, time as time_of_day, timedelta
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from pydantic import TypeAdapter  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+
+from models.init_db import Appointment, Base  # noqa: E402
+from models.schemas import AppointmentBase  # noqa: E402
+from routes.appointments import APPOINTMENT_FIELDS  # noqa: E402
+from utils.json_response import dump_rows  # noqa: E402
+
+
+def seed(engine, rows: int):
+    Base.metadata.create_all(bind=engine)
+    start = date(2030, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Appointment), [
+            {
+                "vin": f"BENCHVIN{i % 5000:09d}",
+                "date": start + timedelta(days=i % 365),
+                "time": time_of_day(8 + i % 10, 30 * (i % 2)),
+                "service_type": "Oil Change",
+                "status": "Scheduled",
+                "employee_id": 1 + i % 20,
+            }
+            for i in range(rows)
+        ])
+
+
+def timed(fn, repeat: int):
+    """Best of `repeat` runs, in seconds, and the last result."""
+    best, result = float("inf"), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def run(rows: int, repeat: int) -> dict:
+    engine = create_engine("sqlite://")
+    seed(engine, rows)
+    with Session(engine) as db:
+        fetch_orm, objects = timed(
+            lambda: db.scalars(select(Appointment)).all(), repeat
+        )
+        db.expunge_all()
+        columns = [getattr(Appointment, name) for name in APPOINTMENT_FIELDS]
+        fetch_rows, records = timed(
+            lambda: db.execute(select(*columns, Appointment.id)).all(), repeat
+        )
+    adapter = TypeAdapter(list[AppointmentBase])
+
+    legacy, legacy_body = timed(lambda: json.dumps(jsonable_encoder([
+        AppointmentBase.model_validate(obj) for obj in objects
+    ])).encode(), repeat)
+    type_adapter, _ = timed(lambda: adapter.dump_json([
+        AppointmentBase.model_validate(obj) for obj in objects
+    ]), repeat)
+    fast, fast_body = timed(
+        lambda: dump_rows(records, APPOINTMENT_FIELDS), repeat
+    )
+    assert json.loads(legacy_body) == json.loads(fast_body)
+
+    def per_row(seconds):
+        return round(seconds / rows * 1e6, 3)
+
+    return {
+        "rows": rows,
+        "fetch_us_per_row": {
+            "orm_entities": per_row(fetch_orm),
+            "columns": per_row(fetch_rows),
+        },
+        "encode_us_per_row": {
+            "legacy": per_row(legacy),
+            "type_adapter": per_row(type_adapter),
+            "fast_path": per_row(fast),
+        },
+        "encode_speedup": round(legacy / fast, 1),
+        "body_bytes": len(fast_body),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[1000, 10000, 100000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+    print(json.dumps([run(rows, args.repeat) for rows in args.rows], indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,238 @@
+# backend/benchmarks/load_test.py
+"""
+Reproducible API load test with a JSON report per endpoint.
+
+Seeds a dataset of configurable size (with mock_data_script), starts the
+fake OpenAI server and the API under uvicorn in child processes, then loads
+each endpoint in turn at `--concurrency` and reports throughput and
+p50/p95/p99 latency. Pass `--baseline` with the report of an earlier run to
+flag regressions; the exit code is 1 when there are any. Example:
+
+    python benchmarks/load_test.py --clients 20000 --output run.json
+    python benchmarks/load_test.py --clients 20000 --baseline run.json
+"""
+import argparse
+import asyncio
+import contextlib
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+from urllib.parse import urlencode
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+FAKE_PORT = 8904
+API_PORT = 8905
+
+os.environ["OPENAI_BASE_URL"] = f"http://127.0.0.1:{FAKE_PORT}/v1"
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark-key")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite:///./loadtest.db")
+os.environ.setdefault("ACCESS_LOG_SAMPLE_RATE", "0")
+
+from sqlalchemy import create_engine, select  # noqa: E402
+
+from benchmarks.fake_openai_server import (  # noqa: E402
+    start_server, stop_server,
+)
+from benchmarks.harness import Request, run_load  # noqa: E402
+from mock_data_script import seed_database  # noqa: E402
+from models.init_db import Base, Client  # noqa: E402
+
+# Environment variables recorded with each report, as they change results
+RECORDED_ENV = (
+    "DATABASE_URL", "DB_POOL_SIZE", "DB_ASYNC_READS", "DB_REPLICA_URLS",
+    "RESPONSE_CACHE_TTL", "PASSWORD_WORKERS", "PASSWORD_BCRYPT_ROUNDS",
+)
+# Endpoints bounded by bcrypt or the (fake) LLM, loaded with fewer requests
+SLOW_ENDPOINTS = ("token", "assist")
+
+
+def endpoint_requests(name: str, count: int, rng: random.Random,
+                      dataset: dict) -> list:
+    """The requests of one endpoint's phase, drawn from `rng`."""
+    clients = dataset["clients"]
+    employees = dataset["employees"] + 1
+    requests = []
+    for i in range(count):
+        if name == "health":
+            requests.append(Request("GET", "/health"))
+        elif name == "customers":
+            after_id = rng.randrange(clients)
+            requests.append(Request(
+                "GET", f"/customers/?after_id={after_id}&limit=100"
+            ))
+        elif name == "customer_detail":
+            requests.append(Request(
+                "GET", f"/customers/{rng.randint(1, clients)}"
+            ))
+        elif name == "appointments":
+            requests.append(Request(
+                "GET",
+                f"/appointments/?limit=100"
+                f"&employee_id={rng.randint(1, employees)}",
+            ))
+        elif name == "token":
+            form = urlencode({
+                "username": rng.choice(dataset["emails"]),
+                "password": "password123",
+            })
+            requests.append(Request(
+                "POST", "/token", form.encode(),
+                "application/x-www-form-urlencoded",
+            ))
+        elif name == "assist":
+            # Distinct questions, so every request reaches the LLM
+            body = json.dumps({"query": f"load test question {i}"})
+            requests.append(Request(
+                "POST", "/assist", body.encode(), "application/json"
+            ))
+    return requests
+
+
+ENDPOINTS = (
+    "health", "customers", "customer_detail", "appointments", "token",
+    "assist",
+)
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(report: dict, baseline: dict, tolerance: float) -> list:
+    """
+    Endpoints whose throughput fell, or whose p95 latency rose, by more than
+    `tolerance` (a fraction) against the baseline report.
+    """
+    regressions = []
+    for name, result in report["endpoints"].items():
+        before = baseline.get("endpoints", {}).get(name)
+        if not before:
+            continue
+        checks = (
+            ("requests_per_second", -1),
+            ("latency_ms_p95", 1),
+        )
+        for metric, direction in checks:
+            old, new = before.get(metric), result.get(metric)
+            if not old or new is None:
+                continue
+            change = (new - old) / old
+            if change * direction > tolerance:
+                regressions.append({
+                    "endpoint": name,
+                    "metric": metric,
+                    "baseline": old,
+                    "current": new,
+                    "change": round(change, 3),
+                })
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=100)
+    parser.add_argument("--clients", type=int, default=5000)
+    parser.add_argument("--appointments", type=int, default=20000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--skip-seed", action="store_true",
+                        help="Reuse the data of a previous run")
+    parser.add_argument("--endpoints", nargs="+", default=list(ENDPOINTS),
+                        choices=ENDPOINTS)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--slow-requests", type=int, default=100,
+                        help="Requests for the token and assist endpoints")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--output", help="Also write the report here")
+    parser.add_argument("--baseline", help="Report to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+    os.environ.setdefault("FAKE_OPENAI_CHUNKS", "10")
+    os.environ.setdefault("FAKE_OPENAI_CHUNK_DELAY", "0.05")
+
+    dataset = {
+        "employees": args.employees,
+        "clients": args.clients,
+        "vehicles": args.clients,
+        "service_history": args.clients,
+        "appointments": args.appointments,
+    }
+    engine = create_engine(os.environ["DATABASE_URL"])
+    if not args.skip_seed:
+        Base.metadata.create_all(engine)
+        # Progress goes to stderr, keeping stdout for the report
+        with contextlib.redirect_stdout(sys.stderr):
+            seed_database(engine, dataset, args.seed, batch_size=10000,
+                          workers=os.cpu_count() or 1)
+    with engine.connect() as conn:
+        dataset["emails"] = conn.scalars(
+            select(Client.email).order_by(Client.id).limit(100)
+        ).all()
+    engine.dispose()
+
+    servers = [
+        start_server("benchmarks.fake_openai_server:app", FAKE_PORT),
+        start_server("main:app", API_PORT),
+    ]
+    rng = random.Random(args.seed)
+    results = {}
+    try:
+        for name in args.endpoints:
+            count = (
+                args.slow_requests if name in SLOW_ENDPOINTS
+                else args.requests
+            )
+            requests = endpoint_requests(name, count, rng, dataset)
+            results[name] = asyncio.run(
+                run_load(API_PORT, requests, args.concurrency, args.timeout)
+            )
+            print(f"{name}: {results[name]['requests_per_second']} req/s",
+                  file=sys.stderr)
+    finally:
+        for server in servers:
+            stop_server(server)
+
+    report = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc)
+            .isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "cpus": os.cpu_count(),
+            "dataset": {k: v for k, v in dataset.items() if k != "emails"},
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "env": {
+                name: os.environ[name]
+                for name in RECORDED_ENV if name in os.environ
+            },
+        },
+        "endpoints": results,
+    }
+    if args.baseline:
+        with open(args.baseline) as f:
+            report["regressions"] = compare(report, json.load(f),
+                                            args.tolerance)
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    if report.get("regressions"):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+# backend/benchmarks/search_index.py
+"""
+Load time, memory and query latency of the local customer/vehicle search index.
+
+Indexes synthetic customers, vehicles and service records generated like
+mock_data_script does (without a database) and times typical searches:
+names, typos, phone numbers, VINs, models and note words. Example:
+
+    python benchmarks/search_index.py --rows 100000 333333
+"""
+import argparse
+import datetime
+import json
+import os
+import resource
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+# Required to import the models; nothing is written to the database
+os.environ.setdefault("SECRET_KEY", "benchmark-secret")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+from mock_data_script import generate_chunk  # noqa: E402
+from utils.search_index import LocalSearchIndex, SearchDocument  # noqa: E402
+
+CHUNK_SIZE = 50000
+QUERIES = [
+    "smith", "john smith", "jon smth", "jo", "555.012", "lucid", "air gt",
+    "voluptatem", "aut voluptatem", "williams 555", "xq",
+]
+
+
+def documents(rows: int, seed: int):
+    """SearchDocuments of `rows` customers, vehicles and service records."""
+    options = {
+        "seed": seed,
+        "counts": {
+            "employees": 100, "clients": rows, "vehicles": rows,
+            "service_history": rows, "appointments": 0,
+        },
+        "today": datetime.date.today(),
+        "password_hash": "x",
+    }
+    for start in range(0, rows, CHUNK_SIZE):
+        stop = min(rows, start + CHUNK_SIZE)
+        _, clients = generate_chunk(("clients", start, stop, options))
+        for row in clients:
+            yield SearchDocument("customer", row[0], {
+                "name": row[1], "email": row[2], "phone": row[3],
+            })
+        _, vehicles = generate_chunk(("vehicles", start, stop, options))
+        for row in vehicles:
+            yield SearchDocument("vehicle", row[0], {
+                "vin": row[0], "model": row[2],
+            })
+        _, records = generate_chunk(("service_history", start, stop, options))
+        for row in records:
+            yield SearchDocument("service_record", row[0], {"notes": row[4]})
+
+
+def time_query(index, query: str, repeat: int) -> dict:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        hits = index.search(query)
+        samples.append(time.perf_counter() - start)
+    return {
+        "query": query,
+        "hits": len(hits),
+        "median_ms": round(statistics.median(samples) * 1000, 3),
+        "max_ms": round(max(samples) * 1000, 3),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--rows", type=int, nargs="+", default=[10000, 100000],
+        help="Rows per table; the index holds three times as many documents",
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    report = []
+    for rows in args.rows:
+        index = LocalSearchIndex()
+        start = time.perf_counter()
+        index.load(documents(rows, args.seed))
+        report.append({
+            "documents": len(index),
+            "load_seconds": round(time.perf_counter() - start, 2),
+            # Peak of the whole process, so it only grows across sizes
+            "max_rss_mb": resource.getrusage(
+                resource.RUSAGE_SELF
+            ).ru_maxrss // 1024,
+            "queries": [
+                time_query(index, query, args.repeat) for query in QUERIES
+            ],
+        })
+        del index
+
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,24 @@
 # Updated main.py
 import logging
-from fastapi import FastAPI, Request
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
+from models.init_db import engine, pool_metrics, replicas
+from models.pool import pool_status
 from routes.appointments import router as appointments_router
 from routes.customers import router as customers_router
+from routes.dashboard import router as dashboard_router
 from routes.assist import router as assist_router
 from routes.employees import router as employees_router
+from routes.exports import router as exports_router
+from routes.search import router as search_router
+from routes.token import router as token_router
+from utils.access_log import (
+    AccessLogMiddleware,
+    access_log_settings,
+    setup_access_log,
+)
+from utils.metrics import MetricsMiddleware, instrument_pool, render_metrics
+from utils.query_stats import QueryStatsMiddleware, query_stats_settings
 
 # Configure logger
 logging.basicConfig(level=logging.INFO)
@@ -13,19 +26,6 @@ logger = logging.getLogger(__name__)
 
 app = FastAPI()
 
-
-# Middleware to log raw incoming requests
-@app.middleware("http")
-async def log_request(request: Request, call_next):
-    body = await request.body()
-    logger.info(
-        f"Incoming Request: {request.method} {request.url} "
-        f"Body: {body.decode('utf-8')}"
-    )
-    response = await call_next(request)
-    return response
-
-
 # CORS Configuration
 origins = ["https://localhost:3000", "https://lucidgpt.netlify.app"]
 app.add_middleware(
@@ -34,8 +34,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Custom response headers are hidden from browser scripts unless listed
+    expose_headers=["X-Next-Cursor", "Server-Timing"],
 )
 
+# Sampled access log, written from a background thread. Request bodies are
+# only logged for /assist queries (never for /token credentials).
+setup_access_log()
+app.add_middleware(
+    AccessLogMiddleware, body_paths=("/assist",), **access_log_settings()
+)
+# Query count and DB time per request, in a Server-Timing header and the
+# access log. Added last so it wraps the access log middleware.
+app.add_middleware(QueryStatsMiddleware, **query_stats_settings())
+# Prometheus request counts and latencies by route, served at /metrics with
+# the pool, cache and LLM metrics
+app.add_middleware(MetricsMiddleware)
+instrument_pool(engine, pool_metrics)
+
 # Register Routes
 app.include_router(customers_router, prefix="/customers", tags=["Customers"])
 app.include_router(
@@ -45,6 +61,10 @@ app.include_router(
 )
 app.include_router(assist_router, prefix="", tags=["Assistance"])
 app.include_router(employees_router, prefix="/employees", tags=["Employees"])
+app.include_router(token_router, prefix="", tags=["Authentication"])
+app.include_router(dashboard_router, prefix="", tags=["Dashboard"])
+app.include_router(exports_router, prefix="/exports", tags=["Exports"])
+app.include_router(search_router, prefix="/search", tags=["Search"])
 
 
 @app.get("/health")
@@ -52,3 +72,24 @@ async def health_check():
     """Health check endpoint."""
     logger.info("Health check accessed.")
     return {"status": "ok"}
+
+
+@app.get("/health/db")
+def database_pool_health():
+    """
+    Connection pool occupancy and checkout wait metrics, plus the health of
+    the read replicas.
+    """
+    status = pool_status(engine, pool_metrics)
+    status["replicas"] = replicas.status()
+    return status
+
+
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    """
+    Prometheus metrics of this process, or of every worker process in
+    multiprocess mode (PROMETHEUS_MULTIPROC_DIR).
+    """
+    body, content_type = render_metrics()
+    return Response(content=body, media_type=content_type)
@@ -0,0 +1,64 @@
+# backend/models/async_db.py
+
+import os
+import logging
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from models.init_db import DATABASE_URL
+from models.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+# Async driver used for each backend of DATABASE_URL
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+asyncpg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+_async_engine = None
+_async_sessionmaker = None
+
+
+def async_database_url(url: str) -> str:
+    """
+    The async-driver equivalent of a database URL, e.g.
+    postgresql+psycopg2://... -> postgresql+asyncpg://...
+
+    Raises:
+        ValueError: If the backend has no known async driver.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend}.")
+    return url.set(drivername=ASYNC_DRIVERS[backend]).render_as_string(
+        hide_password=False
+    )
+
+
+def get_async_engine():
+    """
+    The shared AsyncEngine, created on first use from ASYNC_DATABASE_URL or
+    else DATABASE_URL with its async driver, and the DB_* pool settings.
+    """
+    global _async_engine
+    if _async_engine is None:
+        url = os.getenv("ASYNC_DATABASE_URL") or async_database_url(
+            DATABASE_URL
+        )
+        _async_engine = create_async_engine(url, **engine_options(url))
+        logger.info(
+            f"Async engine created with the {make_url(url).drivername} driver"
+        )
+    return _async_engine
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    global _async_sessionmaker
+    if _async_sessionmaker is None:
+        # Objects stay readable after commit without an implicit (and, in
+        # async code, impossible) lazy refresh.
+        _async_sessionmaker = async_sessionmaker(
+            get_async_engine(), expire_on_commit=False
+        )
+    return _async_sessionmaker
@@ -9,11 +9,15 @@ from sqlalchemy import (
     Integer,
     String,
     Date,
+    Time,
     ForeignKey,
     Boolean,
 )
+from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship, sessionmaker, declarative_base
 from dotenv import load_dotenv
+from models.pool import PoolMetrics, engine_options
+from models.replicas import ReplicaSet, RoutingSession
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -85,7 +89,7 @@ class Appointment(Base):
     id = Column(Integer, primary_key=True, autoincrement=True)
     vin = Column(String, ForeignKey("vehicles.vin"), nullable=False)
     date = Column(Date, nullable=False)
-    time = Column(String, nullable=False)
+    time = Column(Time, nullable=False)
     service_type = Column(String, nullable=False)
     status = Column(String, nullable=False)
     employee_id = Column(Integer, ForeignKey("employees.id"), nullable=False)
@@ -94,7 +98,43 @@ class Appointment(Base):
     employee = relationship("Employee", back_populates="appointments")
 
 
+class AppointmentRollup(Base):
+    """
+    Appointment counts per day, status, service type and technician, kept
+    up to date on appointment writes (utils/dashboard_rollup.py).
+    """
+    __tablename__ = "appointment_rollups"
+    date = Column(Date, primary_key=True)
+    status = Column(String, primary_key=True)
+    service_type = Column(String, primary_key=True)
+    employee_id = Column(Integer, primary_key=True)
+    count = Column(Integer, nullable=False)
+
+
 Index("ix_service_history_vin", ServiceHistory.vin)
+# Case-insensitive prefix search on GET /customers (text_pattern_ops on
+# PostgreSQL, see migration 9d2f6a1c7b3e)
+Index("ix_clients_lower_name", func.lower(Client.name))
+Index("ix_clients_lower_email", func.lower(Client.email))
+# Keyset pagination on (date, time, id) of GET /appointments, optionally
+# narrowed to one status, technician or vehicle (migration 5e8b0c4d2a91)
+Index(
+    "ix_appointments_date_time_id",
+    Appointment.date, Appointment.time, Appointment.id,
+)
+Index(
+    "ix_appointments_status_date_time_id",
+    Appointment.status, Appointment.date, Appointment.time, Appointment.id,
+)
+Index(
+    "ix_appointments_employee_date_time_id",
+    Appointment.employee_id, Appointment.date, Appointment.time,
+    Appointment.id,
+)
+Index(
+    "ix_appointments_vin_date_time_id",
+    Appointment.vin, Appointment.date, Appointment.time, Appointment.id,
+)
 
 
 # Database connection setup
@@ -104,8 +144,17 @@ if not DATABASE_URL:
     logger.error("DATABASE_URL environment variable is not set.")
     raise ValueError("DATABASE_URL environment variable is not set.")
 
-engine = create_engine(DATABASE_URL)
-SessionLocal = sessionmaker(bind=engine)
+pool_metrics = PoolMetrics()
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, pool_metrics))
+# Read replicas for read-only requests, comma-separated (optional)
+replicas = ReplicaSet.from_urls(
+    url.strip()
+    for url in os.environ.get("DB_REPLICA_URLS", "").split(",")
+    if url.strip()
+)
+SessionLocal = sessionmaker(
+    bind=engine, class_=RoutingSession, replicas=replicas
+)
 
 
 # Function to drop all tables
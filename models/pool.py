@@ -0,0 +1,157 @@
+# backend/models/pool.py
+
+import os
+import time
+import threading
+from collections import deque
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import QueuePool
+
+# Recent checkout waits kept for percentiles
+WAIT_SAMPLES = 1024
+
+
+def _env_bool(name: str, default: str) -> bool:
+    return os.getenv(name, default).lower() in ("1", "true", "yes")
+
+
+class PoolMetrics:
+    """
+    Counters of connection checkouts: how many, how long callers waited for
+    a connection (including opening a new one) and how many timed out.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+        self._listeners = []
+
+    def add_listener(self, listener):
+        """
+        Register `listener(seconds, timed_out)` to be called with every
+        recorded checkout wait.
+        """
+        self._listeners.append(listener)
+
+    def record_wait(self, seconds: float, timed_out: bool = False):
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+            else:
+                self.checkouts += 1
+            self.wait_seconds_total += seconds
+            self.wait_seconds_max = max(self.wait_seconds_max, seconds)
+            self._waits.append(seconds)
+        for listener in self._listeners:
+            listener(seconds, timed_out)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            waits = sorted(self._waits)
+            return {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_total": round(self.wait_seconds_total * 1000, 3),
+                "wait_ms_max": round(self.wait_seconds_max * 1000, 3),
+                "wait_ms_p50": round(waits[len(waits) // 2] * 1000, 3)
+                if waits else None,
+                "wait_ms_p95": round(waits[int(len(waits) * 0.95)] * 1000, 3)
+                if waits else None,
+            }
+
+
+class InstrumentedQueuePool(QueuePool):
+    """
+    QueuePool timing every checkout into the class's `metrics`. Pools
+    recreated after a dispose or failover keep the class, and so the
+    metrics.
+    """
+
+    metrics = None
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_wait(time.perf_counter() - start, True)
+            raise
+        self.metrics.record_wait(time.perf_counter() - start)
+        return connection
+
+
+def engine_options(url: str, metrics: PoolMetrics = None) -> dict:
+    """
+    create_engine() keyword arguments from the DB_* environment variables.
+
+    DB_POOL_PRE_PING (default on) and DB_POOL_RECYCLE (seconds, default
+    1800) apply to every backend; DB_POOL_SIZE (5), DB_MAX_OVERFLOW (10)
+    and DB_POOL_TIMEOUT (seconds, 30) to every pooled one (not in-memory
+    SQLite). PostgreSQL also takes DB_STATEMENT_TIMEOUT_MS (0 = none) and,
+    with psycopg2, DB_EXECUTEMANY_MODE (default "values_plus_batch").
+
+    Args:
+        url (str): The database URL.
+        metrics (PoolMetrics): Collects checkout waits when given.
+    """
+    url = make_url(url)
+    options = {
+        "pool_pre_ping": _env_bool("DB_POOL_PRE_PING", "true"),
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),
+    }
+    if url.get_backend_name() == "sqlite" and url.database in (
+        None, "", ":memory:"
+    ):
+        # In-memory SQLite uses a per-thread pool without size settings.
+        return options
+
+    options.update(
+        pool_size=int(os.getenv("DB_POOL_SIZE", "5")),
+        max_overflow=int(os.getenv("DB_MAX_OVERFLOW", "10")),
+        pool_timeout=float(os.getenv("DB_POOL_TIMEOUT", "30")),
+    )
+    if metrics is not None:
+        options["poolclass"] = type(
+            "InstrumentedQueuePool",
+            (InstrumentedQueuePool,),
+            {"metrics": metrics},
+        )
+    if url.get_backend_name() == "postgresql":
+        statement_timeout = int(os.getenv("DB_STATEMENT_TIMEOUT_MS", "0"))
+        if statement_timeout and url.get_driver_name() == "asyncpg":
+            options["connect_args"] = {
+                "server_settings": {"statement_timeout": str(statement_timeout)}
+            }
+        elif statement_timeout:
+            options["connect_args"] = {
+                "options": f"-c statement_timeout={statement_timeout}"
+            }
+        if url.get_driver_name() == "psycopg2":
+            options["executemany_mode"] = os.getenv(
+                "DB_EXECUTEMANY_MODE", "values_plus_batch"
+            )
+    return options
+
+
+def pool_status(engine, metrics: PoolMetrics = None) -> dict:
+    """
+    Current occupancy of the engine's pool plus the checkout metrics.
+    """
+    pool = engine.pool
+    status = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            max_overflow=pool._max_overflow,
+        )
+    if metrics is not None:
+        status.update(metrics.snapshot())
+    return status
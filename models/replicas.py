@@ -0,0 +1,167 @@
+# backend/models/replicas.py
+
+import os
+import time
+import logging
+import threading
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from models.pool import engine_options
+
+logger = logging.getLogger(__name__)
+
+# Seconds between health checks of a replica that is up
+CHECK_INTERVAL = float(os.getenv("DB_REPLICA_CHECK_INTERVAL", "5"))
+# Seconds before a replica that failed its check is tried again
+RETRY_INTERVAL = float(os.getenv("DB_REPLICA_RETRY_INTERVAL", "30"))
+# Replication lag (seconds) beyond which a PostgreSQL replica counts as
+# unhealthy; 0 disables the lag check
+MAX_LAG = float(os.getenv("DB_REPLICA_MAX_LAG", "0"))
+
+POSTGRES_LAG = text(
+    "SELECT COALESCE(EXTRACT(EPOCH FROM now() - "
+    "pg_last_xact_replay_timestamp()), 0)"
+)
+
+
+class Replica:
+    """A replica engine and the outcome of its last health check."""
+
+    def __init__(self, engine):
+        self.engine = engine
+        self.healthy = True
+        self.checked_at = None
+
+    def check(self, max_lag: float) -> bool:
+        """
+        Connect and run a trivial query; on PostgreSQL with `max_lag` set,
+        also require the replica to be at most that far behind.
+        """
+        try:
+            with self.engine.connect() as conn:
+                if max_lag and self.engine.dialect.name == "postgresql":
+                    lag = conn.execute(POSTGRES_LAG).scalar()
+                    if lag > max_lag:
+                        logger.warning(
+                            f"Replica {self.engine.url!r} lags {lag:.1f}s"
+                        )
+                        return False
+                else:
+                    conn.execute(text("SELECT 1"))
+            return True
+        except Exception as e:
+            logger.warning(f"Replica {self.engine.url!r} failed its check: {e}")
+            return False
+
+
+class ReplicaSet:
+    """
+    Read replicas handed out round-robin, skipping those that failed their
+    last health check. Checks run lazily when a replica is picked: every
+    `check_interval` seconds while it is up and every `retry_interval`
+    seconds while it is down.
+    """
+
+    def __init__(self, engines=(), check_interval: float = CHECK_INTERVAL,
+                 retry_interval: float = RETRY_INTERVAL,
+                 max_lag: float = MAX_LAG, clock=time.monotonic):
+        self.replicas = [Replica(engine) for engine in engines]
+        self.check_interval = check_interval
+        self.retry_interval = retry_interval
+        self.max_lag = max_lag
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._next = 0
+
+    @classmethod
+    def from_urls(cls, urls, **kwargs):
+        return cls(
+            [create_engine(url, **engine_options(url)) for url in urls],
+            **kwargs,
+        )
+
+    def __len__(self) -> int:
+        return len(self.replicas)
+
+    def _is_healthy(self, replica: Replica) -> bool:
+        now = self.clock()
+        with self._lock:
+            interval = (
+                self.check_interval if replica.healthy else self.retry_interval
+            )
+            due = replica.checked_at is None or now - replica.checked_at >= interval
+            if not due:
+                return replica.healthy
+            # Claim the check so concurrent callers keep the old verdict
+            replica.checked_at = now
+        healthy = replica.check(self.max_lag)
+        if healthy != replica.healthy:
+            logger.info(
+                f"Replica {replica.engine.url!r} is "
+                f"{'up' if healthy else 'down'}"
+            )
+        replica.healthy = healthy
+        return healthy
+
+    def choose(self):
+        """
+        The next healthy replica engine, or None when none is healthy.
+        """
+        for _ in range(len(self.replicas)):
+            with self._lock:
+                replica = self.replicas[self._next % len(self.replicas)]
+                self._next += 1
+            if self._is_healthy(replica):
+                return replica.engine
+        return None
+
+    def status(self) -> list:
+        return [
+            {"url": repr(replica.engine.url), "healthy": replica.healthy}
+            for replica in self.replicas
+        ]
+
+
+class RoutingSession(Session):
+    """
+    Session sending SELECTs to a read replica when its `info` has
+    `read_only` set, and everything else to the primary.
+
+    Once the session writes (flushes or executes DML) all of its later
+    reads go to the primary too, so it always sees its own writes. A session
+    sticks to the replica it first picked; with no healthy replica it reads
+    from the primary.
+    """
+
+    def __init__(self, *args, replicas: ReplicaSet = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.replicas = replicas
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        if clause is not None and not isinstance(clause, Select):
+            self.info["wrote"] = True
+        if (
+            self.replicas
+            and self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self._flushing
+            and isinstance(clause, Select)
+        ):
+            if "replica" not in self.info:
+                self.info["replica"] = self.replicas.choose()
+            if self.info["replica"] is not None:
+                return self.info["replica"]
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _mark_written(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _notify_write(session):
+    callback = session.info.get("on_write_commit")
+    if session.info.get("wrote") and callback is not None:
+        callback()
@@ -1,7 +1,7 @@
 # backend/models/schemas.py
 from pydantic import BaseModel, EmailStr
-from typing import List
-from datetime import date
+from typing import List, Optional, Union
+from datetime import date, time
 
 
 class CustomerBase(BaseModel):
@@ -30,7 +30,7 @@ class VehicleBase(BaseModel):
 class AppointmentBase(BaseModel):
     vin: str
     date: date
-    time: str
+    time: time
     service_type: str
     status: str
     employee_id: int
@@ -39,6 +39,58 @@ class AppointmentBase(BaseModel):
         from_attributes = True
 
 
+class ServiceRecordBase(BaseModel):
+    id: int
+    vin: str
+    date: date
+    service_type: str
+    notes: Optional[str] = None
+    employee_id: int
+
+    class Config:
+        from_attributes = True
+
+
+class AvailabilitySlot(BaseModel):
+    date: date
+    time: time
+    available: int
+    employee_ids: Optional[List[int]] = None
+
+
+class GroupCount(BaseModel):
+    key: str
+    count: int
+
+
+class EmployeeCount(BaseModel):
+    employee_id: int
+    count: int
+
+
+class DayCount(BaseModel):
+    date: date
+    count: int
+
+
+class DashboardSummary(BaseModel):
+    date_from: date
+    date_to: date
+    total: int
+    by_status: List[GroupCount]
+    by_service_type: List[GroupCount]
+    by_employee: List[EmployeeCount]
+    by_day: List[DayCount]
+
+
+class SearchResult(BaseModel):
+    kind: str
+    id: Union[int, str]
+    score: float
+    title: str
+    detail: Optional[str] = None
+
+
 class CustomerResponse(CustomerBase):
     id: int
 
@@ -50,6 +102,7 @@ class CustomerDetailResponse(BaseModel):
     customer: CustomerResponse
     vehicles: List[VehicleBase]
     appointments: List[AppointmentBase]
+    service_records: Optional[List[ServiceRecordBase]] = None
 
     class Config:
         from_attributes = True
@@ -71,7 +124,7 @@ class EmployeeResponse(BaseModel):
     name: str
     email: str
     phone: str
-    profile_pic_url: str
+    profile_pic_url: Optional[str] = None
 
     class Config:
         from_attributes = True
@@ -1,45 +1,136 @@
+import base64
 import datetime
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy import asc
-from sqlalchemy.orm import Session
+from typing import List, Optional
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from sqlalchemy import select, tuple_
 from models.init_db import Appointment
-from models.schemas import AppointmentBase
-from utils.dependencies import get_db
+from models.schemas import AppointmentBase, AvailabilitySlot
+from utils.availability import availability_index
+from utils.dependencies import ReadSession, read_db
+from utils.json_response import FastJSONResponse, dump_rows
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
 
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_AVAILABILITY_DAYS = 31
 
-@router.get("/", response_model=list[AppointmentBase])
-def get_appointments(db: Session = Depends(get_db)):
+# Route area of these endpoints in DB_ASYNC_READS
+APPOINTMENTS = "appointments"
+# Columns of AppointmentBase, selected and serialized without ORM objects
+APPOINTMENT_FIELDS = (
+    "vin", "date", "time", "service_type", "status", "employee_id"
+)
+
+
+def encode_cursor(appointment) -> str:
+    """
+    Opaque keyset cursor of an appointment (or a row with its date, time
+    and id): its (date, time, id) position.
+    """
+    raw = (
+        f"{appointment.date.isoformat()}|{appointment.time.isoformat()}"
+        f"|{appointment.id}"
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple:
+    """
+    Inverse of `encode_cursor`.
+
+    Raises:
+        HTTPException: If the cursor is malformed.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        date, time, appointment_id = raw.split("|")
+        return (
+            datetime.date.fromisoformat(date),
+            datetime.time.fromisoformat(time),
+            int(appointment_id),
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid cursor."
+        )
+
+
+@router.get(
+    "/",
+    response_model=list[AppointmentBase],
+    response_class=FastJSONResponse,
+)
+async def get_appointments(
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    status_: Optional[str] = Query(None, alias="status"),
+    employee_id: Optional[int] = None,
+    vin: Optional[str] = None,
+    after: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: ReadSession = Depends(read_db(APPOINTMENTS)),
+):
     """
-    Retrieve all appointments from the database.
+    Retrieve one page of appointments, ordered by date, time and ID.
+
+    Pages are keyset-paginated on (date, time, id): pass the X-Next-Cursor
+    header of a page as `after` to fetch the next one; the header is absent
+    on the last page. Each filter combination is served by a composite index
+    range scan. Rows are selected as plain columns and serialized with
+    orjson, without building ORM objects or Pydantic models.
 
     Args:
-        db (Session): Database session dependency.
+        date_from (date): First day of the window (default: today).
+        date_to (date): Last day of the window, inclusive (default: none).
+        status_ (str): Only appointments with this status.
+        employee_id (int): Only appointments of this technician.
+        vin (str): Only appointments of this vehicle.
+        after (str): Cursor returned with the previous page.
+        limit (int): Maximum number of appointments to return.
+        db (ReadSession): Read session dependency.
 
     Returns:
-        list: A list of appointment details.
+        list: A page of appointment details.
+
+    Raises:
+        HTTPException: If the parameters are invalid or the appointments
+        cannot be fetched.
     """
+    date_from = date_from or datetime.date.today()
+    if date_to is not None and date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from."
+        )
+    position = decode_cursor(after) if after else None
+
     try:
-        now = datetime.datetime.now()
-        appointments = (
-            db.query(Appointment)
-            .filter(Appointment.date >= now)
-            .order_by(asc(Appointment.date))
-            .all()
-        )
-        if not appointments:
-            logger.info("No appointments found.")
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No appointments found."
+        query = select(
+            *(getattr(Appointment, name) for name in APPOINTMENT_FIELDS),
+            Appointment.id,
+        ).where(Appointment.date >= date_from)
+        if date_to is not None:
+            query = query.where(Appointment.date <= date_to)
+        if status_ is not None:
+            query = query.where(Appointment.status == status_)
+        if employee_id is not None:
+            query = query.where(Appointment.employee_id == employee_id)
+        if vin is not None:
+            query = query.where(Appointment.vin == vin)
+        if position is not None:
+            query = query.where(
+                tuple_(Appointment.date, Appointment.time, Appointment.id)
+                > tuple_(*position)
             )
-        return [
-            AppointmentBase.model_validate(appointment)
-            for appointment in appointments
-        ]
+        appointments = await db.rows(
+            query.order_by(
+                Appointment.date, Appointment.time, Appointment.id
+            ).limit(limit)
+        )
     except Exception as e:
         logger.error(
             f"Unexpected error fetching appointments: {e}", exc_info=True
@@ -48,3 +139,62 @@ def get_appointments(db: Session = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch appointments."
         )
+
+    headers = {}
+    if len(appointments) == limit:
+        headers["X-Next-Cursor"] = encode_cursor(appointments[-1])
+    return FastJSONResponse(
+        dump_rows(appointments, APPOINTMENT_FIELDS), headers=headers
+    )
+
+
+@router.get("/availability", response_model=List[AvailabilitySlot])
+async def get_availability(
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    employee_id: Optional[List[int]] = Query(None),
+    db: ReadSession = Depends(read_db(APPOINTMENTS)),
+):
+    """
+    Free appointment slots between two dates, answered from the in-memory
+    availability index rather than by scanning appointments.
+
+    Args:
+        date_from (date): First day (default: today).
+        date_to (date): Last day, inclusive (default: a week after
+            date_from).
+        employee_id (List[int]): Only these technicians (repeatable); the
+            free ones are listed per slot. Default: any technician.
+        db (ReadSession): Read session, used to (re)load the index.
+
+    Returns:
+        List[AvailabilitySlot]: Upcoming slots with at least one free
+        technician.
+
+    Raises:
+        HTTPException: If the date window is invalid.
+    """
+    date_from = date_from or datetime.date.today()
+    date_to = date_to or date_from + datetime.timedelta(days=6)
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from."
+        )
+    if (date_to - date_from).days >= MAX_AVAILABILITY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The window is limited to {MAX_AVAILABILITY_DAYS} days."
+        )
+
+    try:
+        await db.run_sync(availability_index.ensure_loaded)
+    except Exception as e:
+        logger.error(
+            f"Unexpected error loading availability: {e}", exc_info=True
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch availability."
+        )
+    return availability_index.free_slots(date_from, date_to, employee_id)
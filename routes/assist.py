@@ -1,13 +1,21 @@
 import os
+import asyncio
 import logging
 import time
+import weakref
+from functools import partial
+import httpx
 from fastapi import APIRouter, HTTPException, status
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from openai import OpenAI
-from cachetools import TTLCache
-from fuzzywuzzy import process, fuzz
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, OpenAIError
 from dotenv import load_dotenv
+from utils.answer_cache import create_answer_cache
+from utils.semantic_cache import create_semantic_cache
+from utils.fuzzy_index import FuzzyIndex
+from utils.singleflight import SingleFlight
+from utils.stream_metrics import stream_metrics
+from utils.metrics import LLMCallMetrics
 
 load_dotenv()
 print("DEBUG: OPENAI_API_KEY in FastAPI is:", os.environ.get("OPENAI_API_KEY"))
@@ -31,11 +39,43 @@ if not OPENAI_API_KEY:
     logger.error("OPENAI_API_KEY is not set in environment variables.")
     raise ValueError("OPENAI_API_KEY is not set in environment variables.")
 
-OPENAI_CLIENT = OpenAI(api_key=os.environ.get("OPENAI_API_KEY"))
 RESPONSE_LENGTH = 300  # Maximum number of tokens in the response
+CHAT_MODEL = "gpt-4o-mini"
 
-# In-memory cache for OpenAI responses
-cache = TTLCache(maxsize=100, ttl=3600)  # Cache up to 100 queries for 1 hour
+# Maximum number of upstream OpenAI streams held open at once by this worker,
+# and how long a request may wait for a free slot before getting a 503.
+MAX_CONCURRENT_STREAMS = int(os.getenv("ASSIST_MAX_CONCURRENT_STREAMS", "1000"))
+STREAM_SLOT_TIMEOUT = float(os.getenv("ASSIST_STREAM_SLOT_TIMEOUT", "5"))
+
+# Async client so that in-flight chats wait on the event loop instead of
+# each pinning a threadpool worker for the whole duration of the stream.
+OPENAI_ASYNC_CLIENT = AsyncOpenAI(
+    api_key=os.environ.get("OPENAI_API_KEY"),
+    http_client=DefaultAsyncHttpxClient(
+        limits=httpx.Limits(
+            max_connections=MAX_CONCURRENT_STREAMS,
+            max_keepalive_connections=min(MAX_CONCURRENT_STREAMS, 100),
+        )
+    ),
+)
+
+# Cache for OpenAI responses; in-memory per process by default, or a SQLite
+# file shared by all workers (see utils.answer_cache.create_answer_cache).
+cache = create_answer_cache()
+
+# Trigram index over the cached queries for approximate matching; keys the
+# cache has expired or evicted are dropped lazily on lookup. For shared
+# backends it picks up keys written by other workers every few seconds.
+cache_index = FuzzyIndex(threshold=85)
+INDEX_SYNC_INTERVAL = float(os.getenv("ASSIST_INDEX_SYNC_INTERVAL", "5"))
+_index_synced_at = 0.0
+
+# Optional embedding-based lookup for reworded questions (ASSIST_SEMANTIC_*)
+semantic_cache = create_semantic_cache(cache, OPENAI_ASYNC_CLIENT)
+
+# Upstream streams currently in flight, keyed by normalized query, so that
+# identical questions arriving mid-answer share one OpenAI call.
+in_flight = SingleFlight()
 
 
 class AssistRequest(BaseModel):
@@ -46,23 +86,101 @@ class AssistResponse(BaseModel):
     answer: str
 
 
-def find_fuzzy_match(query: str) -> str:
+def normalize_query(query: str) -> str:
     """
-    Find the closest cached query using fuzzy matching.
+    Canonical form of a query, used as the cache and coalescing key.
     """
-    if not cache:
-        return None
-    closest_match = process.extractOne(query, cache.keys(), scorer=fuzz.ratio)
-    return (
-        closest_match[0] if closest_match and closest_match[1] > 85 else None
-    )
+    return " ".join(query.lower().split())
 
 
-def stream_openai_response(query: str):
+async def sync_cache_index():
+    """
+    Bring the fuzzy index up to date with the cache backend, at most once
+    per INDEX_SYNC_INTERVAL seconds.
+
+    The backend is queried through `cache.run_io`, off the event loop for
+    the shared SQLite cache; the index itself is only touched on the loop.
+    Keys written by other workers are queued for the semantic cache too.
     """
-    **Changed to a synchronous generator** that yields text chunks.
-    Using `for chunk in ...` because the OpenAI client's `stream=True`
-    returns a sync generator.
+    global _index_synced_at
+    now = time.time()
+    if now - _index_synced_at < INDEX_SYNC_INTERVAL:
+        return
+    # Claimed before awaiting, so concurrent requests do not all sync
+    synced_at, _index_synced_at = _index_synced_at, now
+    # Entries evicted silently by the backend accumulate in the index until
+    # they are looked up; rebuild once they clearly outnumber live ones.
+    if len(cache_index) > 2 * await cache.run_io(len, cache) + 100:
+        cache_index.rebuild(await cache.run_io(cache.keys))
+    elif cache.shared or not synced_at:
+        # Overlap the window a little so keys written concurrently with the
+        # previous sync are not missed.
+        for key in await cache.run_io(cache.keys_since, synced_at - 1):
+            cache_index.add(key)
+            if semantic_cache is not None and key not in semantic_cache.index:
+                semantic_cache.add(key)
+
+
+async def find_fuzzy_match(query: str) -> str:
+    """
+    Find the closest cached query using fuzzy matching, skipping (and
+    forgetting) keys the cache has expired or evicted since.
+    """
+    await sync_cache_index()
+    while len(cache_index):
+        key = cache_index.best_match(query)
+        if key is None or await cache.run_io(cache.__contains__, key):
+            return key
+        cache_index.discard(key)
+    return None
+
+
+# One semaphore per event loop; asyncio primitives must not be shared
+# across loops (e.g. between test clients).
+_stream_slots = weakref.WeakKeyDictionary()
+
+
+def get_stream_slots() -> asyncio.Semaphore:
+    """
+    Return the semaphore limiting concurrent upstream streams on this loop.
+    """
+    loop = asyncio.get_running_loop()
+    slots = _stream_slots.get(loop)
+    if slots is None:
+        slots = asyncio.Semaphore(MAX_CONCURRENT_STREAMS)
+        _stream_slots[loop] = slots
+    return slots
+
+
+async def acquire_stream_slot() -> asyncio.Semaphore:
+    """
+    Wait up to STREAM_SLOT_TIMEOUT seconds for a free upstream stream slot.
+
+    Returns:
+        asyncio.Semaphore: The semaphore the slot must be released to.
+
+    Raises:
+        HTTPException: 503 if every slot stays busy for the whole timeout.
+    """
+    slots = get_stream_slots()
+    try:
+        await asyncio.wait_for(slots.acquire(), timeout=STREAM_SLOT_TIMEOUT)
+    except asyncio.TimeoutError:
+        logger.warning(
+            f"All {MAX_CONCURRENT_STREAMS} assist stream slots are busy."
+        )
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Assistant is at capacity, please retry shortly.",
+            headers={"Retry-After": "1"},
+        )
+    return slots
+
+
+async def stream_openai_response(query: str):
+    """
+    Async generator that yields text chunks streamed from OpenAI.
+    The upstream request is only sent on the first iteration.
     """
     role = f"""
         You are an advanced AI assistant representing Lucid Motors, a premier brand
@@ -93,75 +211,163 @@ def stream_openai_response(query: str):
         AI Response:
     """
 
-    # The create() call here returns a normal generator when stream=True
-    # so we do a plain `for chunk in ...:` loop.
-    stream = OPENAI_CLIENT.chat.completions.create(
-        model="gpt-4o-mini",
-        messages=[
-            {"role": "system", "content": role},
-            {"role": "user", "content": query},
-        ],
-        stream=True,
-        temperature=0.4,
-    )
+    metrics = LLMCallMetrics(CHAT_MODEL)
+    failed = True
+    try:
+        stream = await OPENAI_ASYNC_CLIENT.chat.completions.create(
+            model=CHAT_MODEL,
+            messages=[
+                {"role": "system", "content": role},
+                {"role": "user", "content": query},
+            ],
+            stream=True,
+            # The last chunk then reports the token usage
+            stream_options={"include_usage": True},
+            temperature=0.4,
+        )
+
+        try:
+            async for chunk in stream:
+                logger.debug("Stream chunk from OpenAI: %s", chunk)
+                metrics.usage(getattr(chunk, "usage", None))
+                if chunk.choices and chunk.choices[0].delta.content is not None:
+                    metrics.token()
+                    yield chunk.choices[0].delta.content
+            failed = False
+        finally:
+            await stream.close()
+    finally:
+        metrics.finish(failed)
+
+
+async def cache_answer(query_key: str, chunks: list):
+    """
+    Cache the answer, chunk by chunk, once the upstream stream has completed.
+    """
+    await cache.run_io(cache.set, query_key, list(chunks))
+    cache_index.add(query_key)
+    if semantic_cache is not None:
+        semantic_cache.add(query_key)
+
+
+# The stats endpoints are async so they read the counters and sample deques
+# on the event loop that updates them, never concurrently from a thread.
+@router.get("/assist/cache")
+async def assist_cache_stats():
+    """
+    Hit/miss/eviction counters of this worker's view of the answer cache.
+    """
+    stats = await cache.run_io(cache.stats)
+    if semantic_cache is not None:
+        stats["semantic"] = semantic_cache.stats()
+    return stats
+
+
+@router.get("/assist/metrics")
+async def assist_metrics():
+    """
+    Streaming metrics of this worker's /assist responses by answer source:
+    time to first byte, stream duration, chunks and bytes sent.
+    """
+    return {
+        "streams": stream_metrics.snapshot(),
+        "cache": await cache.run_io(cache.stats),
+    }
+
+
+async def replay_chunks(chunks: list):
+    """
+    Replay a cached answer in the chunks it was originally streamed in.
+    """
+    for chunk in chunks:
+        yield chunk
 
-    for chunk in stream:
-        logger.debug(f"Stream chunk from OpenAI: {chunk}")
-        if chunk.choices[0].delta.content is not None:
-            yield chunk.choices[0].delta.content
 
 @router.post("/assist")
-def assist(request: AssistRequest):
+async def assist(request: AssistRequest):
     """
     Endpoint to handle AI assistance queries tailored for Lucid Motors.
     Returns a StreamingResponse that streams text from OpenAI.
     """
+    started = time.perf_counter()
     query = request.query.strip()
-    start_time = time.time()
     if not query:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail="Query cannot be empty."
         )
 
+    normalized_query = normalize_query(query)
+
     # Fuzzy match cache check
-    cached_query = find_fuzzy_match(query)
-    logger.debug(f"Cached query: {cached_query}, is query in cache? {query in cache}")
+    cached_query = await find_fuzzy_match(normalized_query)
+    logger.debug(f"Cached query: {cached_query}")
 
     # If a fuzzy match exists or exact query is in cache, return cached response as a stream
-    if cached_query or (query in cache):
-        query_key = cached_query or query
+    query_key = cached_query or normalized_query
+    source = "cache"
+    answer = await cache.run_io(cache.get, query_key)
+    if answer is None and semantic_cache is not None:
+        try:
+            semantic_key = await semantic_cache.lookup(normalized_query)
+        except Exception as e:
+            # The semantic layer is an optimization; never fail on it.
+            logger.error(f"Semantic cache lookup failed: {e}")
+            semantic_key = None
+        if semantic_key is not None:
+            query_key = semantic_key
+            source = "semantic"
+            answer = await cache.run_io(cache.get, query_key)
+    if answer is not None:
         logger.info(f"Serving fuzzy cached response for query: {query_key}")
-
-        def cached_gen():
-            yield cache[query_key]
-
-        return StreamingResponse(cached_gen(), media_type="text/plain")
-
-    # Otherwise, stream from OpenAI and update the cache once the full response is accumulated
-    try:
-        def generate_and_cache(user_query: str):
-            collected_chunks = []
-            for chunk in stream_openai_response(user_query):
-                collected_chunks.append(chunk)
-                # Stream out each chunk to the client
-                yield chunk
-
-            # Once done streaming, cache the full answer
-            final_answer = "".join(collected_chunks)
-            cache[user_query] = final_answer
-
-        end_time = time.time()
-        logger.info(
-            f"OpenAI streaming request started for query '{query}' at {start_time:.2f} "
-            f"and ended at {end_time:.2f}"
-        )
-
         return StreamingResponse(
-            generate_and_cache(query),
-            media_type="text/plain"
+            stream_metrics.instrument(replay_chunks(answer), source, started),
+            media_type="text/plain",
         )
 
+    # Otherwise join the in-flight stream for this query, or start one that
+    # caches the full answer once it is complete.
+    source = "coalesced"
+    flight = in_flight.get(normalized_query)
+    if flight is None:
+        slots = await acquire_stream_slot()
+        # Another request may have started the stream while we waited.
+        flight = in_flight.get(normalized_query)
+        if flight is None:
+            source = "upstream"
+            flight = in_flight.start(
+                normalized_query,
+                stream_openai_response(query),
+                on_complete=partial(cache_answer, normalized_query),
+                on_finally=slots.release,
+            )
+        else:
+            slots.release()
+    if source == "coalesced":
+        logger.info(f"Joining in-flight OpenAI stream for query: {query}")
+
+    # Wait for the first chunk so upstream failures still surface as a
+    # proper HTTP error status.
+    try:
+        await flight.wait_started()
+    except OpenAIError as e:
+        logger.error("OpenAI error in /assist: %s", e)
+        stream_metrics.record(source, None, time.perf_counter() - started,
+                              0, 0, failed=True)
+        raise HTTPException(
+            status_code=status.HTTP_502_BAD_GATEWAY,
+            detail="Error communicating with AI service."
+        ) from e
     except Exception as e:
-        logger.error("Error in /assist: %s", e)
-        raise HTTPException(500, f"Live chat failed: {e}") from e
+        logger.error("Error in /assist: %s", e, exc_info=True)
+        stream_metrics.record(source, None, time.perf_counter() - started,
+                              0, 0, failed=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred."
+        ) from e
+
+    return StreamingResponse(
+        stream_metrics.instrument(flight.subscribe(), source, started),
+        media_type="text/plain",
+    )
@@ -1,53 +1,94 @@
 import logging
-from fastapi import APIRouter, HTTPException, status, Depends
-from sqlalchemy.orm import Session
-from typing import List
-from models.init_db import Client, Vehicle, Appointment
+from fastapi import APIRouter, HTTPException, status, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.orm import joinedload
+from typing import List, Optional
+from models.init_db import Client, Vehicle, Appointment, ServiceHistory
 from models.schemas import (
     CustomerResponse,
     CustomerDetailResponse,
     VehicleBase,
     AppointmentBase,
+    ServiceRecordBase,
 )
-from utils.dependencies import get_db
-from cachetools import TTLCache
+from utils.dependencies import ReadSession, read_db
+from utils.json_response import dump_rows
+from utils.response_cache import CachedResponse, response_cache
 
 router = APIRouter()
 logger = logging.getLogger(__name__)
-customer_cache = TTLCache(maxsize=500, ttl=600)  # Cache up to 500 customers for 10 minutes
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+MAX_BATCH_IDS = 100
+
+# Optional relations of the customer detail endpoints
+DETAIL_INCLUDES = frozenset({"service_records"})
+
+# Response cache namespace of the customer list and detail endpoints
+CUSTOMERS = "customers"
+response_cache.invalidate_on(
+    CUSTOMERS, Client, Vehicle, Appointment, ServiceHistory
+)
 
 
 @router.get("/", response_model=List[CustomerResponse])
-def get_customers(db: Session = Depends(get_db)):
+async def get_customers(
+    after_id: Optional[int] = Query(None, ge=0),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    name: Optional[str] = Query(None, min_length=1),
+    email: Optional[str] = Query(None, min_length=1),
+    db: ReadSession = Depends(read_db(CUSTOMERS)),
+):
     """
-    Retrieve all customers.
+    Retrieve one page of customers, ordered by ID.
+
+    Pages are keyset-paginated: pass the X-Next-Cursor header of a page as
+    `after_id` to fetch the next one; the header is absent on the last page.
+    Only the listed columns are selected (never the password hash), and
+    serialized pages are served from the response cache until a client,
+    vehicle or appointment is written.
 
     Args:
-        db (Session): Database session dependency.
+        after_id (int): Return customers with an ID greater than this.
+        limit (int): Maximum number of customers to return.
+        name (str): Case-insensitive prefix of the customer name.
+        email (str): Case-insensitive prefix of the customer email.
+        db (ReadSession): Read session dependency.
 
     Returns:
-        List[CustomerResponse]: A list of customer details.
+        List[CustomerResponse]: A page of customer details.
 
     Raises:
-        HTTPException: If no customers are found.
+        HTTPException: If the customers cannot be fetched.
     """
-    
-    if "customers" in customer_cache:
-        logger.info("Serving cached customer list.")
-        return customer_cache["customers"]
+    params = (
+        "list",
+        after_id,
+        limit,
+        name.lower() if name else None,
+        email.lower() if email else None,
+    )
+    cached = response_cache.get(CUSTOMERS, params)
+    if cached is not None:
+        return cached.to_response()
 
+    generation = response_cache.generation(CUSTOMERS)
     try:
-        customers = db.query(Client).all()
-        if not customers:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="No customers found."
+        query = select(Client.id, Client.name, Client.email, Client.phone)
+        if after_id is not None:
+            query = query.where(Client.id > after_id)
+        if name:
+            query = query.where(
+                func.lower(Client.name).startswith(name.lower(), autoescape=True)
             )
-        customer_cache["customers"] = customers
-        return [
-            CustomerResponse.model_validate(customer)
-            for customer in customers
-        ]
+        if email:
+            query = query.where(
+                func.lower(Client.email).startswith(
+                    email.lower(), autoescape=True
+                )
+            )
+        rows = await db.rows(query.order_by(Client.id).limit(limit))
     except Exception as e:
         logger.error(
             f"Unexpected error fetching customers: {e}", exc_info=True
@@ -57,15 +98,169 @@ def get_customers(db: Session = Depends(get_db)):
             detail="Failed to fetch customers."
         )
 
+    headers = {}
+    if len(rows) == limit:
+        headers["X-Next-Cursor"] = str(rows[-1].id)
+    entry = CachedResponse(dump_rows(rows), headers)
+    response_cache.set(
+        CUSTOMERS, params, entry, generation, replica=db.used_replica
+    )
+    return entry.to_response()
+
+
+def parse_include(include: Optional[str]) -> frozenset:
+    """
+    Parse the comma-separated `include` parameter of the detail endpoints.
+
+    Raises:
+        HTTPException: If it names an unknown relation.
+    """
+    if not include:
+        return frozenset()
+    names = frozenset(name.strip() for name in include.split(",") if name.strip())
+    unknown = names - DETAIL_INCLUDES
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown include: {', '.join(sorted(unknown))}."
+        )
+    return names
+
+
+def select_customer_details(include: frozenset):
+    """
+    Select clients with their vehicles and appointments joined in, so they
+    load in one round trip. Service records, when included, are loaded with
+    one extra SELECT ... IN query rather than multiplying the joined rows.
+    """
+    vehicles = joinedload(Client.vehicles)
+    options = [vehicles.joinedload(Vehicle.appointments)]
+    if "service_records" in include:
+        options.append(vehicles.selectinload(Vehicle.service_records))
+    return select(Client).options(*options)
+
+
+def build_customer_detail(customer: Client, include: frozenset):
+    vehicles = customer.vehicles
+    return CustomerDetailResponse(
+        customer=CustomerResponse.model_validate(customer),
+        vehicles=[VehicleBase.model_validate(vehicle) for vehicle in vehicles],
+        appointments=[
+            AppointmentBase.model_validate(appointment)
+            for vehicle in vehicles
+            for appointment in vehicle.appointments
+        ],
+        service_records=[
+            ServiceRecordBase.model_validate(record)
+            for vehicle in vehicles
+            for record in vehicle.service_records
+        ] if "service_records" in include else None,
+    )
+
+
+def dump_customer_detail(detail: CustomerDetailResponse,
+                         include: frozenset) -> bytes:
+    """
+    Serialize a customer detail; service_records only appears when it was
+    asked for, so the default response keeps its original shape.
+    """
+    exclude = None if "service_records" in include else {"service_records"}
+    return detail.model_dump_json(exclude=exclude).encode()
+
+
+@router.get("/details", response_model=List[CustomerDetailResponse])
+async def get_customers_details(
+    ids: str = Query(..., description="Comma-separated customer IDs"),
+    include: Optional[str] = Query(None),
+    db: ReadSession = Depends(read_db(CUSTOMERS)),
+):
+    """
+    Retrieve detailed information for several customers at once.
+
+    Args:
+        ids (str): Comma-separated customer IDs, at most MAX_BATCH_IDS.
+        include (str): Comma-separated optional relations
+            ("service_records").
+        db (ReadSession): Read session.
+
+    Returns:
+        List[CustomerDetailResponse]: Details of the customers found, in the
+        order requested; unknown IDs are skipped.
+
+    Raises:
+        HTTPException: If the IDs are invalid or cannot be fetched.
+    """
+    try:
+        customer_ids = list(
+            dict.fromkeys(int(part) for part in ids.split(",") if part.strip())
+        )
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="ids must be comma-separated integers."
+        )
+    if not customer_ids or len(customer_ids) > MAX_BATCH_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Provide between 1 and {MAX_BATCH_IDS} ids."
+        )
+    includes = parse_include(include)
+
+    params = ("details", tuple(customer_ids), includes)
+    cached = response_cache.get(CUSTOMERS, params)
+    if cached is not None:
+        return cached.to_response()
+
+    generation = response_cache.generation(CUSTOMERS)
+    try:
+        customers = {
+            customer.id: customer
+            for customer in await db.scalars(
+                select_customer_details(includes)
+                .where(Client.id.in_(customer_ids)),
+                unique=True,
+            )
+        }
+        details = [
+            build_customer_detail(customers[customer_id], includes)
+            for customer_id in customer_ids
+            if customer_id in customers
+        ]
+    except Exception as e:
+        logger.error(
+            f"Unexpected error fetching customer details: {e}", exc_info=True
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch customer details."
+        )
+
+    entry = CachedResponse(
+        b"["
+        + b",".join(dump_customer_detail(d, includes) for d in details)
+        + b"]"
+    )
+    response_cache.set(
+        CUSTOMERS, params, entry, generation, replica=db.used_replica
+    )
+    return entry.to_response()
+
 
 @router.get("/{customer_id}", response_model=CustomerDetailResponse)
-def get_customer_details(customer_id: int, db: Session = Depends(get_db)):
+async def get_customer_details(
+    customer_id: int,
+    include: Optional[str] = Query(None),
+    db: ReadSession = Depends(read_db(CUSTOMERS)),
+):
     """
-    Retrieve detailed information for a specific customer.
+    Retrieve detailed information for a specific customer, served from the
+    response cache when possible.
 
     Args:
         customer_id (int): ID of the customer.
-        db (Session): Database session.
+        include (str): Comma-separated optional relations
+            ("service_records").
+        db (ReadSession): Read session.
 
     Returns:
         CustomerDetailResponse: Customer details including vehicles
@@ -74,37 +269,27 @@ def get_customer_details(customer_id: int, db: Session = Depends(get_db)):
     Raises:
         HTTPException: If customer not found.
     """
+    includes = parse_include(include)
+    params = ("detail", customer_id, includes)
+    cached = response_cache.get(CUSTOMERS, params)
+    if cached is not None:
+        return cached.to_response()
+
+    generation = response_cache.generation(CUSTOMERS)
     try:
-        customer = db.query(Client).filter(Client.id == customer_id).first()
+        customers = await db.scalars(
+            select_customer_details(includes).where(Client.id == customer_id),
+            unique=True,
+        )
+        customer = customers[0] if customers else None
         if not customer:
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail="Customer not found."
             )
-
-        vehicles = (
-            db.query(Vehicle)
-            .filter(Vehicle.client_id == customer_id)
-            .all()
-        )
-        vins = [v.vin for v in vehicles]
-        appointments = (
-            db.query(Appointment)
-            .filter(Appointment.vin.in_(vins))
-            .all()
-        )
-
-        return CustomerDetailResponse(
-            customer=CustomerResponse.model_validate(customer),
-            vehicles=[
-                VehicleBase.model_validate(vehicle)
-                for vehicle in vehicles
-            ],
-            appointments=[
-                AppointmentBase.model_validate(appointment)
-                for appointment in appointments
-            ],
-        )
+        detail = build_customer_detail(customer, includes)
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(
             f"Unexpected error fetching customer details: {e}", exc_info=True
@@ -113,3 +298,9 @@ def get_customer_details(customer_id: int, db: Session = Depends(get_db)):
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to fetch customer details."
         )
+
+    entry = CachedResponse(dump_customer_detail(detail, includes))
+    response_cache.set(
+        CUSTOMERS, params, entry, generation, replica=db.used_replica
+    )
+    return entry.to_response()
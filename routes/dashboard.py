@@ -1,25 +1,163 @@
 # backend/routes/dashboard.py
 
-from fastapi import APIRouter, Depends
-from utils.auth import get_current_user
-from typing import List
-from models.init_db import Appointment
+import datetime
+import logging
+from collections import Counter
+from typing import Optional, List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
-from utils.dependencies import get_db
+from models.init_db import Appointment, AppointmentRollup
+from models.schemas import AppointmentBase, DashboardSummary
+from utils.auth import get_current_user
+from utils.dashboard_rollup import USE_ROLLUP
+from utils.dependencies import ReadSession, get_db, read_db
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+DEFAULT_SUMMARY_DAYS = 30
+MAX_SUMMARY_DAYS = 366
+DASHBOARD_ROLES = ("employee", "superuser")
 
 
-@router.get("/dashboard", response_model=List[Appointment])
+@router.get("/dashboard", response_model=List[AppointmentBase])
 def read_dashboard(
     user: dict = Depends(get_current_user), db: Session = Depends(get_db)
 ):
     """
     Retrieve dashboard data based on user role.
+
+    Prefer /dashboard/summary, which returns the aggregates instead of
+    every appointment.
     """
-    if user["role"] in ["employee", "superuser"]:
+    if user["role"] in DASHBOARD_ROLES:
         appointments = db.query(Appointment).all()
         return appointments
     else:
         # Customers should not access dashboard
         return []
+
+
+def summary_statement(date_from: datetime.date, date_to: datetime.date,
+                      employee_id: Optional[int], use_rollup: bool):
+    """
+    Appointment counts grouped by day, status, service type and technician,
+    read from the rollup table or aggregated from the appointments table.
+    """
+    if use_rollup:
+        source = AppointmentRollup
+        count = AppointmentRollup.count
+    else:
+        source = Appointment
+        count = func.count()
+    columns = [
+        source.date, source.status, source.service_type, source.employee_id
+    ]
+    statement = select(*columns, count.label("count")).where(
+        source.date >= date_from, source.date <= date_to
+    )
+    if employee_id is not None:
+        statement = statement.where(source.employee_id == employee_id)
+    if not use_rollup:
+        statement = statement.group_by(*columns)
+    return statement
+
+
+def build_summary(rows, date_from: datetime.date,
+                  date_to: datetime.date) -> DashboardSummary:
+    """Fold the grouped counts into the per-dimension breakdowns."""
+    by_status, by_service_type = Counter(), Counter()
+    by_employee, by_day = Counter(), Counter()
+    for row in rows:
+        by_status[row.status] += row.count
+        by_service_type[row.service_type] += row.count
+        by_employee[row.employee_id] += row.count
+        by_day[row.date] += row.count
+    return DashboardSummary(
+        date_from=date_from,
+        date_to=date_to,
+        total=sum(by_day.values()),
+        by_status=[
+            {"key": key, "count": count}
+            for key, count in by_status.most_common()
+        ],
+        by_service_type=[
+            {"key": key, "count": count}
+            for key, count in by_service_type.most_common()
+        ],
+        by_employee=[
+            {"employee_id": key, "count": count}
+            for key, count in by_employee.most_common()
+        ],
+        by_day=[
+            {"date": key, "count": count}
+            for key, count in sorted(by_day.items())
+        ],
+    )
+
+
+@router.get("/dashboard/summary", response_model=DashboardSummary)
+async def read_dashboard_summary(
+    date_from: Optional[datetime.date] = None,
+    date_to: Optional[datetime.date] = None,
+    employee_id: Optional[int] = None,
+    user: dict = Depends(get_current_user),
+    db: ReadSession = Depends(read_db("dashboard")),
+):
+    """
+    Appointment counts by status, service type, technician and day, computed
+    in the database.
+
+    Served from the appointment_rollups table (one indexed range read) when
+    DASHBOARD_ROLLUP is on, otherwise with a GROUP BY over appointments.
+
+    Args:
+        date_from (date): First day (default: today).
+        date_to (date): Last day, inclusive (default: 30 days after
+            date_from).
+        employee_id (int): Only count this technician's appointments.
+        user (dict): The authenticated user; must be an employee.
+        db (ReadSession): Read session.
+
+    Returns:
+        DashboardSummary: The counts per dimension and the total.
+
+    Raises:
+        HTTPException: If the user is not an employee, the window is
+        invalid, or the counts cannot be fetched.
+    """
+    if user["role"] not in DASHBOARD_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="The dashboard is only available to employees."
+        )
+    date_from = date_from or datetime.date.today()
+    date_to = date_to or date_from + datetime.timedelta(
+        days=DEFAULT_SUMMARY_DAYS
+    )
+    if date_to < date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_to must not be before date_from."
+        )
+    if (date_to - date_from).days >= MAX_SUMMARY_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"The window is limited to {MAX_SUMMARY_DAYS} days."
+        )
+
+    try:
+        rows = await db.rows(
+            summary_statement(date_from, date_to, employee_id, USE_ROLLUP)
+        )
+    except Exception as e:
+        logger.error(
+            f"Unexpected error fetching the dashboard summary: {e}",
+            exc_info=True,
+        )
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to fetch the dashboard summary."
+        )
+    return build_summary(rows, date_from, date_to)
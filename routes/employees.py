@@ -1,24 +1,40 @@
 # Updated employees.py
+from typing import List
 from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from utils.dependencies import get_db
+from sqlalchemy import select
+from utils.dependencies import ReadSession, read_db
+from utils.json_response import FastJSONResponse, dump_rows
 from models.init_db import Employee
+from models.schemas import EmployeeResponse
 
 router = APIRouter()
 
 
-@router.get("/employees", response_model=list)
-def read_employees(db: Session = Depends(get_db)):
+@router.get(
+    "/employees",
+    response_model=List[EmployeeResponse],
+    response_class=FastJSONResponse,
+)
+async def read_employees(db: ReadSession = Depends(read_db("employees"))):
     """
     Retrieve all employees.
 
     Args:
-        db (Session): Database session.
+        db (ReadSession): Read session.
 
     Returns:
-        list: List of employees.
+        List[EmployeeResponse]: List of employees, without their password
+        hashes.
     """
-    employees = db.query(Employee).all()
+    employees = await db.rows(
+        select(
+            Employee.id,
+            Employee.name,
+            Employee.email,
+            Employee.phone,
+            Employee.profile_pic_url,
+        ).order_by(Employee.id)
+    )
     if not employees:
         raise HTTPException(status_code=404, detail="No employees found.")
-    return employees
+    return FastJSONResponse(dump_rows(employees))
@@ -0,0 +1,155 @@
+# backend/routes/exports.py
+
+import csv
+import io
+import os
+import zlib
+import logging
+import orjson
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.init_db import Appointment, Client, ServiceHistory, Vehicle
+from utils.auth import get_current_user
+from utils.dependencies import get_db
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Rows fetched per round trip from the server-side cursor, and encoded and
+# sent per chunk
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+EXPORT_ROLES = ("employee", "superuser")
+
+# Exportable tables and their columns (never password hashes)
+EXPORTS = {
+    "customers": (Client.id, Client.name, Client.email, Client.phone),
+    "vehicles": tuple(Vehicle.__table__.columns),
+    "service_history": tuple(ServiceHistory.__table__.columns),
+    "appointments": tuple(Appointment.__table__.columns),
+}
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def accepts_gzip(accept_encoding: str) -> bool:
+    """Whether an Accept-Encoding header allows a gzip response."""
+    for coding in (accept_encoding or "").split(","):
+        name, _, params = coding.partition(";")
+        if name.strip().lower() == "gzip":
+            return params.replace(" ", "") not in ("q=0", "q=0.0")
+    return False
+
+
+def encode_batches(fields, batches, fmt: str):
+    """
+    Encode batches of rows as NDJSON lines or CSV (with a header line),
+    one chunk of bytes per batch.
+    """
+    if fmt == "csv":
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(fields)
+        for batch in batches:
+            writer.writerows(batch)
+            yield buffer.getvalue().encode()
+            buffer.seek(0)
+            buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode()
+    else:
+        for batch in batches:
+            yield b"".join(
+                orjson.dumps(dict(zip(fields, row))) + b"\n" for row in batch
+            )
+
+
+def gzip_chunks(chunks):
+    """Compress a stream of chunks into one gzip stream, on the fly."""
+    compressor = zlib.compressobj(wbits=31)
+    for chunk in chunks:
+        data = compressor.compress(chunk)
+        if data:
+            yield data
+    yield compressor.flush()
+
+
+def stream_rows(db: Session, columns, batch_size: int):
+    """
+    Yield the table's rows in primary key order, `batch_size` at a time,
+    from a server-side cursor so only one batch is held in memory.
+    """
+    primary_key = [column for column in columns if column.primary_key]
+    result = db.execute(
+        select(*columns)
+        .order_by(*primary_key)
+        .execution_options(yield_per=batch_size)
+    )
+    try:
+        yield from result.partitions()
+    except Exception as e:
+        # The response has started; all that is left is to cut it short.
+        logger.error(f"Export failed mid-stream: {e}", exc_info=True)
+        raise
+    finally:
+        result.close()
+
+
+@router.get("/{table}")
+def export_table(
+    table: str,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$"),
+    accept_encoding: str = Header(None),
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Stream a whole table as NDJSON or CSV.
+
+    Rows are read from a server-side cursor in batches of EXPORT_BATCH_SIZE
+    and sent as they are encoded, so memory use does not grow with the
+    table. The stream is gzip-compressed on the fly when the client accepts
+    it.
+
+    Args:
+        table (str): customers, vehicles, service_history or appointments.
+        format (str): "ndjson" (default) or "csv".
+        accept_encoding (str): Accept-Encoding request header.
+        user (dict): The authenticated user; must be an employee.
+        db (Session): Database session; FastAPI 0.118+ keeps it open
+            until the stream ends (requirements.txt pins it).
+
+    Returns:
+        StreamingResponse: The exported rows.
+
+    Raises:
+        HTTPException: If the user is not an employee or the table is
+        unknown.
+    """
+    if user["role"] not in EXPORT_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Exports are only available to employees."
+        )
+    if table not in EXPORTS:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Unknown export: {table}."
+        )
+
+    columns = EXPORTS[table]
+    fields = [column.name for column in columns]
+    chunks = encode_batches(
+        fields, stream_rows(db, columns, EXPORT_BATCH_SIZE), format
+    )
+    headers = {
+        "Content-Disposition": f'attachment; filename="{table}.{format}"',
+        "Vary": "Accept-Encoding",
+    }
+    if accepts_gzip(accept_encoding):
+        chunks = gzip_chunks(chunks)
+        headers["Content-Encoding"] = "gzip"
+    logger.info(f"Exporting {table} as {format} for user {user['id']}")
+    return StreamingResponse(
+        chunks, media_type=MEDIA_TYPES[format], headers=headers
+    )
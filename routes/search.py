@@ -0,0 +1,119 @@
+# backend/routes/search.py
+
+import logging
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from models.init_db import Client, ServiceHistory, Vehicle
+from models.schemas import SearchResult
+from utils.auth import get_current_user
+from utils.dependencies import get_db
+from utils.search_index import KINDS, search_index
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+SEARCH_ROLES = ("employee", "superuser")
+MAX_SEARCH_RESULTS = 100
+
+# Columns shown for each kind of hit, the record ID first
+DISPLAY_COLUMNS = {
+    "customer": (Client.id, Client.name, Client.email, Client.phone),
+    "vehicle": (Vehicle.vin, Vehicle.model, Vehicle.year),
+    "service_record": (
+        ServiceHistory.id, ServiceHistory.vin, ServiceHistory.date,
+        ServiceHistory.service_type, ServiceHistory.notes,
+    ),
+}
+
+
+def describe(kind: str, row) -> tuple:
+    """Title and detail lines of a hit."""
+    if kind == "customer":
+        return row.name, f"{row.email}, {row.phone}"
+    if kind == "vehicle":
+        return row.vin, f"{row.year} {row.model}"
+    return f"{row.service_type} on {row.date} ({row.vin})", row.notes
+
+
+def hydrate(db: Session, hits: list) -> list:
+    """
+    Turn index hits into results, reading the displayed columns with one
+    query per kind. Hits whose record is gone are skipped.
+    """
+    ids = {}
+    for hit in hits:
+        ids.setdefault(hit.kind, []).append(hit.id)
+    rows = {}
+    for kind, kind_ids in ids.items():
+        columns = DISPLAY_COLUMNS[kind]
+        query = select(*columns).where(columns[0].in_(kind_ids))
+        for row in db.execute(query):
+            rows[(kind, row[0])] = row
+    results = []
+    for hit in hits:
+        row = rows.get((hit.kind, hit.id))
+        if row is not None:
+            title, detail = describe(hit.kind, row)
+            results.append(SearchResult(
+                kind=hit.kind, id=hit.id, score=hit.score, title=title,
+                detail=detail,
+            ))
+    return results
+
+
+@router.get("/", response_model=List[SearchResult])
+def search(
+    q: str = Query(..., min_length=1, max_length=200),
+    kinds: Optional[str] = None,
+    limit: int = Query(20, ge=1, le=MAX_SEARCH_RESULTS),
+    user: dict = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    """
+    Search customers (name, email, phone), vehicles (VIN, model) and service
+    records (notes) by partial, prefix or misspelled terms.
+
+    Every word of the query must match. The index is filled on first use
+    and then follows the writes committed by the application.
+
+    Args:
+        q (str): The search text.
+        kinds (str): Comma-separated kinds to return ("customer",
+            "vehicle", "service_record"); all by default.
+        limit (int): Maximum number of results.
+        user (dict): The authenticated user; must be an employee.
+        db (Session): Database session.
+
+    Returns:
+        List[SearchResult]: Matching records, best first.
+
+    Raises:
+        HTTPException: If the user is not an employee or a kind is unknown.
+    """
+    if user["role"] not in SEARCH_ROLES:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Search is only available to employees."
+        )
+    selected = None
+    if kinds:
+        selected = {kind.strip() for kind in kinds.split(",") if kind.strip()}
+        unknown = selected - set(KINDS)
+        if unknown:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Unknown kinds: {', '.join(sorted(unknown))}."
+            )
+
+    try:
+        search_index.ensure_loaded(db)
+        hits = search_index.search(q, kinds=selected, limit=limit)
+        return hydrate(db, hits)
+    except Exception as e:
+        logger.error(f"Search for {q!r} failed: {e}", exc_info=True)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Search failed."
+        )
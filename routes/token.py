@@ -1,25 +1,81 @@
 # backend/routes/token.py
 
+import logging
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import literal, select, union_all
 from sqlalchemy.orm import Session
-from utils.auth import verify_password, create_access_token
+from utils.auth import create_access_token
 from utils.dependencies import get_db
+from utils.passwords import VerificationBusy, verify_password_offloaded
 from models.init_db import Client, Employee
 
 router = APIRouter()
+logger = logging.getLogger(__name__)
+
+# Principal tables, in lookup priority order
+PRINCIPALS = {"customer": Client, "employee": Employee}
+
+
+def find_principal(db: Session, email: str):
+    """
+    Look the email up in every principal table with one UNION ALL query.
+
+    Returns:
+        Row: (role, id, password) of the first match in PRINCIPALS order,
+        or None.
+    """
+    lookup = union_all(*(
+        select(
+            literal(priority).label("priority"),
+            literal(role).label("role"),
+            model.id,
+            model.password,
+        ).where(model.email == email)
+        for priority, (role, model) in enumerate(PRINCIPALS.items())
+    )).subquery()
+    return db.execute(
+        select(lookup.c.role, lookup.c.id, lookup.c.password)
+        .order_by(lookup.c.priority)
+        .limit(1)
+    ).first()
+
+
+def lookup_principal(db: Session, email: str):
+    """
+    `find_principal`, then end the read transaction so its connection goes
+    back to the pool before the slow bcrypt check.
+    """
+    principal = find_principal(db, email)
+    db.commit()
+    return principal
+
+
+def update_password_hash(db: Session, role: str, principal_id: int,
+                         new_hash: str):
+    model = PRINCIPALS[role]
+    db.query(model).filter(model.id == principal_id).update(
+        {"password": new_hash}, synchronize_session=False
+    )
+    db.commit()
 
 
 @router.post("/token")
-def login_for_access_token(
+async def login_for_access_token(
     form_data: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(get_db)
 ):
     """
     Authenticate user and provide JWT token with role.
 
+    The bcrypt check runs in the password process pool, with no database
+    connection held, and the database calls in the threadpool, so the event
+    loop is never blocked; hashes made with outdated settings are replaced
+    with fresh ones on successful login.
+
     Args:
-        form_data (OAuth2PasswordRequestForm): Form data containing 
+        form_data (OAuth2PasswordRequestForm): Form data containing
         username and password.
         db (Session): Database session.
 
@@ -27,36 +83,47 @@ def login_for_access_token(
         dict: Contains access_token and token_type.
 
     Raises:
-        HTTPException: If authentication fails.
+        HTTPException: If authentication fails, or 503 if too many logins
+        are being verified.
     """
-    # Attempt to find user in Client (Customer) table
-    user = db.query(Client).filter(Client.email == form_data.username).first()
-    role = "customer"
-    if not user:
-        # Attempt to find user in Employee table
-        user = (
-            db.query(Employee)
-            .filter(Employee.email == form_data.username)
-            .first()
-        )
-        role = "employee"
-        if not user:
-            # User not found in either table
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Incorrect email or password.",
-                headers={"WWW-Authenticate": "Bearer"},
-            )
+    credentials_exception = HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail="Incorrect email or password.",
+        headers={"WWW-Authenticate": "Bearer"},
+    )
+    # A burst of logins must not hold every connection while hashing; a
+    # rehash below checks one out again.
+    principal = await run_in_threadpool(
+        lookup_principal, db, form_data.username
+    )
+    if principal is None:
+        # User not found in either table
+        raise credentials_exception
 
     # Verify password
-    if not verify_password(form_data.password, user.password):
+    try:
+        valid, new_hash = await verify_password_offloaded(
+            form_data.password, principal.password
+        )
+    except VerificationBusy:
+        logger.warning("Password verification pool is saturated.")
         raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Incorrect email or password.",
-            headers={"WWW-Authenticate": "Bearer"},
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many login attempts in progress, please retry.",
+            headers={"Retry-After": "1"},
+        )
+    if not valid:
+        raise credentials_exception
+
+    if new_hash:
+        await run_in_threadpool(
+            update_password_hash, db, principal.role, principal.id, new_hash
         )
+        logger.info(f"Rehashed password of {principal.role} {principal.id}")
 
     # Create JWT token with role
-    access_token = create_access_token(data={"id": user.id, "role": role})
+    access_token = create_access_token(
+        data={"sub": principal.id, "id": principal.id, "role": principal.role}
+    )
 
     return {"access_token": access_token, "token_type": "bearer"}
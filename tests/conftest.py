@@ -1,14 +1,18 @@
 # backend/tests/conftest.py
 
+from contextlib import contextmanager
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
 from models.init_db import Base
 from utils.dependencies import get_db  # Import get_db function
 from main import app
-from models.init_db import Client
-from utils.auth import get_password_hash
+from models.init_db import Client, Employee
+from utils import query_stats
+from utils.auth import create_access_token, get_password_hash
 from dotenv import load_dotenv
 import os
 from jose import jwt, JWTError
@@ -21,13 +25,18 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 if not SECRET_KEY:
     raise ValueError("SECRET_KEY environment variable is not set.")
 
-# Configure test database (use a separate test database)
-TEST_DATABASE_URL = "sqlite:///./test.db"  # Using SQLite for testing
+# Configure test database: a private in-memory SQLite database, shared by
+# every connection of the test engine, so the run leaves no file behind
+TEST_DATABASE_URL = "sqlite://"
 
-engine = create_engine(TEST_DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    TEST_DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=StaticPool,
+)
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-# Create the database tables
+# Create the tables from the models, so their schema always matches
 Base.metadata.create_all(bind=engine)
 
 
@@ -97,3 +106,61 @@ def auth_token(client, test_user):
         pytest.fail(f"Token decoding failed: {e}")
 
     return token
+
+
+@pytest.fixture(scope="session")
+def employee(db):
+    """Create an employee (technician) in the database."""
+    employee = Employee(
+        name="Test Employee",
+        email="testemployee@example.com",
+        phone="5550000100",
+        password="not-a-real-hash",
+    )
+    db.add(employee)
+    db.commit()
+    db.refresh(employee)
+    return employee
+
+
+@pytest.fixture(scope="session")
+def employee_auth_headers(employee):
+    """Authorization headers carrying an employee token."""
+    token = create_access_token(
+        data={"sub": employee.id, "id": employee.id, "role": "employee"}
+    )
+    return {"Authorization": f"Bearer {token}"}
+
+
+@contextmanager
+def count_queries():
+    """
+    Collect the QueryStats the app attributes to each request made inside
+    the block, as (path, stats) pairs in the order the requests finish.
+    """
+    requests = []
+
+    def collect(scope, stats):
+        requests.append((scope["path"], stats))
+
+    query_stats.add_listener(collect)
+    try:
+        yield requests
+    finally:
+        query_stats.remove_listener(collect)
+
+
+@contextmanager
+def assert_max_queries(limit):
+    """
+    Fail if a request made inside the block runs more than `limit`
+    queries, so endpoints cannot grow N+1 queries unnoticed.
+    """
+    with count_queries() as requests:
+        yield requests
+    assert requests, "No request was made."
+    for path, stats in requests:
+        assert stats.count <= limit, (
+            f"{path} ran {stats.count} queries, expected at most {limit}; "
+            f"slowest: {stats.slowest_statement}"
+        )
@@ -0,0 +1,105 @@
+# backend/tests/test_access_log.py
+import logging
+
+import pytest
+from fastapi import FastAPI, HTTPException
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+
+from utils.access_log import AccessLogMiddleware, redact
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def handler():
+    handler = ListHandler()
+    log = logging.getLogger("test_access_log")
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    yield handler
+    log.removeHandler(handler)
+
+
+def make_client(**options) -> TestClient:
+    app = FastAPI()
+
+    @app.post("/assist")
+    async def assist(payload: dict):
+        async def chunks():
+            for chunk in ("a", "b", "c"):
+                yield chunk
+
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    @app.post("/token")
+    async def token(payload: dict):
+        return {"access_token": "abc"}
+
+    @app.get("/boom")
+    async def boom():
+        raise HTTPException(status_code=503, detail="down")
+
+    app.add_middleware(
+        AccessLogMiddleware,
+        logger=logging.getLogger("test_access_log"),
+        **options,
+    )
+    return TestClient(app)
+
+
+def test_logs_streamed_response(handler):
+    client = make_client(body_paths=("/assist",))
+
+    response = client.post("/assist", json={"query": "range?"})
+    assert response.text == "abc"
+    [line] = handler.messages
+    assert "method=POST path=/assist status=200" in line
+    assert "bytes=3" in line
+    assert "range?" in line
+
+
+def test_body_only_logged_for_opted_in_paths(handler):
+    client = make_client(body_paths=("/assist",))
+
+    client.post("/token", json={"username": "a", "password": "hunter2"})
+    [line] = handler.messages
+    assert "path=/token" in line
+    assert "body=" not in line
+
+
+def test_body_is_capped_and_redacted(handler):
+    client = make_client(body_paths=("/assist",), max_body=40)
+
+    client.post(
+        "/assist", json={"password": "hunter2", "query": "x" * 100}
+    )
+    [line] = handler.messages
+    assert "hunter2" not in line
+    assert '"password": "***"' in line or '"password":"***"' in line
+    assert "x" * 40 not in line
+    assert line.endswith("...'")
+
+
+def test_sampling_keeps_server_errors(handler):
+    client = make_client(sample_rate=0.0)
+
+    client.post("/token", json={})
+    client.get("/boom")
+    [line] = handler.messages
+    assert "path=/boom status=503" in line
+
+
+def test_redact_form_and_json():
+    assert redact("username=a&password=hunter2") == "username=a&password=***"
+    assert redact('{"token": "abc", "q": 1}') == '{"token": "***", "q": 1}'
+    # Truncated in the middle of a secret
+    assert "hunt" not in redact('{"password": "hunt')
@@ -0,0 +1,131 @@
+# backend/tests/test_answer_cache.py
+
+import sqlite3
+import threading
+
+import pytest
+
+from utils.answer_cache import (
+    MemoryAnswerCache,
+    SQLiteAnswerCache,
+    pack_chunks,
+    unpack_chunks,
+)
+
+
+class FakeClock:
+    """Wall clock that advances a millisecond on every read."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        self.now += 0.001
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def answer_cache(request, tmp_path):
+    if request.param == "memory":
+        return MemoryAnswerCache(maxsize=3, ttl=60)
+    return SQLiteAnswerCache(
+        str(tmp_path / "answers.db"), maxsize=3, ttl=60, timer=FakeClock()
+    )
+
+
+def test_get_set_and_counters(answer_cache):
+    assert answer_cache.get("range?") is None
+    answer_cache.set("range?", ["About ", "500 miles."])
+    assert answer_cache.get("range?") == ["About ", "500 miles."]
+    assert "range?" in answer_cache
+
+    stats = answer_cache.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["hit_ratio"] == 0.5
+    assert stats["size"] == 1
+
+
+def test_size_bound_evicts_least_recently_used(answer_cache):
+    for key in ("a", "b", "c"):
+        answer_cache.set(key, [key.upper()])
+    answer_cache.get("a")  # "b" is now the least recently used
+    answer_cache.set("d", ["D"])
+
+    assert len(answer_cache) == 3
+    assert "b" not in answer_cache
+    assert "a" in answer_cache
+    assert answer_cache.stats()["evictions"] == 1
+
+
+def test_sqlite_entries_expire(tmp_path):
+    clock = FakeClock()
+    cache = SQLiteAnswerCache(
+        str(tmp_path / "answers.db"), maxsize=10, ttl=60, timer=clock
+    )
+    cache.set("warranty?", ["Four years."])
+    clock.now += 61
+    assert cache.get("warranty?") is None
+    assert cache.keys() == []
+
+
+def test_sqlite_cache_is_shared_between_instances(tmp_path):
+    path = str(tmp_path / "answers.db")
+    worker_a = SQLiteAnswerCache(path, maxsize=10, ttl=60)
+    worker_b = SQLiteAnswerCache(path, maxsize=10, ttl=60)
+
+    worker_a.set("charging?", ["Up to ", "300 kW."])
+    assert worker_b.get("charging?") == ["Up to ", "300 kW."]
+    assert worker_b.keys_since(0) == ["charging?"]
+
+    # A restart opens the same file and keeps every answer.
+    restarted = SQLiteAnswerCache(path, maxsize=10, ttl=60)
+    assert restarted.get("charging?") == ["Up to ", "300 kW."]
+
+
+def test_sqlite_row_count_follows_writes(tmp_path):
+    path = str(tmp_path / "answers.db")
+    # A file written before the row counter existed
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE assist_answers (key TEXT PRIMARY KEY, value TEXT "
+        "NOT NULL, boundaries BLOB, created_at REAL NOT NULL, expires_at "
+        "REAL NOT NULL, accessed_at REAL NOT NULL)"
+    )
+    conn.execute(
+        "INSERT INTO assist_answers VALUES ('old', 'x', NULL, 0, 1e12, 0)"
+    )
+    conn.commit()
+    conn.close()
+
+    cache = SQLiteAnswerCache(path, maxsize=2, ttl=60, timer=FakeClock())
+    cache.set("a", ["A"])
+    cache.set("a", ["A again"])  # Overwrites are not counted twice
+    assert cache.stats()["evictions"] == 0
+    cache.set("b", ["B"])
+    assert "old" not in cache
+    assert len(cache) == 2
+    cache.delete("a")
+    cache.set("c", ["C"])
+    assert cache.stats()["evictions"] == 1
+    assert cache.get("a") is None and len(cache) == 2
+
+
+@pytest.mark.asyncio
+async def test_run_io_offloads_shared_backends(tmp_path):
+    threads = []
+
+    def record():
+        threads.append(threading.current_thread())
+
+    await MemoryAnswerCache(maxsize=1, ttl=60).run_io(record)
+    await SQLiteAnswerCache(
+        str(tmp_path / "answers.db"), maxsize=1, ttl=60
+    ).run_io(record)
+    assert threads[0] is threading.current_thread()
+    assert threads[1] is not threading.current_thread()
+
+
+def test_chunks_round_trip():
+    chunks = ["Über ", "", "500 ", "miles 🚗."]
+    assert unpack_chunks(*pack_chunks(chunks)) == chunks
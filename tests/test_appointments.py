@@ -1,7 +1,9 @@
 # backend/tests/test_appointments.py
 
 from models.init_db import Appointment, Client, Vehicle, Employee
-from datetime import date
+from datetime import date, time, timedelta
+
+from tests.conftest import assert_max_queries
 
 
 def test_get_appointments(client, auth_token, db):
@@ -11,6 +13,7 @@ def test_get_appointments(client, auth_token, db):
         email="johndoe@example.com",
         phone="0987654321",
         profile_pic_url=None,
+        password="not-a-real-hash",
     )
     db.add(test_employee)
     db.commit()
@@ -35,7 +38,7 @@ def test_get_appointments(client, auth_token, db):
     test_appointment = Appointment(
         vin=test_vehicle.vin,
         date=date.today(),
-        time="10:00 AM",
+        time=time(10, 0),
         service_type="Oil Change",
         status="Scheduled",
         employee_id=test_employee.id,
@@ -45,7 +48,8 @@ def test_get_appointments(client, auth_token, db):
     db.refresh(test_appointment)
 
     headers = {"Authorization": f"Bearer {auth_token}"}
-    response = client.get("/appointments", headers=headers)
+    with assert_max_queries(1):
+        response = client.get("/appointments", headers=headers)
     assert response.status_code == 200, f"Expected 200, got {response.status_code}"
     data = response.json()
     assert isinstance(data, list), "Response should be a list."
@@ -54,3 +58,71 @@ def test_get_appointments(client, auth_token, db):
     assert any(
         appointment["vin"] == test_vehicle.vin for appointment in data
     ), "Test appointment not found in response."
+
+
+def add_week_of_appointments(db, employee_id):
+    start = date(2030, 3, 4)
+    for day in range(7):
+        for slot, status in ((9, "Scheduled"), (13, "Completed")):
+            db.add(Appointment(
+                vin=f"WEEKVIN{employee_id}",
+                date=start + timedelta(days=day),
+                time=time(slot, 0),
+                service_type="Inspection",
+                status=status,
+                employee_id=employee_id,
+            ))
+    db.commit()
+    return start
+
+
+def test_get_appointments_filters_and_keyset_pages(client, db):
+    start = add_week_of_appointments(db, employee_id=424242)
+    params = {
+        "date_from": start.isoformat(),
+        "date_to": (start + timedelta(days=2)).isoformat(),
+        "employee_id": 424242,
+        "limit": 2,
+    }
+
+    seen = []
+    while True:
+        response = client.get("/appointments", params=params)
+        assert response.status_code == 200
+        seen.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        params["after"] = cursor
+
+    assert [(a["date"], a["time"]) for a in seen] == [
+        ((start + timedelta(days=day)).isoformat(), slot)
+        for day in range(3)
+        for slot in ("09:00:00", "13:00:00")
+    ]
+
+    response = client.get(
+        "/appointments",
+        params={
+            "date_from": start.isoformat(),
+            "employee_id": 424242,
+            "status": "Completed",
+        },
+    )
+    assert len(response.json()) == 7
+    assert all(a["status"] == "Completed" for a in response.json())
+
+    response = client.get(
+        "/appointments",
+        params={"date_from": start.isoformat(), "vin": "WEEKVIN424242"},
+    )
+    assert len(response.json()) == 14
+
+
+def test_get_appointments_rejects_bad_parameters(client):
+    assert client.get("/appointments", params={"after": "nope"}).status_code == 400
+    response = client.get(
+        "/appointments",
+        params={"date_from": "2030-03-05", "date_to": "2030-03-04"},
+    )
+    assert response.status_code == 400
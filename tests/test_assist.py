@@ -1,28 +1,213 @@
 # backend/tests/test_assist.py
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+import httpx
 import openai
+import pytest
+
+from main import app
+from routes import assist
+from tests.test_semantic_cache import TopicEmbedder
+from utils.answer_cache import MemoryAnswerCache, SQLiteAnswerCache
+from utils.fuzzy_index import FuzzyIndex
+from utils.semantic_cache import SemanticCache
+from utils.singleflight import Flight
+from utils.stream_metrics import stream_metrics
+
+
+class FakeOpenAIStream:
+    """Minimal stand-in for the AsyncStream returned with stream=True."""
+
+    def __init__(self, chunks, delay=0):
+        self._chunks = chunks
+        self._delay = delay
+        self.closed = False
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for text in self._chunks:
+            await asyncio.sleep(self._delay)
+            delta = SimpleNamespace(content=text)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=delta)])
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def clear_assist_cache():
+    assist.cache.clear()
+    assist.cache_index.clear()
+    yield
+    assist.cache.clear()
+    assist.cache_index.clear()
+
+
+def mock_completion(mocker, **kwargs):
+    return mocker.patch.object(
+        assist.OPENAI_ASYNC_CLIENT.chat.completions,
+        "create",
+        new=AsyncMock(**kwargs),
+    )
+
+
+def test_assist_success(client, mocker):
+    stream = FakeOpenAIStream(["This is ", "a test ", "response."])
+    mock_completion(mocker, return_value=stream)
+
+    response = client.post("/assist", json={"query": "Tell me a joke."})
+    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
+    assert response.text == "This is a test response.", "AI response mismatch."
+    assert stream.closed, "Upstream stream should be closed."
+    assert assist.cache.get("tell me a joke.") == [
+        "This is ", "a test ", "response."
+    ]
+
+
+def test_assist_serves_cached_answer(client, mocker):
+    assist.cache.set("tell me a joke.", ["Cached ", "answer."])
+    create = mock_completion(mocker)
 
+    response = client.post("/assist", json={"query": "Tell me a joke."})
+    assert response.status_code == 200
+    assert response.text == "Cached answer."
+    create.assert_not_called()
 
-def test_assist_success(client, auth_token, db, mocker):
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    mock_openai_completion = mocker.patch("openai.Completion.create")
-    mock_openai_completion.return_value = type(
-        "obj",
-        (object,),
-        {"choices": [type("obj", (object,), {"text": "This is a test response."})]},
+
+@pytest.fixture
+def answers(mocker):
+    """A fresh answer cache and fuzzy index, with the semantic layer off."""
+    answers = MemoryAnswerCache(maxsize=10, ttl=60)
+    mocker.patch.object(assist, "cache", answers)
+    mocker.patch.object(assist, "cache_index", FuzzyIndex(threshold=85))
+    mocker.patch.object(assist, "semantic_cache", None)
+    return answers
+
+
+def ask_warranty_questions(client):
+    first = client.post(
+        "/assist", json={"query": "How long is the Air warranty?"}
+    )
+    # Too different for the fuzzy index; only the embeddings match
+    paraphrase = client.post(
+        "/assist", json={"query": "What guarantee coverage does my car get?"}
+    )
+    return first.text, paraphrase.text
+
+
+def test_assist_serves_paraphrase_from_semantic_cache(client, mocker, answers):
+    semantic = SemanticCache(TopicEmbedder(), answers, threshold=0.9)
+    mocker.patch.object(assist, "semantic_cache", semantic)
+    create = mock_completion(
+        mocker, side_effect=lambda **kwargs: FakeOpenAIStream(["Four years."])
     )
 
+    assert ask_warranty_questions(client) == ("Four years.", "Four years.")
+    assert create.await_count == 1
+    assert semantic.stats()["hits"] == 1
+    assert client.get("/assist/cache").json()["semantic"]["hits"] == 1
+
+
+def test_assist_semantic_layer_disabled(client, mocker, answers):
+    create = mock_completion(
+        mocker, side_effect=lambda **kwargs: FakeOpenAIStream(["Four years."])
+    )
+
+    assert ask_warranty_questions(client) == ("Four years.", "Four years.")
+    assert create.await_count == 2
+    assert "semantic" not in client.get("/assist/cache").json()
+
+
+class LoopCheckingCache(SQLiteAnswerCache):
+    """Counts the SQLite queries made from the event loop's thread."""
+
+    on_loop = 0
+
+    def _connection(self):
+        try:
+            asyncio.get_running_loop()
+            self.on_loop += 1
+        except RuntimeError:
+            pass
+        return super()._connection()
+
+
+def test_shared_cache_queries_stay_off_the_event_loop(client, mocker,
+                                                      tmp_path):
+    answers = LoopCheckingCache(str(tmp_path / "answers.db"), 10, 60)
+    mocker.patch.object(assist, "cache", answers)
+    mocker.patch.object(assist, "cache_index", FuzzyIndex(threshold=85))
+    mocker.patch.object(assist, "_index_synced_at", 0.0)
+    mocker.patch.object(assist, "INDEX_SYNC_INTERVAL", 0)
+    mocker.patch.object(
+        assist, "semantic_cache",
+        SemanticCache(TopicEmbedder(), answers, threshold=0.9),
+    )
+    create = mock_completion(
+        mocker, side_effect=lambda **kwargs: FakeOpenAIStream(["Four years."])
+    )
+
+    assert ask_warranty_questions(client) == ("Four years.", "Four years.")
+    # A typo goes through the fuzzy index and its liveness check
     response = client.post(
-        "/assist", json={"query": "Tell me a joke."}, headers=headers
+        "/assist", json={"query": "How long is the Air warrenty?"}
     )
-    assert response.status_code == 200, f"Expected 200, got {response.status_code}"
-    data = response.json()
-    assert "answer" in data, "Response should contain 'answer'."
-    assert data["answer"] == "This is a test response.", "AI response mismatch."
+    assert response.text == "Four years."
+    assert client.get("/assist/cache").json()["size"] == 1
+    assert create.await_count == 1
+    assert answers.on_loop == 0
+
+
+def test_semantic_cache_sees_answers_from_other_workers(client, mocker,
+                                                       tmp_path):
+    path = str(tmp_path / "answers.db")
+    answers = SQLiteAnswerCache(path, 10, 60)
+    mocker.patch.object(assist, "cache", answers)
+    mocker.patch.object(assist, "cache_index", FuzzyIndex(threshold=85))
+    mocker.patch.object(assist, "_index_synced_at", 0.0)
+    mocker.patch.object(assist, "INDEX_SYNC_INTERVAL", 0)
+    semantic = SemanticCache(TopicEmbedder(), answers, threshold=0.9)
+    mocker.patch.object(assist, "semantic_cache", semantic)
+    create = mock_completion(mocker)
+
+    # Answered and cached by another worker sharing the file
+    SQLiteAnswerCache(path, 10, 60).set(
+        "how long is the air warranty?", ["Four years."]
+    )
+
+    response = client.post(
+        "/assist", json={"query": "What guarantee coverage does my car get?"}
+    )
+    assert response.text == "Four years."
+    assert semantic.stats()["hits"] == 1
+    create.assert_not_called()
 
 
-def test_assist_empty_query(client, auth_token):
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    response = client.post("/assist", json={"query": "   "}, headers=headers)
+def test_assist_metrics(client, mocker):
+    stream_metrics.reset()
+    mock_completion(mocker, return_value=FakeOpenAIStream(["Hello ", "there."]))
+
+    client.post("/assist", json={"query": "Hi"})
+    client.post("/assist", json={"query": "Hi"})
+
+    response = client.get("/assist/metrics")
+    assert response.status_code == 200
+    streams = response.json()["streams"]
+    assert streams["upstream"]["streams"] == 1
+    assert streams["upstream"]["chunks"] == 2
+    assert streams["cache"]["streams"] == 1
+    # The cached answer is replayed in the chunks it was streamed in.
+    assert streams["cache"]["chunks"] == 2
+    assert streams["cache"]["bytes"] == len("Hello there.")
+    assert streams["cache"]["ttfb_ms"]["p50"] is not None
+
+
+def test_assist_empty_query(client):
+    response = client.post("/assist", json={"query": "   "})
     assert response.status_code == 400, f"Expected 400, got {response.status_code}"
     data = response.json()
     assert (
@@ -30,14 +215,10 @@ def test_assist_empty_query(client, auth_token):
     ), "Incorrect error message for empty query."
 
 
-def test_assist_openai_error(client, auth_token, mocker):
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    mock_openai_completion = mocker.patch("openai.Completion.create")
-    mock_openai_completion.side_effect = openai.OpenAIError("API error")
+def test_assist_openai_error(client, mocker):
+    mock_completion(mocker, side_effect=openai.OpenAIError("API error"))
 
-    response = client.post(
-        "/assist", json={"query": "Tell me a joke."}, headers=headers
-    )
+    response = client.post("/assist", json={"query": "Tell me a joke."})
     assert response.status_code == 502, f"Expected 502, got {response.status_code}"
     data = response.json()
     assert (
@@ -45,16 +226,89 @@ def test_assist_openai_error(client, auth_token, mocker):
     ), "Incorrect error message for OpenAI API error."
 
 
-def test_assist_unexpected_error(client, auth_token, mocker):
-    headers = {"Authorization": f"Bearer {auth_token}"}
-    mock_openai_completion = mocker.patch("openai.Completion.create")
-    mock_openai_completion.side_effect = Exception("Unexpected error")
+def test_assist_unexpected_error(client, mocker):
+    mock_completion(mocker, side_effect=Exception("Unexpected error"))
 
-    response = client.post(
-        "/assist", json={"query": "Tell me a joke."}, headers=headers
-    )
+    response = client.post("/assist", json={"query": "Tell me a joke."})
     assert response.status_code == 500, f"Expected 500, got {response.status_code}"
     data = response.json()
     assert (
         data["detail"] == "An unexpected error occurred."
     ), "Incorrect error message for unexpected error."
+
+
+def test_assist_at_capacity(client, mocker):
+    mocker.patch.object(assist, "MAX_CONCURRENT_STREAMS", 0)
+    mocker.patch.object(assist, "STREAM_SLOT_TIMEOUT", 0.01)
+    mocker.patch.object(assist, "_stream_slots", assist.weakref.WeakKeyDictionary())
+    create = mock_completion(mocker)
+
+    response = client.post("/assist", json={"query": "Tell me a joke."})
+    assert response.status_code == 503, f"Expected 503, got {response.status_code}"
+    create.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_assist_coalesces_identical_queries(mocker):
+    chunks = [f"part {i} " for i in range(10)]
+    create = mock_completion(
+        mocker, side_effect=lambda **kwargs: FakeOpenAIStream(chunks, delay=0.02)
+    )
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as ac:
+
+        async def ask(delay):
+            await asyncio.sleep(delay)
+            return await ac.post(
+                "/assist", json={"query": "  What is the Lucid Air RANGE? "}
+            )
+
+        # Spread the subscribers over the lifetime of the upstream stream so
+        # most of them join late and rely on replay.
+        responses = await asyncio.gather(*(ask(i * 0.004) for i in range(50)))
+
+    assert create.await_count == 1, "Identical queries should share one call."
+    assert all(r.status_code == 200 for r in responses)
+    assert all(r.text == "".join(chunks) for r in responses)
+    assert len(assist.in_flight) == 0
+    assert assist.cache.get("what is the lucid air range?") == chunks
+
+
+@pytest.mark.asyncio
+async def test_assist_coalesced_error_reaches_every_subscriber(mocker):
+    mock_completion(mocker, side_effect=openai.OpenAIError("API error"))
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://test"
+    ) as ac:
+        responses = await asyncio.gather(
+            *(ac.post("/assist", json={"query": "Hi"}) for _ in range(5))
+        )
+
+    assert all(r.status_code == 502 for r in responses)
+    assert "hi" not in assist.cache
+
+
+@pytest.mark.asyncio
+async def test_flight_replays_chunks_to_late_subscribers():
+    flight = Flight()
+    flight.publish("a")
+    flight.publish("b")
+
+    async def collect():
+        return [chunk async for chunk in flight.subscribe()]
+
+    early = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    flight.publish("c")
+    late = asyncio.create_task(collect())
+    await asyncio.sleep(0)
+    flight.publish("d")
+    flight.finish()
+
+    assert await early == ["a", "b", "c", "d"]
+    assert await late == ["a", "b", "c", "d"]
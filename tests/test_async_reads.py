@@ -0,0 +1,131 @@
+# backend/tests/test_async_reads.py
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+
+from main import app
+from models.async_db import async_database_url
+from models.init_db import Appointment, Base, Client, Employee, Vehicle
+from models.pool import engine_options
+from utils import dependencies
+from utils.availability import availability_index
+from utils.dependencies import ReadSession, get_sync_read_db, read_db
+from utils.response_cache import response_cache
+
+DAY = date.today() + timedelta(days=3)
+
+
+def test_async_database_url():
+    assert (
+        async_database_url("postgresql+psycopg2://u:p@db:5432/app")
+        == "postgresql+asyncpg://u:p@db:5432/app"
+    )
+    assert async_database_url("sqlite:///./app.db") == "sqlite+aiosqlite:///./app.db"
+    with pytest.raises(ValueError):
+        async_database_url("mysql://u:p@db/app")
+
+
+def test_asyncpg_statement_timeout(monkeypatch):
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+    options = engine_options("postgresql+asyncpg://u:p@db/app")
+    assert options["connect_args"] == {
+        "server_settings": {"statement_timeout": "5000"}
+    }
+    assert "executemany_mode" not in options
+
+
+def test_read_db_follows_configuration(monkeypatch):
+    monkeypatch.setattr(dependencies, "ASYNC_READS", {"customers"})
+    assert read_db("customers") is dependencies.get_async_read_db
+    assert read_db("appointments") is get_sync_read_db
+    monkeypatch.setattr(dependencies, "ASYNC_READS", {"all"})
+    assert read_db("appointments") is dependencies.get_async_read_db
+
+
+@pytest.fixture
+def async_reads(client, tmp_path):
+    """
+    Serve the read endpoints from an AsyncSession over a separate SQLite
+    file, seeded with one customer, vehicle, technician and appointment.
+    """
+    url = f"sqlite:///{tmp_path / 'async_reads.db'}"
+    engine = create_engine(url)
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Employee(
+            id=1, name="Async Tech", email="async.tech@example.com",
+            phone="555-0100", password="x",
+        ))
+        session.add(Client(
+            id=1, name="Async Customer", email="async@example.com",
+            phone="555-0101", password="x",
+        ))
+        session.add(Vehicle(
+            vin="ASYNCVIN00001", client_id=1, model="Air", year=2024,
+            mileage=1000, warranty_exp=date(2028, 1, 1),
+            service_plan="Standard",
+        ))
+        session.add(Appointment(
+            vin="ASYNCVIN00001", date=DAY, time=time(9), employee_id=1,
+            service_type="Inspection", status="Scheduled",
+        ))
+        session.commit()
+    engine.dispose()
+
+    # NullPool: connections must not outlive the TestClient's event loop
+    async_engine = create_async_engine(
+        async_database_url(url), poolclass=NullPool
+    )
+    factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_read_db():
+        async with factory() as session:
+            yield ReadSession(session, is_async=True)
+
+    response_cache.clear()
+    availability_index.invalidate()
+    app.dependency_overrides[get_sync_read_db] = override_read_db
+    yield client
+    del app.dependency_overrides[get_sync_read_db]
+    response_cache.clear()
+    availability_index.invalidate()
+
+
+def test_async_read_endpoints(async_reads):
+    customers = async_reads.get("/customers").json()
+    assert [c["name"] for c in customers] == ["Async Customer"]
+
+    detail = async_reads.get("/customers/1").json()
+    assert [v["vin"] for v in detail["vehicles"]] == ["ASYNCVIN00001"]
+    assert detail["appointments"][0]["time"] == "09:00:00"
+    assert async_reads.get("/customers/2").status_code == 404
+
+    batch = async_reads.get(
+        "/customers/details", params={"ids": "1,2", "include": "service_records"}
+    ).json()
+    assert [d["customer"]["id"] for d in batch] == [1]
+    assert batch[0]["service_records"] == []
+
+    appointments = async_reads.get(
+        "/appointments", params={"date_from": DAY.isoformat()}
+    ).json()
+    assert [a["vin"] for a in appointments] == ["ASYNCVIN00001"]
+
+    slots = async_reads.get(
+        "/appointments/availability",
+        params={"date_from": DAY.isoformat(), "date_to": DAY.isoformat()},
+    ).json()
+    assert {"date": DAY.isoformat(), "time": "09:00:00"} not in [
+        {"date": s["date"], "time": s["time"]} for s in slots
+    ]
+    assert slots
+
+    employees = async_reads.get("/employees/employees").json()
+    assert employees == [{
+        "id": 1, "name": "Async Tech", "email": "async.tech@example.com",
+        "phone": "555-0100", "profile_pic_url": None,
+    }]
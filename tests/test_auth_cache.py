@@ -0,0 +1,111 @@
+# backend/tests/test_auth_cache.py
+import pytest
+from fastapi import HTTPException
+
+from models.init_db import Client
+from utils import auth
+from utils.auth import create_access_token, get_current_user
+from utils.auth_cache import AuthCache, auth_cache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def cached_client(db, request):
+    auth_cache.clear()
+    customer = Client(
+        name="Cached Login", email=f"{request.node.name}@example.com",
+        phone="5550001111", password="not-a-real-hash",
+    )
+    db.add(customer)
+    db.commit()
+    yield customer
+    auth_cache.clear()
+
+
+def test_repeated_requests_skip_decode_and_query(cached_client, db, mocker):
+    token = create_access_token({"id": cached_client.id, "role": "customer"})
+    query = mocker.spy(db, "query")
+    decode = mocker.spy(auth.jwt, "decode")
+
+    for _ in range(3):
+        user = get_current_user(token, db)
+        assert user == {"id": cached_client.id, "role": "customer"}
+
+    assert query.call_count == 1
+    assert decode.call_count == 1
+
+
+def test_deleted_user_is_revoked(cached_client, db):
+    token = create_access_token({"id": cached_client.id, "role": "customer"})
+    get_current_user(token, db)
+
+    db.delete(cached_client)
+    db.commit()
+
+    with pytest.raises(HTTPException) as excinfo:
+        get_current_user(token, db)
+    assert excinfo.value.status_code == 401
+
+
+def test_invalid_token_is_not_cached(db):
+    with pytest.raises(HTTPException):
+        get_current_user("not-a-jwt", db)
+    assert auth_cache.get_principal("not-a-jwt") is None
+
+
+def test_token_entries_expire_with_the_token():
+    clock = FakeClock()
+    cache = AuthCache(ttl=60, timer=clock)
+    cache.set_principal("short", ("customer", 1), expires_at=clock.now + 5)
+    cache.set_principal("long", ("customer", 1), expires_at=clock.now + 3600)
+
+    clock.now += 10
+    assert cache.get_principal("short") is None
+    assert cache.get_principal("long") == ("customer", 1)
+
+    clock.now += 60
+    assert cache.get_principal("long") is None
+
+
+def test_expired_and_evicted_tokens_are_forgotten_per_user():
+    clock = FakeClock()
+    cache = AuthCache(maxsize=3, ttl=60, timer=clock)
+    for user_id in range(100):
+        cache.set_principal(
+            f"token-{user_id}", ("customer", user_id), expires_at=2**40
+        )
+    # Size evictions leave only the users of the cached tokens
+    assert len(cache._user_tokens) == 3
+
+    clock.now += 120
+    cache.set_principal("fresh", ("customer", 500), expires_at=2**40)
+    assert dict(cache._user_tokens) == {
+        ("customer", 500): {cache.token_key("fresh")}
+    }
+
+
+def test_revoke_user_drops_tokens_and_existence():
+    cache = AuthCache(ttl=60)
+    cache.set_principal("a", ("employee", 7), expires_at=2**40)
+    cache.set_principal("b", ("employee", 8), expires_at=2**40)
+    cache.set_user_exists(("employee", 7))
+
+    cache.revoke_user("employee", 7)
+    assert cache.get_principal("a") is None
+    assert not cache.user_exists(("employee", 7))
+    assert cache.get_principal("b") == ("employee", 8)
+
+
+def test_zero_ttl_disables_cache():
+    cache = AuthCache(ttl=0)
+    cache.set_principal("a", ("customer", 1), expires_at=2**40)
+    cache.set_user_exists(("customer", 1))
+    assert cache.get_principal("a") is None
+    assert not cache.user_exists(("customer", 1))
@@ -0,0 +1,178 @@
+# backend/tests/test_availability.py
+import threading
+from datetime import date, time, timedelta
+from types import SimpleNamespace
+
+from models.init_db import Appointment, Employee
+from utils.availability import AvailabilityIndex, availability_index
+
+DAY = date.today() + timedelta(days=30)
+
+
+def make_index():
+    index = AvailabilityIndex(
+        slot_minutes=30, day_start=time(8), day_end=time(12),
+        appointment_minutes=60,
+    )
+    index.add_employee(1)
+    index.add_employee(2)
+    return index
+
+
+def free_times(index, employee_id):
+    return [
+        slot["time"]
+        for slot in index.free_slots(DAY, DAY, [employee_id])
+    ]
+
+
+def test_slot_mask():
+    index = make_index()
+    assert index.slots_per_day == 8
+    assert index.slot_mask(time(8)) == 0b11
+    assert index.slot_mask(time(9, 15)) == 0b11100
+    assert index.slot_mask(time(11, 30)) == 0b10000000
+    assert index.slot_mask(time(7, 30)) == 0b1
+    assert index.slot_mask(time(12)) == 0
+
+
+def test_bookings_update_incrementally():
+    index = make_index()
+    index.set_appointment(10, 1, DAY, time(8), "Scheduled")
+    index.set_appointment(11, 1, DAY, time(8, 30), "Scheduled")
+    assert free_times(index, 1) == [time(9, 30), time(10), time(10, 30),
+                                     time(11), time(11, 30)]
+
+    # Overlapping bookings: removing one keeps the other's slots.
+    index.remove_appointment(10)
+    assert free_times(index, 1)[0] == time(8)
+    assert time(8, 30) not in free_times(index, 1)
+
+    # Rescheduling moves the booking; cancelling frees it.
+    index.set_appointment(11, 1, DAY, time(11), "Scheduled")
+    assert time(8, 30) in free_times(index, 1)
+    assert time(11) not in free_times(index, 1)
+    index.set_appointment(11, 1, DAY, time(11), "Cancelled")
+    assert len(free_times(index, 1)) == 8
+
+
+def test_any_technician_counts():
+    index = make_index()
+    index.set_appointment(10, 1, DAY, time(8), "Scheduled")
+    index.set_appointment(11, 2, DAY, time(8), "Scheduled")
+    slots = index.free_slots(DAY, DAY)
+    assert slots[0] == {"date": DAY, "time": time(9), "available": 2}
+    assert all("employee_ids" not in slot for slot in slots)
+
+
+class FakeQuery(list):
+    def filter(self, *criteria):
+        return self
+
+
+class LoadingSession:
+    """Stands in for the Session given to load(); runs `during` mid-load."""
+
+    def __init__(self, employees, appointments, during):
+        self.employees = employees
+        self.appointments = appointments
+        self.during = during
+
+    def query(self, *columns):
+        if columns[0] is Employee.id:
+            return FakeQuery(
+                SimpleNamespace(id=employee_id) for employee_id in self.employees
+            )
+        self.during()
+        return FakeQuery(self.appointments)
+
+
+def test_load_does_not_block_queries_and_keeps_concurrent_commits():
+    index = make_index()
+    index.set_appointment(10, 1, DAY, time(8), "Scheduled")
+    index.load(LoadingSession([1, 2], [], lambda: None))
+    assert index.loaded
+
+    blocked = []
+
+    def read():
+        blocked.append(not index._lock.acquire(timeout=1))
+        if not blocked[-1]:
+            index._lock.release()
+
+    def during():
+        # Another thread reads the current calendar meanwhile
+        reader = threading.Thread(target=read)
+        reader.start()
+        reader.join()
+        # A booking committed after the load read the appointments
+        index.committed([
+            (index.set_appointment, (11, 2, DAY, time(9), "Scheduled")),
+        ])
+
+    index.load(LoadingSession(
+        [1, 2], [(10, 1, DAY, time(8), "Scheduled")], during
+    ))
+    assert blocked == [False]
+    assert time(8) not in free_times(index, 1)
+    assert time(9) not in free_times(index, 2)
+    assert time(8) in free_times(index, 2)
+
+
+def test_invalidation_during_load_forces_another():
+    index = make_index()
+    index.load(LoadingSession([1, 2], [], index.invalidate))
+    assert not index.loaded
+
+
+def test_availability_endpoint_follows_commits(client, db):
+    technician = Employee(
+        name="Slot Tech", email="slot.tech@example.com", phone="5551234567",
+        password="not-a-real-hash",
+    )
+    db.add(technician)
+    db.commit()
+    availability_index.invalidate()
+
+    params = {
+        "date_from": DAY.isoformat(),
+        "date_to": DAY.isoformat(),
+        "employee_id": technician.id,
+    }
+    response = client.get("/appointments/availability", params=params)
+    assert response.status_code == 200
+    assert len(response.json()) == availability_index.slots_per_day
+
+    appointment = Appointment(
+        vin="SLOTVIN0000000001", date=DAY, time=time(10),
+        service_type="Inspection", status="Scheduled",
+        employee_id=technician.id,
+    )
+    db.add(appointment)
+    db.commit()
+    times = [
+        slot["time"]
+        for slot in client.get(
+            "/appointments/availability", params=params
+        ).json()
+    ]
+    assert "10:00:00" not in times and "10:30:00" not in times
+    assert "11:00:00" in times
+
+    db.delete(appointment)
+    db.commit()
+    times = [
+        slot["time"]
+        for slot in client.get(
+            "/appointments/availability", params=params
+        ).json()
+    ]
+    assert "10:00:00" in times
+
+
+def test_availability_rejects_long_windows(client):
+    response = client.get(
+        "/appointments/availability",
+        params={"date_from": "2030-01-01", "date_to": "2030-03-01"},
+    )
+    assert response.status_code == 400
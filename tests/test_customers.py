@@ -1,11 +1,17 @@
 # backend/tests/test_customers.py
 
-from models.init_db import Client
+import threading
+from datetime import date, time
+
+from models.init_db import Appointment, Client, ServiceHistory, Vehicle
+from utils.response_cache import CachedResponse, ResponseCache, response_cache
+from tests.conftest import assert_max_queries, count_queries
 
 
 def test_get_customers(client, auth_token, db):
     headers = {"Authorization": f"Bearer {auth_token}"}
-    response = client.get("/customers", headers=headers)
+    with assert_max_queries(1):
+        response = client.get("/customers", headers=headers)
     assert (
         response.status_code == 200
     ), f"Expected status code 200, got {response.status_code}"
@@ -19,3 +25,238 @@ def test_get_customers(client, auth_token, db):
     assert any(
         customer["email"] == test_user.email for customer in data
     ), "Test user not found in customers."
+
+
+def add_clients(db, names):
+    for name in names:
+        db.add(
+            Client(
+                name=name,
+                email=f"{name.lower().replace(' ', '.')}@pager.example.com",
+                phone="5550000000",
+                password="not-a-real-hash",
+            )
+        )
+    db.commit()
+
+
+def test_get_customers_keyset_pages(client, db):
+    add_clients(db, [f"Pager Person {i}" for i in range(5)])
+
+    seen = []
+    cursor = None
+    while True:
+        params = {"limit": 2, "name": "pager person"}
+        if cursor:
+            params["after_id"] = cursor
+        response = client.get("/customers", params=params)
+        assert response.status_code == 200
+        page = response.json()
+        seen.extend(page)
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        assert int(cursor) == page[-1]["id"]
+
+    assert [c["name"] for c in seen] == [f"Pager Person {i}" for i in range(5)]
+    ids = [c["id"] for c in seen]
+    assert ids == sorted(ids)
+    assert all("password" not in c for c in seen)
+
+
+def test_next_cursor_is_exposed_to_browsers(client, db):
+    add_clients(db, [f"Cors Person {i}" for i in range(3)])
+
+    response = client.get(
+        "/customers/",
+        params={"limit": 2, "name": "cors person"},
+        headers={"Origin": "https://lucidgpt.netlify.app"},
+    )
+    assert response.status_code == 200
+    assert "X-Next-Cursor" in response.headers
+    exposed = response.headers["Access-Control-Expose-Headers"].split(", ")
+    assert "X-Next-Cursor" in exposed
+    assert "Server-Timing" in exposed
+
+
+def test_get_customers_prefix_filters(client, db):
+    add_clients(db, ["Zelda Prefix", "Zed Prefix", "Amy Prefix"])
+
+    response = client.get("/customers", params={"name": "ze"})
+    assert {c["name"] for c in response.json()} >= {"Zelda Prefix", "Zed Prefix"}
+    assert all(c["name"].lower().startswith("ze") for c in response.json())
+
+    response = client.get("/customers", params={"email": "AMY.PREFIX@"})
+    assert [c["name"] for c in response.json()] == ["Amy Prefix"]
+
+    # LIKE wildcards in the prefix are matched literally
+    response = client.get("/customers", params={"name": "%"})
+    assert response.json() == []
+
+
+def test_customer_responses_are_cached_until_a_write(client, db, mocker):
+    add_clients(db, ["Cache Candidate"])
+    params = {"name": "cache candidate"}
+    first = client.get("/customers", params=params)
+    assert [c["name"] for c in first.json()] == ["Cache Candidate"]
+    customer_id = first.json()[0]["id"]
+    detail = client.get(f"/customers/{customer_id}")
+    assert detail.json()["customer"]["name"] == "Cache Candidate"
+
+    # Served from the cache without touching the session
+    execute = mocker.spy(db, "execute")
+    scalars = mocker.spy(db, "scalars")
+    assert client.get("/customers", params=params).content == first.content
+    assert client.get(f"/customers/{customer_id}").content == detail.content
+    execute.assert_not_called()
+    scalars.assert_not_called()
+    mocker.stop(execute)
+    mocker.stop(scalars)
+
+    # A committed write invalidates both
+    hits = response_cache.hits
+    customer = db.get(Client, customer_id)
+    customer.name = "Cache Candidate Renamed"
+    db.commit()
+    response = client.get("/customers", params=params)
+    assert [c["name"] for c in response.json()] == ["Cache Candidate Renamed"]
+    detail = client.get(f"/customers/{customer_id}")
+    assert detail.json()["customer"]["name"] == "Cache Candidate Renamed"
+    assert response_cache.hits == hits
+
+
+def test_response_cache_skips_stale_store():
+    cache = ResponseCache()
+    generation = cache.generation("customers")
+    cache.invalidate("customers")
+    cache.set("customers", ("list",), CachedResponse(b"[]"), generation)
+    assert cache.get("customers", ("list",)) is None
+
+
+def test_response_cache_skips_replica_reads_right_after_invalidation():
+    now = [0.0]
+    cache = ResponseCache(replica_lag=5, clock=lambda: now[0])
+    entry = CachedResponse(b"[]")
+    cache.invalidate("customers")
+
+    generation = cache.generation("customers")
+    cache.set("customers", ("list",), entry, generation, replica=True)
+    assert cache.get("customers", ("list",)) is None
+    # The primary has the write already
+    cache.set("customers", ("list",), entry, generation)
+    assert cache.get("customers", ("list",)) is entry
+
+    now[0] = 10
+    cache.clear()
+    now[0] = 14
+    generation = cache.generation("customers")
+    cache.set("customers", ("list",), entry, generation, replica=True)
+    assert cache.get("customers", ("list",)) is None
+    now[0] = 15
+    cache.set("customers", ("list",), entry, generation, replica=True)
+    assert cache.get("customers", ("list",)) is entry
+
+
+def test_response_cache_invalidates_concurrently_with_writes():
+    cache = ResponseCache(maxsize=10000)
+    errors = []
+    stop = threading.Event()
+
+    def write(worker):
+        entry = CachedResponse(b"[]")
+        i = 0
+        while not stop.is_set():
+            generation = cache.generation("customers")
+            cache.set("customers", (worker, i), entry, generation)
+            i += 1
+
+    def invalidate():
+        try:
+            for _ in range(300):
+                cache.invalidate("customers")
+        except Exception as e:
+            errors.append(e)
+
+    writers = [threading.Thread(target=write, args=(n,)) for n in range(2)]
+    for thread in writers:
+        thread.start()
+    invalidate()
+    stop.set()
+    for thread in writers:
+        thread.join()
+    assert errors == []
+
+
+def add_customer_with_vehicles(db, name, vehicles=2):
+    add_clients(db, [name])
+    customer = db.query(Client).filter(Client.name == name).one()
+    for i in range(vehicles):
+        vin = f"{name.upper().replace(' ', '')[:12]}{i:05d}"
+        db.add(Vehicle(
+            vin=vin, client_id=customer.id, model="Air", year=2024,
+            mileage=1000 * i, warranty_exp=date(2028, 1, 1),
+            service_plan="Standard",
+        ))
+        db.add(Appointment(
+            vin=vin, date=date(2026, 1, 2), time=time(9, 0), employee_id=1,
+            service_type="Inspection", status="Scheduled",
+        ))
+        db.add(ServiceHistory(
+            vin=vin, date=date(2025, 6, 1), service_type="Tires",
+            employee_id=1,
+        ))
+    db.commit()
+    return customer.id
+
+
+def test_customer_detail_loads_in_one_query(client, db):
+    customer_id = add_customer_with_vehicles(db, "Detail Single")
+    response_cache.clear()
+
+    with count_queries() as requests:
+        response = client.get(f"/customers/{customer_id}")
+    assert response.status_code == 200
+    data = response.json()
+    assert len(data["vehicles"]) == 2
+    assert len(data["appointments"]) == 2
+    # The default response keeps its original shape
+    assert set(data) == {"customer", "vehicles", "appointments"}
+    [(_, stats)] = requests
+    assert stats.count == 1
+
+    with count_queries() as requests:
+        response = client.get(
+            f"/customers/{customer_id}", params={"include": "service_records"}
+        )
+    assert len(response.json()["service_records"]) == 2
+    [(_, stats)] = requests
+    assert stats.count == 2
+
+    response = client.get(f"/customers/{customer_id}", params={"include": "x"})
+    assert response.status_code == 400
+    assert client.get("/customers/987654321").status_code == 404
+
+
+def test_customer_details_batch(client, db):
+    ids = [
+        add_customer_with_vehicles(db, f"Detail Batch {i}", vehicles=i)
+        for i in range(1, 4)
+    ]
+    response_cache.clear()
+
+    requested = [ids[2], 987654321, ids[0], ids[1]]
+    with count_queries() as requests:
+        response = client.get(
+            "/customers/details",
+            params={"ids": ",".join(map(str, requested))},
+        )
+    assert response.status_code == 200
+    data = response.json()
+    assert [d["customer"]["id"] for d in data] == [ids[2], ids[0], ids[1]]
+    assert [len(d["vehicles"]) for d in data] == [3, 1, 2]
+    assert "service_records" not in data[0]
+    [(_, stats)] = requests
+    assert stats.count == 1
+
+    response = client.get("/customers/details", params={"ids": "1,a"})
+    assert response.status_code == 400
@@ -0,0 +1,120 @@
+# backend/tests/test_dashboard.py
+from collections import Counter
+from datetime import date, time, timedelta
+
+import pytest
+from sqlalchemy import select, update
+
+from models.init_db import Appointment, AppointmentRollup, Vehicle
+from routes import dashboard
+from tests.conftest import assert_max_queries
+from utils.dashboard_rollup import rebuild_rollup
+
+DAY = date(2031, 3, 3)
+VIN = "DASHBOARDVIN00001"
+
+
+@pytest.fixture(scope="module")
+def appointments(db, test_user, employee):
+    employee_id = employee.id
+    db.add(Vehicle(
+        vin=VIN, client_id=test_user.id, model="Air", year=2024,
+        mileage=10, warranty_exp=date(2033, 1, 1), service_plan="Standard",
+    ))
+    statuses = ["Scheduled", "Scheduled", "Completed", "Cancelled"]
+    added = [
+        Appointment(
+            vin=VIN, date=DAY + timedelta(days=i % 2), time=time(9 + i),
+            service_type="Oil Change" if i < 3 else "Tires",
+            status=status, employee_id=employee_id,
+        )
+        for i, status in enumerate(statuses)
+    ]
+    db.add_all(added)
+    db.commit()
+    return added
+
+
+def rollup_counts(db):
+    return Counter({
+        (row.date, row.status, row.service_type, row.employee_id): row.count
+        for row in db.scalars(select(AppointmentRollup))
+    })
+
+
+def grouped_counts(db):
+    return Counter({
+        row[:4]: row[4]
+        for row in db.execute(
+            dashboard.summary_statement(date.min, date.max, None, False)
+        ).all()
+    })
+
+
+def test_rollup_tracks_appointment_writes(db, appointments):
+    assert rollup_counts(db) == grouped_counts(db)
+
+    appointments[0].status = "Completed"
+    appointments[1].date = DAY + timedelta(days=5)
+    db.delete(appointments[3])
+    db.commit()
+    assert rollup_counts(db) == grouped_counts(db)
+    assert (DAY, "Scheduled", "Oil Change", appointments[0].employee_id) \
+        not in rollup_counts(db)
+
+    # Bulk statements bypass the flush and trigger a rebuild
+    db.execute(
+        update(Appointment)
+        .where(Appointment.vin == VIN)
+        .values(status="No-show")
+    )
+    db.commit()
+    assert rollup_counts(db) == grouped_counts(db)
+
+    rebuild_rollup(db.connection())
+    assert rollup_counts(db) == grouped_counts(db)
+
+
+@pytest.mark.parametrize("use_rollup", [True, False])
+def test_dashboard_summary(client, db, appointments, employee,
+                           employee_auth_headers, monkeypatch, use_rollup):
+    monkeypatch.setattr(dashboard, "USE_ROLLUP", use_rollup)
+    employee_id = employee.id
+    expected = Counter(db.scalars(
+        select(Appointment.status).where(Appointment.vin == VIN)
+    ))
+
+    with assert_max_queries(2):
+        response = client.get(
+            "/dashboard/summary",
+            params={
+                "date_from": DAY.isoformat(),
+                "date_to": (DAY + timedelta(days=10)).isoformat(),
+                "employee_id": employee_id,
+            },
+            headers=employee_auth_headers,
+        )
+    assert response.status_code == 200
+    summary = response.json()
+    assert summary["total"] == expected.total()
+    assert {s["key"]: s["count"] for s in summary["by_status"]} == expected
+    assert summary["by_employee"] == [
+        {"employee_id": employee_id, "count": expected.total()}
+    ]
+    assert sum(d["count"] for d in summary["by_day"]) == expected.total()
+
+
+def test_dashboard_summary_is_for_employees(client, auth_token,
+                                            employee_auth_headers):
+    response = client.get(
+        "/dashboard/summary",
+        headers={"Authorization": f"Bearer {auth_token}"},
+    )
+    assert response.status_code == 403
+
+    response = client.get(
+        "/dashboard/summary",
+        params={"date_from": "2031-01-02", "date_to": "2031-01-01"},
+        headers=employee_auth_headers,
+    )
+    assert response.status_code == 400
@@ -0,0 +1,72 @@
+# backend/tests/test_db_pool.py
+import pytest
+from sqlalchemy import create_engine, exc, text
+
+from models.pool import PoolMetrics, engine_options, pool_status
+from utils.dependencies import LazySession, get_db
+
+
+def test_engine_options_from_environment(monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "20")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_STATEMENT_TIMEOUT_MS", "5000")
+    monkeypatch.setenv("DB_POOL_PRE_PING", "false")
+
+    options = engine_options("postgresql+psycopg2://u:p@db/app")
+    assert options["pool_size"] == 20
+    assert options["max_overflow"] == 0
+    assert options["pool_pre_ping"] is False
+    assert options["connect_args"] == {"options": "-c statement_timeout=5000"}
+    assert options["executemany_mode"] == "values_plus_batch"
+
+    options = engine_options("sqlite://")
+    assert "pool_size" not in options
+
+
+def test_instrumented_pool_records_waits_and_timeouts(tmp_path, monkeypatch):
+    monkeypatch.setenv("DB_POOL_SIZE", "1")
+    monkeypatch.setenv("DB_MAX_OVERFLOW", "0")
+    monkeypatch.setenv("DB_POOL_TIMEOUT", "0.05")
+    url = f"sqlite:///{tmp_path / 'pool.db'}"
+    metrics = PoolMetrics()
+    engine = create_engine(url, **engine_options(url, metrics))
+
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+        status = pool_status(engine, metrics)
+        assert status["checked_out"] == 1
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    status = pool_status(engine, metrics)
+    assert status["checked_out"] == 0
+    assert status["checkouts"] == 1
+    assert status["timeouts"] == 1
+    assert status["wait_ms_max"] >= 50
+    engine.dispose()
+
+
+def test_lazy_session_is_only_created_on_use(mocker):
+    factory = mocker.Mock()
+    session = LazySession(factory)
+    session.close()
+    factory.assert_not_called()
+
+    session.query("x")
+    factory.return_value.query.assert_called_once_with("x")
+    session.close()
+    factory.return_value.close.assert_called_once()
+
+
+def test_get_db_yields_a_lazy_session():
+    dependency = get_db()
+    db = next(dependency)
+    assert isinstance(db, LazySession)
+    assert not db.started
+    dependency.close()
+
+
+def test_pool_health_endpoint(client):
+    response = client.get("/health/db")
+    assert response.status_code == 200
+    assert "pool" in response.json()
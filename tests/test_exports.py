@@ -0,0 +1,90 @@
+# backend/tests/test_exports.py
+import csv
+import gzip
+import io
+import json
+
+import pytest
+
+from models.init_db import Client
+from routes import exports
+
+
+@pytest.fixture(scope="module")
+def export_customers(db):
+    db.add_all(
+        Client(
+            name=f"Export Customer {i}", email=f"export{i}@example.com",
+            phone=f"555-03{i:02d}", password="secret-hash",
+        )
+        for i in range(5)
+    )
+    db.commit()
+
+
+def test_export_ndjson_gzipped(client, db, export_customers,
+                               employee_auth_headers, monkeypatch):
+    monkeypatch.setattr(exports, "EXPORT_BATCH_SIZE", 2)
+    response = client.get(
+        "/exports/customers",
+        headers={**employee_auth_headers, "Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["content-type"] == "application/x-ndjson"
+    # httpx decodes the gzip stream transparently
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    assert len(rows) == db.query(Client).count()
+    assert [row["id"] for row in rows] == sorted(row["id"] for row in rows)
+    assert set(rows[0]) == {"id", "name", "email", "phone"}
+
+
+def test_export_csv_uncompressed(client, db, export_customers,
+                                 employee_auth_headers):
+    response = client.get(
+        "/exports/customers",
+        params={"format": "csv"},
+        headers={**employee_auth_headers, "Accept-Encoding": "identity"},
+    )
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    assert len(rows) == db.query(Client).count()
+    assert "Export Customer 0" in {row["name"] for row in rows}
+    assert "password" not in rows[0]
+
+
+def test_export_access(client, auth_token, employee_auth_headers):
+    customer = {"Authorization": f"Bearer {auth_token}"}
+    assert client.get("/exports/customers", headers=customer).status_code == 403
+    assert client.get(
+        "/exports/passwords", headers=employee_auth_headers
+    ).status_code == 404
+    assert client.get(
+        "/exports/customers", params={"format": "xml"},
+        headers=employee_auth_headers,
+    ).status_code == 422
+
+
+def test_encoding_is_one_chunk_per_batch():
+    batches = [[(1, "a"), (2, "b")], [(3, "c,d")]]
+    assert list(exports.encode_batches(["id", "name"], batches, "ndjson")) == [
+        b'{"id":1,"name":"a"}\n{"id":2,"name":"b"}\n',
+        b'{"id":3,"name":"c,d"}\n',
+    ]
+    assert list(exports.encode_batches(["id", "name"], batches, "csv")) == [
+        b"id,name\r\n1,a\r\n2,b\r\n",
+        b'3,"c,d"\r\n',
+    ]
+    assert list(exports.encode_batches(["id"], [], "csv")) == [b"id\r\n"]
+
+    compressed = b"".join(exports.gzip_chunks([b"x" * 1000, b"y"]))
+    assert gzip.decompress(compressed) == b"x" * 1000 + b"y"
+
+
+def test_accepts_gzip():
+    assert exports.accepts_gzip("gzip, deflate, br")
+    assert exports.accepts_gzip("br;q=1.0, gzip;q=0.8")
+    assert not exports.accepts_gzip("gzip;q=0")
+    assert not exports.accepts_gzip("identity")
+    assert not exports.accepts_gzip(None)
@@ -0,0 +1,62 @@
+# backend/tests/test_fuzzy_index.py
+
+import random
+
+from fuzzywuzzy import fuzz, process
+
+from utils.fuzzy_index import FuzzyIndex
+
+QUERIES = [
+    "How long is the Lucid Air warranty?",
+    "What is the range of the Lucid Gravity?",
+    "When is my next service appointment?",
+    "Can I charge my Air at a Tesla supercharger?",
+    "How do I update the software on my car?",
+]
+
+
+def test_best_match_finds_typos():
+    index = FuzzyIndex()
+    for query in QUERIES:
+        index.add(query)
+
+    assert (
+        index.best_match("how long is the lucid air warrenty")
+        == "How long is the Lucid Air warranty?"
+    )
+    assert index.best_match("What colours does the Air come in?") is None
+
+
+def test_best_match_drops_keys_that_are_no_longer_live():
+    index = FuzzyIndex()
+    for query in QUERIES:
+        index.add(query)
+
+    match = index.best_match(
+        "When is my next service appointment", is_live=lambda key: False
+    )
+    assert match is None
+    assert "When is my next service appointment?" not in index
+    assert len(index) == len(QUERIES) - 1
+
+
+def test_best_match_agrees_with_extract_one():
+    rng = random.Random(7)
+    words = "air gravity range charge warranty service tire battery app key".split()
+    keys = [" ".join(rng.choices(words, k=6)) for _ in range(300)]
+    index = FuzzyIndex()
+    for key in keys:
+        index.add(key)
+
+    for key in rng.sample(keys, 50):
+        chars = list(key)
+        chars[rng.randrange(len(chars))] = "x"
+        query = "".join(chars)
+
+        expected = process.extractOne(query, keys, scorer=fuzz.ratio)
+        match = index.best_match(query)
+        if expected[1] > 85:
+            assert match is not None
+            assert fuzz.ratio(query, match) == expected[1]
+        else:
+            assert match is None
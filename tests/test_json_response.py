@@ -0,0 +1,52 @@
+# backend/tests/test_json_response.py
+import json
+from datetime import date, time
+
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, select, text
+
+from models.schemas import AppointmentBase
+from utils.json_response import FastJSONResponse, dump_rows
+
+
+def appointment_rows():
+    engine = create_engine("sqlite://")
+    with engine.connect() as conn:
+        return conn.execute(
+            select(
+                text("'VIN1' AS vin"),
+                text("'Oil Change' AS service_type"),
+            )
+        ).all()
+
+
+def test_dump_rows_matches_pydantic():
+    appointment = {
+        "vin": "VIN1", "date": date(2030, 1, 2), "time": time(9, 30),
+        "service_type": "Oil Change", "status": "Scheduled", "employee_id": 3,
+    }
+    adapter = TypeAdapter(list[AppointmentBase])
+    expected = json.loads(adapter.dump_json(
+        adapter.validate_python([appointment])
+    ))
+
+    class Row(tuple):
+        _fields = (*appointment, "id")
+
+    row = Row((*appointment.values(), 42))
+    assert json.loads(dump_rows([row], tuple(appointment))) == expected
+    assert json.loads(dump_rows([row]))[0]["id"] == 42
+    assert dump_rows([]) == b"[]"
+
+
+def test_dump_rows_of_a_select():
+    assert json.loads(dump_rows(appointment_rows())) == [
+        {"vin": "VIN1", "service_type": "Oil Change"}
+    ]
+
+
+def test_fast_json_response_passes_bytes_through():
+    assert FastJSONResponse(b'[{"a":1}]').body == b'[{"a":1}]'
+    assert FastJSONResponse({"a": date(2030, 1, 2)}).body == (
+        b'{"a":"2030-01-02"}'
+    )
@@ -0,0 +1,163 @@
+# backend/tests/test_metrics.py
+import os
+import subprocess
+import sys
+from types import SimpleNamespace
+from unittest.mock import AsyncMock
+
+from prometheus_client import REGISTRY
+
+from models.pool import PoolMetrics
+from routes import assist
+from utils.metrics import record_pool_wait
+from utils.response_cache import CachedResponse, ResponseCache
+
+
+def sample(name, **labels):
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_metrics_endpoint_labels_route_templates(client):
+    labels = {
+        "method": "GET", "route": "/customers/{customer_id}", "status": "404",
+    }
+    before = sample("http_requests_total", **labels)
+    assert client.get("/customers/987654321").status_code == 404
+    assert client.get("/customers/987654322").status_code == 404
+
+    response = client.get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "http_request_duration_seconds_bucket" in response.text
+    assert sample("http_requests_total", **labels) == before + 2
+    assert sample(
+        "http_request_duration_seconds_count", **labels
+    ) >= before + 2
+
+    unmatched = {"method": "GET", "route": "unmatched", "status": "404"}
+    before = sample("http_requests_total", **unmatched)
+    client.get("/no/such/path")
+    assert sample("http_requests_total", **unmatched) == before + 1
+
+
+def test_pool_waits_are_exported():
+    metrics = PoolMetrics()
+    metrics.add_listener(record_pool_wait)
+    ok = sample("db_pool_checkouts_total", outcome="ok")
+    timeouts = sample("db_pool_checkouts_total", outcome="timeout")
+    waits = sample("db_pool_checkout_wait_seconds_count")
+
+    metrics.record_wait(0.002)
+    metrics.record_wait(30.0, timed_out=True)
+    assert sample("db_pool_checkouts_total", outcome="ok") == ok + 1
+    assert sample("db_pool_checkouts_total", outcome="timeout") == timeouts + 1
+    assert sample("db_pool_checkout_wait_seconds_count") == waits + 2
+    assert metrics.snapshot()["checkouts"] == 1
+
+
+def test_response_cache_metrics_by_namespace():
+    cache = ResponseCache(maxsize=1)
+
+    def count(result):
+        return sample(
+            "cache_lookups_total", cache="response_metrics", result=result
+        )
+
+    hits, misses = count("hit"), count("miss")
+    evictions = sample("cache_evictions_total", cache="response_metrics")
+    entry = CachedResponse(b"[]")
+    cache.get("metrics", ("a",))
+    cache.set("metrics", ("a",), entry, cache.generation("metrics"))
+    cache.get("metrics", ("a",))
+    cache.set("metrics", ("b",), entry, cache.generation("metrics"))
+    cache.clear()
+
+    assert (count("hit"), count("miss")) == (hits + 1, misses + 1)
+    assert sample(
+        "cache_evictions_total", cache="response_metrics"
+    ) == evictions + 1
+    assert cache.stats()["evictions"] == 1
+
+
+class UsageStream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+
+    def __aiter__(self):
+        return self._iterate()
+
+    async def _iterate(self):
+        for text in self.chunks:
+            delta = SimpleNamespace(content=text)
+            yield SimpleNamespace(
+                choices=[SimpleNamespace(delta=delta)], usage=None
+            )
+        usage = SimpleNamespace(prompt_tokens=120, completion_tokens=7)
+        yield SimpleNamespace(choices=[], usage=usage)
+
+    async def close(self):
+        pass
+
+
+def test_llm_and_assist_cache_metrics(client, mocker):
+    assist.cache.clear()
+    assist.cache_index.clear()
+    create = mocker.patch.object(
+        assist.OPENAI_ASYNC_CLIENT.chat.completions,
+        "create",
+        new=AsyncMock(return_value=UsageStream(["Metrics ", "answer."])),
+    )
+    model = assist.CHAT_MODEL
+    completion = sample("llm_tokens_total", model=model, kind="completion")
+    streams = sample(
+        "llm_request_duration_seconds_count", model=model, outcome="ok"
+    )
+    first_tokens = sample("llm_time_to_first_token_seconds_count", model=model)
+    hits = sample("cache_lookups_total", cache="assist_answers", result="hit")
+
+    for _ in range(2):
+        response = client.post("/assist", json={"query": "metrics question"})
+        assert response.text == "Metrics answer."
+    assert create.await_count == 1
+    assert create.await_args.kwargs["stream_options"] == {
+        "include_usage": True
+    }
+    assert sample(
+        "llm_tokens_total", model=model, kind="completion"
+    ) == completion + 7
+    assert sample(
+        "llm_request_duration_seconds_count", model=model, outcome="ok"
+    ) == streams + 1
+    assert sample(
+        "llm_time_to_first_token_seconds_count", model=model
+    ) == first_tokens + 1
+    assert sample(
+        "cache_lookups_total", cache="assist_answers", result="hit"
+    ) == hits + 1
+    assist.cache.clear()
+    assist.cache_index.clear()
+
+
+WORKER = """
+from utils.metrics import CacheMetrics
+CacheMetrics("multiprocess").lookup(True)
+"""
+
+EXPORT = """
+from utils.metrics import render_metrics
+print(render_metrics()[0].decode())
+"""
+
+
+def test_multiprocess_mode_aggregates_workers(tmp_path):
+    env = {**os.environ, "PROMETHEUS_MULTIPROC_DIR": str(tmp_path)}
+    for _ in range(2):
+        subprocess.run([sys.executable, "-c", WORKER], env=env, check=True)
+    output = subprocess.run(
+        [sys.executable, "-c", EXPORT], env=env, check=True,
+        capture_output=True, text=True,
+    ).stdout
+    assert (
+        'cache_lookups_total{cache="multiprocess",result="hit"} 2.0'
+        in output
+    )
@@ -0,0 +1,54 @@
+# backend/tests/test_mock_data.py
+from sqlalchemy import create_engine, func, select
+
+from models.init_db import (
+    Appointment, AppointmentRollup, Base, Client, Employee, Vehicle,
+)
+from mock_data_script import generate_chunk, seed_database
+
+COUNTS = {
+    "employees": 5,
+    "clients": 20,
+    "vehicles": 30,
+    "service_history": 40,
+    "appointments": 50,
+}
+
+
+def test_chunks_are_deterministic():
+    options = {
+        "seed": 7, "counts": COUNTS, "today": None, "password_hash": "hash",
+    }
+    first = generate_chunk(("clients", 10, 20, options))
+    assert first == generate_chunk(("clients", 10, 20, options))
+    table, rows = first
+    assert table == "clients"
+    assert [row[0] for row in rows] == list(range(11, 21))
+    assert generate_chunk(("clients", 10, 20, {**options, "seed": 8})) != first
+
+
+def test_seed_database(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'seed.db'}")
+    Base.metadata.create_all(engine)
+
+    for _ in range(2):  # Reseeding wipes the previous data
+        timings = seed_database(
+            engine, COUNTS, seed=1, batch_size=8, workers=1
+        )
+    assert set(timings) == set(COUNTS)
+
+    with engine.connect() as conn:
+        def count(model):
+            return conn.scalar(select(func.count()).select_from(model))
+
+        assert count(Employee) == COUNTS["employees"] + 1
+        assert count(Client) == COUNTS["clients"]
+        assert count(Vehicle) == COUNTS["vehicles"]
+        assert count(Appointment) == COUNTS["appointments"]
+        assert conn.scalar(
+            select(func.sum(AppointmentRollup.count))
+        ) == COUNTS["appointments"]
+        # Every account shares one password hash
+        assert conn.scalar(
+            select(func.count(func.distinct(Client.password)))
+        ) == 1
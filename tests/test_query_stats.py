@@ -0,0 +1,140 @@
+# backend/tests/test_query_stats.py
+import logging
+import re
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from sqlalchemy.pool import StaticPool
+
+from models.init_db import Client
+from tests.conftest import count_queries
+from utils.access_log import AccessLogMiddleware
+from utils.response_cache import response_cache
+from utils.query_stats import (
+    QueryStats,
+    QueryStatsMiddleware,
+    current_query_stats,
+)
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+@pytest.fixture
+def handler():
+    handler = ListHandler()
+    log = logging.getLogger("test_query_stats")
+    log.addHandler(handler)
+    log.setLevel(logging.INFO)
+    log.propagate = False
+    yield handler
+    log.removeHandler(handler)
+
+
+def make_client(**options) -> TestClient:
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    app = FastAPI()
+
+    @app.get("/queries/{count}")
+    def run_queries(count: int):
+        # A sync route: the queries run in a worker thread
+        with engine.connect() as conn:
+            for i in range(count):
+                conn.execute(text("SELECT :i"), {"i": i})
+        return {"ok": True}
+
+    @app.get("/failing")
+    def failing():
+        with engine.connect() as conn:
+            try:
+                conn.execute(text("SELECT * FROM missing_table"))
+            except Exception:
+                pass
+        return {"stats": current_query_stats().count}
+
+    log = logging.getLogger("test_query_stats")
+    app.add_middleware(AccessLogMiddleware, logger=log)
+    app.add_middleware(QueryStatsMiddleware, logger=log, **options)
+    return TestClient(app)
+
+
+def test_server_timing_and_access_log(handler):
+    client = make_client()
+
+    response = client.get("/queries/3")
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert re.fullmatch(
+        r'db;dur=[\d.]+;desc="3 queries", db-slowest;dur=[\d.]+', timing
+    )
+    [line] = handler.messages
+    assert "path=/queries/3 status=200" in line
+    assert "queries=3 " in line
+
+    handler.messages.clear()
+    response = client.get("/queries/0")
+    assert 'desc="0 queries"' in response.headers["server-timing"]
+    assert "queries=0 " in handler.messages[0]
+
+
+def test_failed_statements_are_counted():
+    client = make_client()
+    assert client.get("/failing").json() == {"stats": 1}
+
+
+def test_warns_about_many_or_slow_queries(handler):
+    client = make_client(max_queries=2)
+    client.get("/queries/2")
+    assert not any("many queries" in m for m in handler.messages)
+    client.get("/queries/3")
+    [warning] = [m for m in handler.messages if "many queries" in m]
+    assert "path=/queries/3 queries=3" in warning
+    assert "slowest='SELECT ?'" in warning
+
+    handler.messages.clear()
+    client = make_client(slow_query_ms=0, server_timing=False)
+    response = client.get("/queries/1")
+    assert "server-timing" not in response.headers
+    assert any(m.startswith("slow query:") for m in handler.messages)
+
+
+def test_no_stats_outside_requests():
+    assert current_query_stats() is None
+    stats = QueryStats()
+    stats.record("SELECT 1", 0.002)
+    stats.record("SELECT 2", 0.005)
+    assert (stats.count, stats.slowest_statement) == (2, "SELECT 2")
+    assert stats.server_timing() == (
+        'db;dur=7.0;desc="2 queries", db-slowest;dur=5.0'
+    )
+
+
+def test_app_reports_query_stats(client):
+    response = client.get("/customers", params={"limit": 1})
+    assert 'desc="1 queries"' in response.headers["server-timing"]
+
+
+def test_server_timing_matches_the_request_statements(client, db):
+    response_cache.clear()
+    with count_queries() as requests:
+        response = client.get("/customers/", params={"limit": 2})
+        # Run by the test itself, outside any request: not attributed
+        db.query(Client).count()
+        db.query(Client).first()
+    [(path, stats)] = requests
+    assert path == "/customers/"
+    assert stats.count == 1
+    assert stats.server_timing().split(",")[0].endswith('desc="1 queries"')
+    assert f'desc="{stats.count} queries"' in response.headers["server-timing"]
@@ -0,0 +1,168 @@
+# backend/tests/test_replicas.py
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from models.init_db import Base, Employee
+from models.replicas import ReplicaSet, RoutingSession
+from utils import dependencies
+from utils.dependencies import PRIMARY_COOKIE, get_db, get_sync_read_db
+from utils.response_cache import CachedResponse, ResponseCache
+
+
+def make_database(tmp_path, name):
+    """A SQLite file holding one employee named after the database."""
+    engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+    Base.metadata.create_all(bind=engine)
+    with sessionmaker(bind=engine)() as session:
+        session.add(Employee(
+            id=1, name=name, email=f"{name}@example.com", phone=name,
+            password="x",
+        ))
+        session.commit()
+    return engine
+
+
+def read_name(session):
+    return session.scalar(select(Employee.name).where(Employee.id == 1))
+
+
+@pytest.fixture
+def databases(tmp_path):
+    return {
+        name: make_database(tmp_path, name)
+        for name in ("primary", "replica_a", "replica_b")
+    }
+
+
+def test_read_only_sessions_use_replicas_round_robin(databases):
+    replicas = ReplicaSet([databases["replica_a"], databases["replica_b"]])
+    factory = sessionmaker(
+        bind=databases["primary"], class_=RoutingSession, replicas=replicas
+    )
+
+    names = []
+    for _ in range(3):
+        with factory(info={"read_only": True}) as session:
+            # A session sticks to the replica it picked
+            names.append((read_name(session), read_name(session)))
+    assert names == [
+        ("replica_a", "replica_a"),
+        ("replica_b", "replica_b"),
+        ("replica_a", "replica_a"),
+    ]
+
+    with factory() as session:
+        assert read_name(session) == "primary"
+
+
+def test_sessions_read_their_writes_from_the_primary(databases):
+    factory = sessionmaker(
+        bind=databases["primary"], class_=RoutingSession,
+        replicas=ReplicaSet([databases["replica_a"]]),
+    )
+    with factory(info={"read_only": True}) as session:
+        assert read_name(session) == "replica_a"
+        session.add(Employee(
+            id=2, name="new", email="new@example.com", phone="new",
+            password="x",
+        ))
+        session.flush()
+        assert read_name(session) == "primary"
+        assert session.get(Employee, 2).name == "new"
+        session.rollback()
+
+
+def test_unhealthy_replicas_fall_back_to_primary(databases, tmp_path):
+    now = [0.0]
+    broken = create_engine(f"sqlite:///{tmp_path / 'missing' / 'replica.db'}")
+    replicas = ReplicaSet(
+        [broken, databases["replica_a"]],
+        check_interval=5, retry_interval=30, clock=lambda: now[0],
+    )
+    assert replicas.choose() is databases["replica_a"]
+    assert replicas.choose() is databases["replica_a"]
+    assert [r["healthy"] for r in replicas.status()] == [False, True]
+
+    factory = sessionmaker(
+        bind=databases["primary"], class_=RoutingSession,
+        replicas=ReplicaSet([broken]),
+    )
+    with factory(info={"read_only": True}) as session:
+        assert read_name(session) == "primary"
+
+    # Once it recovers, the replica is used again after the retry interval
+    (tmp_path / "missing").mkdir()
+    now[0] = 10
+    assert replicas.choose() is databases["replica_a"]
+    assert replicas.choose() is databases["replica_a"]
+    now[0] = 31
+    assert replicas.choose() is broken
+
+
+def test_get_db_routes_by_method_and_sticks_after_writes(databases,
+                                                        monkeypatch):
+    monkeypatch.setattr(dependencies, "SessionLocal", sessionmaker(
+        bind=databases["primary"], class_=RoutingSession,
+        replicas=ReplicaSet([databases["replica_a"]]),
+    ))
+    app = FastAPI()
+
+    @app.get("/name")
+    def get_name(db=Depends(get_db)):
+        return read_name(db)
+
+    @app.post("/name")
+    def set_name(name: str, db=Depends(get_db)):
+        db.get(Employee, 1).name = name
+        db.commit()
+        return read_name(db)
+
+    with TestClient(app) as client:
+        assert client.get("/name").json() == "replica_a"
+        response = client.post("/name", params={"name": "renamed"})
+        assert response.json() == "renamed"
+        assert PRIMARY_COOKIE in response.cookies
+        # The replica has not caught up; this client now reads the primary
+        assert client.get("/name").json() == "renamed"
+        client.cookies.clear()
+        assert client.get("/name").json() == "replica_a"
+
+
+def test_replica_reads_are_not_cached_right_after_a_write(databases,
+                                                          monkeypatch):
+    monkeypatch.setattr(dependencies, "SessionLocal", sessionmaker(
+        bind=databases["primary"], class_=RoutingSession,
+        replicas=ReplicaSet([databases["replica_a"]]),
+    ))
+    now = [0.0]
+    cache = ResponseCache(replica_lag=5, clock=lambda: now[0])
+    app = FastAPI()
+
+    @app.get("/name")
+    async def get_name(db=Depends(get_sync_read_db)):
+        cached = cache.get("names", ())
+        if cached is not None:
+            return cached.to_response()
+        generation = cache.generation("names")
+        name = await db.run_sync(read_name)
+        entry = CachedResponse(f'"{name}"'.encode())
+        cache.set("names", (), entry, generation, replica=db.used_replica)
+        return entry.to_response()
+
+    with TestClient(app) as client:
+        # Written on the primary; the replica has not caught up yet
+        with databases["primary"].begin() as conn:
+            conn.execute(
+                Employee.__table__.update().values(name="renamed")
+            )
+        cache.invalidate("names")
+        assert client.get("/name").json() == "replica_a"
+        assert cache.get("names", ()) is None
+
+        # Once the lag has passed, replica reads are cached again
+        now[0] = 6
+        assert client.get("/name").json() == "replica_a"
+        assert cache.get("names", ()) is not None
@@ -0,0 +1,326 @@
+# backend/tests/test_search.py
+import datetime
+import json
+from types import SimpleNamespace
+
+import pytest
+from elasticsearch import Elasticsearch
+
+from models.init_db import Client, ServiceHistory, Vehicle
+from utils.search_index import (
+    ElasticsearchSearchIndex, LocalSearchIndex, SearchDocument, SearchHit,
+    search_index,
+)
+
+
+def customer(doc_id, name, email="", phone=""):
+    return SearchDocument("customer", doc_id, {
+        "name": name, "email": email, "phone": phone,
+    })
+
+
+def vehicle(vin, model):
+    return SearchDocument("vehicle", vin, {"vin": vin, "model": model})
+
+
+@pytest.fixture
+def index():
+    index = LocalSearchIndex()
+    index.load([
+        customer(1, "Jonathan Smith", "jon.smith@example.com", "555-010-2233"),
+        customer(2, "Jon Smithers", "smithers@example.com", "555.010.9999"),
+        customer(3, "Maria Garcia", "mgarcia@example.com", "(555) 777-1234"),
+        vehicle("LUCID0000001", "Air Grand Touring"),
+        vehicle("LUCID0000002", "Gravity"),
+        SearchDocument("service_record", 7, {
+            "notes": "Replaced brake pads, rotated tires",
+        }),
+    ])
+    return index
+
+
+def ids(hits):
+    return [(hit.kind, hit.id) for hit in hits]
+
+
+def test_exact_matches_rank_before_prefixes(index):
+    assert ids(index.search("jon")) == [("customer", 2), ("customer", 1)]
+    assert ids(index.search("smith")) == [("customer", 1), ("customer", 2)]
+    assert ids(index.search("lucid0000002")) == [("vehicle", "LUCID0000002")]
+
+
+def test_every_token_must_match(index):
+    assert ids(index.search("jon smithers")) == [("customer", 2)]
+    assert ids(index.search("maria touring")) == []
+    assert ids(index.search("air gr")) == [("vehicle", "LUCID0000001")]
+
+
+def test_typos_and_phone_numbers(index):
+    assert ids(index.search("garica")) == [("customer", 3)]
+    assert ids(index.search("grvity")) == [("vehicle", "LUCID0000002")]
+    assert ids(index.search("5557771234")) == [("customer", 3)]
+    assert ids(index.search("555 010")) == [
+        ("customer", 1), ("customer", 2)
+    ]
+
+
+def test_kinds_and_limit(index):
+    assert ids(index.search("brake")) == [("service_record", 7)]
+    assert index.search("brake", kinds={"customer"}) == []
+    assert len(index.search("555", limit=2)) == 2
+    assert index.search("  ,. ") == []
+
+
+def test_updates_and_removals(index):
+    index.apply({
+        ("customer", 3): customer(3, "Maria Lopez", "mlopez@example.com"),
+        ("vehicle", "LUCID0000002"): None,
+    })
+    assert index.search("garcia") == []
+    assert ids(index.search("lopez")) == [("customer", 3)]
+    assert index.search("gravity") == []
+    assert len(index) == 5
+    # Terms left by removed values no longer expand prefixes
+    assert index._prefixed("grav") == []
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class ListIndex(LocalSearchIndex):
+    """Fills from a list; `during_fill` runs between reading and indexing."""
+
+    def __init__(self, documents, during_fill=None, **options):
+        super().__init__(**options)
+        self.documents = documents
+        self.during_fill = during_fill
+        self.fills = 0
+
+    def fill(self, db):
+        self.fills += 1
+        documents = list(self.documents)
+        if self.during_fill:
+            self.during_fill(self)
+        self.load(documents)
+
+
+def test_changes_committed_during_a_load_are_replayed():
+    def commit_concurrently(index):
+        index.committed({
+            ("customer", 2): customer(2, "Late Arrival"),
+            ("customer", 1): None,
+        })
+
+    index = ListIndex(
+        [customer(1, "Early Bird")], during_fill=commit_concurrently
+    )
+    # Before the first load, changes are left to it
+    index.committed({("customer", 9): customer(9, "Never Loaded")})
+    index.ensure_loaded(None)
+    assert ids(index.search("late")) == [("customer", 2)]
+    assert index.search("early") == []
+    assert index.search("never") == []
+
+    index.committed({("customer", 3): customer(3, "After Load")})
+    assert ids(index.search("after")) == [("customer", 3)]
+
+
+def test_bulk_writes_during_a_load_keep_it_due():
+    index = ListIndex(
+        [customer(1, "Bulk")], during_fill=LocalSearchIndex.invalidate
+    )
+    index.ensure_loaded(None)
+    assert not index.loaded
+    index.during_fill = None
+    index.ensure_loaded(None)
+    assert index.loaded and index.fills == 2
+
+
+def test_index_refreshes_after_the_interval():
+    clock = FakeClock()
+    documents = [customer(1, "First Writer")]
+    index = ListIndex(documents, refresh_interval=60, clock=clock)
+    index.ensure_loaded(None)
+    # Written by another worker: only a refresh picks it up
+    documents.append(customer(2, "Other Worker"))
+    clock.now += 30
+    index.ensure_loaded(None)
+    assert index.search("other") == []
+
+    clock.now += 31
+    index.ensure_loaded(None)
+    assert index.fills == 2
+    assert ids(index.search("other")) == [("customer", 2)]
+
+
+class FakeBulk:
+    """Stands in for the bulk API: records (op, _id) pairs and answers
+    with the status set for an _id in `statuses`, else 200."""
+
+    def __init__(self, statuses=None):
+        self.statuses = statuses or {}
+        self.actions = []
+
+    def __call__(self, operations, **kwargs):
+        lines = [json.loads(line) for line in operations]
+        items = []
+        while lines:
+            [(op, meta)] = lines.pop(0).items()
+            if op != "delete":
+                lines.pop(0)
+            self.actions.append((op, meta["_id"]))
+            status = self.statuses.get(meta["_id"], 200)
+            item = {"_id": meta["_id"], "status": status}
+            if status >= 300:
+                item["error"] = {"type": "mapper_parsing_exception"}
+            items.append({op: item})
+        return SimpleNamespace(body={"items": items})
+
+
+@pytest.fixture
+def elasticsearch(mocker):
+    client = Elasticsearch("http://localhost:9200")
+    mocker.patch.object(client.indices, "exists", return_value=True)
+    mocker.patch.object(client.indices, "create")
+    # Bulk requests go through client.options(), a copy of the client
+    bulk = FakeBulk()
+    mocker.patch.object(Elasticsearch, "bulk", side_effect=bulk)
+    client.fake_bulk = bulk
+    return client
+
+
+def test_elasticsearch_forwards_commits_before_loading(elasticsearch):
+    index = ElasticsearchSearchIndex(elasticsearch, index="test-search")
+    assert not index.loaded
+    index.committed({
+        ("customer", 1): customer(1, "Jonathan Smith"),
+        ("vehicle", "LUCID0000001"): None,
+    })
+    assert elasticsearch.fake_bulk.actions == [
+        ("index", "customer:1"), ("delete", "vehicle:LUCID0000001"),
+    ]
+
+    # The shared index exists already: a load leaves it alone
+    index.ensure_loaded(None)
+    assert index.loaded
+    elasticsearch.indices.create.assert_not_called()
+    assert len(elasticsearch.fake_bulk.actions) == 2
+
+
+def test_elasticsearch_bulk_failures_are_counted(elasticsearch, caplog):
+    elasticsearch.fake_bulk.statuses.update({
+        "customer:2": 400, "customer:3": 404,
+    })
+    index = ElasticsearchSearchIndex(elasticsearch, index="test-search")
+    index.committed({
+        ("customer", 1): customer(1, "Indexed"),
+        ("customer", 2): customer(2, "Rejected"),
+        ("customer", 3): None,
+    })
+    # Deleting a record that was never indexed is not a failure
+    assert index.failed_actions == 1
+    assert "1 search index bulk actions failed" in caplog.text
+    assert "customer:2" in caplog.text
+
+
+def test_elasticsearch_search_maps_hits(elasticsearch, mocker):
+    search = mocker.patch.object(elasticsearch, "search", return_value={
+        "hits": {"hits": [
+            {"_source": {"kind": "vehicle", "ref": "LUCID0000001"},
+             "_score": 3.5},
+            {"_source": {"kind": "customer", "ref": "7"}, "_score": 1.25},
+        ]},
+    })
+    index = ElasticsearchSearchIndex(elasticsearch, index="test-search")
+    assert index.search("Lucid Air!", kinds=["vehicle", "customer"],
+                        limit=5) == [
+        SearchHit("vehicle", "LUCID0000001", 3.5),
+        SearchHit("customer", 7, 1.25),
+    ]
+    query = search.call_args.kwargs["query"]["bool"]
+    assert query["must"]["multi_match"]["query"] == "lucid air"
+    assert query["filter"] == {"terms": {"kind": ["vehicle", "customer"]}}
+    assert index.search("!!!") == []
+
+
+def search(client, headers, q, **params):
+    response = client.get(
+        "/search/", params={"q": q, **params}, headers=headers
+    )
+    assert response.status_code == 200, response.text
+    return response.json()
+
+
+def test_search_endpoint_follows_commits(client, db, employee,
+                                         employee_auth_headers):
+    headers = employee_auth_headers
+    db.add(Client(
+        name="Quentin Zebulon", email="qzebulon@example.com",
+        phone="555-0401", password="x",
+    ))
+    db.commit()
+    [result] = search(client, headers, "zebulon")
+    assert result["kind"] == "customer"
+    assert result["title"] == "Quentin Zebulon"
+    assert result["detail"] == "qzebulon@example.com, 555-0401"
+    assert search_index.loaded
+
+    # Written after the index is loaded: applied on commit
+    client_id = result["id"]
+    db.add(Vehicle(
+        vin="ZEBVIN0000001", client_id=client_id, model="Air Sapphire",
+        year=2025, mileage=10, warranty_exp=datetime.date(2029, 1, 1),
+        service_plan="Basic",
+    ))
+    db.add(ServiceHistory(
+        vin="ZEBVIN0000001", date=datetime.date(2025, 6, 1),
+        service_type="Inspection", employee_id=employee.id,
+        notes="Zebulon asked about xylophonic chimes",
+    ))
+    db.commit()
+    results = search(client, headers, "zebvin")
+    assert [r["id"] for r in results] == ["ZEBVIN0000001"]
+    assert results[0]["detail"] == "2025 Air Sapphire"
+    results = search(client, headers, "xylophnic",
+                     kinds="service_record")
+    assert [r["kind"] for r in results] == ["service_record"]
+
+    row = db.get(Client, client_id)
+    row.name = "Quentin Yarborough"
+    db.commit()
+    assert search(client, headers, "zebulon", kinds="customer") == []
+    assert search(client, headers, "yarborough")[0]["id"] == client_id
+
+    # Writes rolled back to a savepoint are not indexed
+    savepoint = db.begin_nested()
+    db.add(Client(name="Ulysses Wexford", email="uw@example.com",
+                  phone="555-0402", password="x"))
+    db.flush()
+    savepoint.rollback()
+    db.commit()
+    assert not search_index.loaded
+    assert search(client, headers, "wexford") == []
+    assert search(client, headers, "yarborough")[0]["id"] == client_id
+
+
+def test_search_endpoint_access(client, auth_token, employee_auth_headers):
+    headers = employee_auth_headers
+    customer_headers = {"Authorization": f"Bearer {auth_token}"}
+    response = client.get(
+        "/search/", params={"q": "smith"}, headers=customer_headers
+    )
+    assert response.status_code == 403
+    response = client.get(
+        "/search/", params={"q": "smith", "kinds": "customer,invoice"},
+        headers=headers,
+    )
+    assert response.status_code == 400
+    assert "invoice" in response.json()["detail"]
+    response = client.get("/search/", params={"q": ""},
+                          headers=headers)
+    assert response.status_code == 422
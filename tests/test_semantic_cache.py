@@ -0,0 +1,122 @@
+# backend/tests/test_semantic_cache.py
+
+import numpy as np
+import pytest
+
+from utils.answer_cache import MemoryAnswerCache
+from utils.semantic_cache import HashingEmbedder, SemanticCache, VectorIndex
+
+
+class TopicEmbedder:
+    """Maps questions onto hand-picked topics so paraphrases coincide."""
+
+    dimension = 3
+    TOPICS = {
+        0: ("warranty", "guarantee", "coverage"),
+        1: ("range", "miles", "far"),
+        2: ("service", "appointment", "book"),
+    }
+
+    def __init__(self):
+        self.calls = []
+
+    async def embed(self, texts):
+        self.calls.append(list(texts))
+        vectors = np.zeros((len(texts), self.dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for column, words in self.TOPICS.items():
+                vectors[row, column] = sum(word in text for word in words)
+            norm = np.linalg.norm(vectors[row])
+            if norm:
+                vectors[row] /= norm
+        return vectors
+
+
+@pytest.mark.asyncio
+async def test_hashing_embedder_is_deterministic_and_normalized():
+    embedder = HashingEmbedder(dimension=64)
+    first = await embedder.embed(["How long is the Air warranty?"])
+    second = await embedder.embed(["How long is the Air warranty?"])
+    assert np.array_equal(first, second)
+    assert np.isclose(np.linalg.norm(first[0]), 1.0)
+
+
+def test_vector_index_search_remove_and_growth():
+    index = VectorIndex(dimension=2, capacity=2)
+    index.add_batch(
+        ["x", "y", "xy"],
+        np.array([[1, 0], [0, 1], [0.6, 0.8]], dtype=np.float32),
+    )
+    assert index.search(np.array([1, 0], dtype=np.float32))[0][0] == "x"
+
+    index.remove("x")
+    best_key, score = index.search(np.array([1, 0], dtype=np.float32))[0]
+    assert best_key == "xy"
+    assert score == pytest.approx(0.6)
+    assert len(index) == 2
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_serves_paraphrases():
+    answers = MemoryAnswerCache(maxsize=10, ttl=60)
+    embedder = TopicEmbedder()
+    semantic = SemanticCache(embedder, answers, threshold=0.9)
+
+    answers.set("how long is the air warranty", ["Four years."])
+    answers.set("what is the range of the air", ["Over 500 miles."])
+    semantic.add("how long is the air warranty")
+    semantic.add("what is the range of the air")
+
+    match = await semantic.lookup("what guarantee coverage does my car get")
+    assert match == "how long is the air warranty"
+    assert await semantic.lookup("can i book a service appointment") is None
+
+    # Both queued keys were embedded in one batch before the first lookup.
+    assert embedder.calls[0] == [
+        "how long is the air warranty",
+        "what is the range of the air",
+    ]
+    stats = semantic.stats()
+    assert stats["hits"] == 1
+    assert stats["misses"] == 1
+    assert stats["lookup_ms_p50"] is not None
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_follows_answer_evictions():
+    answers = MemoryAnswerCache(maxsize=1, ttl=60)
+    semantic = SemanticCache(TopicEmbedder(), answers, threshold=0.9)
+
+    answers.set("how long is the air warranty", ["Four years."])
+    semantic.add("how long is the air warranty")
+    await semantic.flush()
+    answers.set("what is the range of the air", ["Over 500 miles."])
+
+    assert "how long is the air warranty" not in semantic.index
+    assert await semantic.lookup("warranty coverage") is None
+
+
+class FlakyEmbedder(TopicEmbedder):
+    """Fails its first call, like a timed-out embeddings request."""
+
+    async def embed(self, texts):
+        if not self.calls:
+            self.calls.append(None)
+            raise RuntimeError("embeddings unavailable")
+        return await super().embed(texts)
+
+
+@pytest.mark.asyncio
+async def test_semantic_cache_keeps_pending_keys_on_embedder_failure():
+    answers = MemoryAnswerCache(maxsize=10, ttl=60)
+    semantic = SemanticCache(FlakyEmbedder(), answers, threshold=0.9)
+    answers.set("how long is the air warranty", ["Four years."])
+    semantic.add("how long is the air warranty")
+
+    with pytest.raises(RuntimeError):
+        await semantic.flush()
+    assert len(semantic.index) == 0
+
+    assert await semantic.lookup("warranty coverage") == (
+        "how long is the air warranty"
+    )
@@ -0,0 +1,111 @@
+# backend/tests/test_token.py
+import asyncio
+import threading
+
+import pytest
+from passlib.context import CryptContext
+
+from models.init_db import Client, Employee
+from routes import token
+from routes.token import find_principal
+from utils import passwords
+from tests.conftest import assert_max_queries
+from utils.auth import decode_access_token, get_password_hash
+
+
+def login(client, username, password):
+    return client.post(
+        "/token",
+        data={"username": username, "password": password},
+        headers={"Content-Type": "application/x-www-form-urlencoded"},
+    )
+
+
+def test_login_employee(client, db):
+    employee = Employee(
+        name="Login Employee", email="login.employee@example.com",
+        phone="5552223333", password=get_password_hash("s3cret"),
+    )
+    db.add(employee)
+    db.commit()
+
+    with assert_max_queries(1):
+        response = login(client, "login.employee@example.com", "s3cret")
+    assert response.status_code == 200
+    payload = decode_access_token(response.json()["access_token"])
+    assert payload["role"] == "employee"
+    assert payload["id"] == employee.id
+    assert payload["sub"] == str(employee.id)
+
+
+def test_login_rejects_bad_credentials(client, test_user):
+    assert login(client, test_user.email, "wrong").status_code == 401
+    assert login(client, "nobody@example.com", "wrong").status_code == 401
+
+
+def test_login_releases_connection_while_verifying(client, db, test_user,
+                                                   mocker):
+    def verify(password, hashed):
+        # The lookup's transaction, and its connection, are already gone
+        assert not db.in_transaction()
+        return True, None
+
+    mocker.patch.object(token, "verify_password_offloaded", side_effect=verify)
+    assert login(client, test_user.email, "anything").status_code == 200
+
+
+def test_find_principal_prefers_customers(db):
+    shared = "shared.login@example.com"
+    db.add(Client(name="Shared", email=shared, phone="1", password="c"))
+    db.add(Employee(name="Shared", email=shared, phone="2", password="e"))
+    db.commit()
+
+    principal = find_principal(db, shared)
+    assert (principal.role, principal.password) == ("customer", "c")
+    assert find_principal(db, "missing@example.com") is None
+
+
+def test_login_rehashes_outdated_hash(client, db):
+    cheap = CryptContext(schemes=["bcrypt"], bcrypt__rounds=4)
+    customer = Client(
+        name="Old Hash", email="old.hash@example.com", phone="5554445555",
+        password=cheap.hash("legacy"),
+    )
+    db.add(customer)
+    db.commit()
+
+    assert login(client, customer.email, "legacy").status_code == 200
+    db.refresh(customer)
+    assert customer.password.startswith(f"$2b${passwords.BCRYPT_ROUNDS:02d}$")
+    assert login(client, customer.email, "legacy").status_code == 200
+
+
+def test_login_when_verification_pool_is_saturated(client, test_user, mocker):
+    mocker.patch.object(passwords, "_pending", threading.BoundedSemaphore(1))
+    passwords._pending.acquire()
+
+    response = login(client, test_user.email, "testpassword")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+@pytest.mark.asyncio
+async def test_verification_leaves_the_event_loop_free(mocker):
+    mocker.patch.object(passwords, "PASSWORD_WORKERS", 0)
+    mocker.patch.object(passwords, "_pending", threading.BoundedSemaphore(1))
+    done = threading.Event()
+    mocker.patch.object(
+        passwords, "verify_and_update",
+        side_effect=lambda password, hashed: (done.wait(5), None),
+    )
+
+    verifying = asyncio.create_task(
+        passwords.verify_password_offloaded("pw", "hash")
+    )
+    await asyncio.sleep(0.05)
+    # The slot is taken: turned away at once instead of waiting on the loop
+    with pytest.raises(passwords.VerificationBusy):
+        await passwords.verify_password_offloaded("pw", "hash")
+    done.set()
+    assert await verifying == (True, None)
+    assert passwords._pending.acquire(blocking=False)
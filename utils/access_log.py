@@ -0,0 +1,167 @@
+# backend/utils/access_log.py
+
+import os
+import re
+import atexit
+import logging
+import logging.handlers
+import queue
+import random
+import time
+
+from utils.query_stats import current_query_stats
+
+access_logger = logging.getLogger("access")
+
+# Field names whose values never reach the logs
+REDACTED_FIELDS = (
+    "password",
+    "passwd",
+    "secret",
+    "token",
+    "access_token",
+    "refresh_token",
+    "api_key",
+    "authorization",
+    "client_secret",
+)
+
+_JSON_FIELD_RE = re.compile(
+    r'("(?:%s)"\s*:\s*)("(?:[^"\\]|\\.)*"?|[^,}\s]+)'
+    % "|".join(REDACTED_FIELDS),
+    re.IGNORECASE,
+)
+_FORM_FIELD_RE = re.compile(
+    r"((?:^|&)(?:%s)=)[^&]*" % "|".join(REDACTED_FIELDS),
+    re.IGNORECASE,
+)
+
+
+def redact(text: str) -> str:
+    """
+    Mask sensitive fields in a JSON or form-encoded body. Works on truncated
+    bodies too, since it does not need to parse them.
+    """
+    text = _JSON_FIELD_RE.sub(r'\1"***"', text)
+    return _FORM_FIELD_RE.sub(r"\1***", text)
+
+
+class AccessLogMiddleware:
+    """
+    Pure ASGI access log: one structured line per request with method,
+    path, status, duration and response size, plus the query stats when
+    inside QueryStatsMiddleware.
+
+    Nothing is buffered: request and response messages are passed through as
+    they come, so streaming responses and uploads are unaffected. A fraction
+    `sample_rate` of requests is logged, plus every server error. Request
+    bodies are only recorded for paths listed in `body_paths` (prefix
+    match), capped at `max_body` bytes and redacted.
+    """
+
+    def __init__(self, app, sample_rate: float = 1.0, body_paths=(),
+                 max_body: int = 2048, logger=access_logger):
+        self.app = app
+        self.sample_rate = sample_rate
+        self.body_paths = tuple(body_paths)
+        self.max_body = max_body
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        sampled = self.sample_rate >= 1 or random.random() < self.sample_rate
+        path = scope["path"]
+        response = {"status": 500, "bytes": 0}
+        body = bytearray()
+
+        if sampled and self.max_body > 0 and path.startswith(self.body_paths):
+
+            async def receive_wrapper():
+                message = await receive()
+                if message["type"] == "http.request":
+                    remaining = self.max_body + 1 - len(body)
+                    if remaining > 0:
+                        body.extend(message.get("body", b"")[:remaining])
+                return message
+
+        else:
+            receive_wrapper = receive
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            elif message["type"] == "http.response.body":
+                response["bytes"] += len(message.get("body", b""))
+            await send(message)
+
+        try:
+            await self.app(scope, receive_wrapper, send_wrapper)
+        except Exception:
+            response["status"] = 500
+            raise
+        finally:
+            if sampled or response["status"] >= 500:
+                self._log(scope, response, started, body)
+
+    def _log(self, scope, response: dict, started: float, body: bytearray):
+        client = scope.get("client")
+        fields = {
+            "method": scope["method"],
+            "path": scope["path"],
+            "status": response["status"],
+            "duration_ms": f"{(time.perf_counter() - started) * 1000:.1f}",
+            "bytes": response["bytes"],
+            "client": client[0] if client else "-",
+        }
+        stats = current_query_stats()
+        if stats is not None:
+            # Set when QueryStatsMiddleware wraps this middleware
+            fields.update(stats.log_fields())
+        if body:
+            truncated = len(body) > self.max_body
+            text = body[:self.max_body].decode("utf-8", errors="replace")
+            fields["body"] = repr(redact(text) + ("..." if truncated else ""))
+        level = logging.ERROR if response["status"] >= 500 else logging.INFO
+        self.logger.log(
+            level, " ".join(f"{key}={value}" for key, value in fields.items())
+        )
+
+
+def setup_access_log(handlers=None) -> logging.handlers.QueueListener:
+    """
+    Route the access logger through a queue so that request handling only
+    enqueues records; a background thread formats and writes them.
+
+    Args:
+        handlers (list): Handlers doing the actual output. Defaults to the
+            root logger's handlers.
+
+    Returns:
+        QueueListener: The started listener, stopped at interpreter exit.
+    """
+    if handlers is None:
+        handlers = logging.getLogger().handlers or [logging.StreamHandler()]
+    log_queue = queue.SimpleQueue()
+    access_logger.handlers = [logging.handlers.QueueHandler(log_queue)]
+    access_logger.setLevel(logging.INFO)
+    access_logger.propagate = False
+    listener = logging.handlers.QueueListener(
+        log_queue, *handlers, respect_handler_level=True
+    )
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+def access_log_settings() -> dict:
+    """
+    AccessLogMiddleware options from the ACCESS_LOG_* environment variables.
+    """
+    return {
+        "sample_rate": float(os.getenv("ACCESS_LOG_SAMPLE_RATE", "1.0")),
+        "max_body": int(os.getenv("ACCESS_LOG_MAX_BODY", "2048")),
+    }
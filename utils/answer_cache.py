@@ -0,0 +1,392 @@
+# backend/utils/answer_cache.py
+
+import os
+import logging
+import sqlite3
+import threading
+import time
+from array import array
+from itertools import accumulate
+from cachetools import TTLCache
+from starlette.concurrency import run_in_threadpool
+from utils.metrics import CacheMetrics
+
+logger = logging.getLogger(__name__)
+
+
+def pack_chunks(chunks: list) -> tuple:
+    """
+    Compact form of an answer's chunk sequence: the full text plus the end
+    offset of every chunk as packed 32-bit integers.
+    """
+    text = "".join(chunks)
+    boundaries = array("I", accumulate(len(chunk) for chunk in chunks))
+    return text, boundaries.tobytes()
+
+
+def unpack_chunks(text: str, boundaries: bytes) -> list:
+    """
+    Split a packed answer back into its original chunks.
+    """
+    if not boundaries:
+        return [text]
+    chunks = []
+    start = 0
+    for end in array("I", boundaries):
+        chunks.append(text[start:end])
+        start = end
+    return chunks
+
+
+class AnswerCache:
+    """
+    Interface for /assist answer storage backends.
+
+    Answers are stored as the sequence of chunks they were streamed in, so
+    a cache hit can be replayed chunk by chunk. Backends implement `_get`,
+    `set`, `delete`, `keys`, `clear`, `__len__` and `__contains__`; hit/miss
+    counting, also exported to `metrics` when set, is shared here. Backends
+    that are shared between processes set `shared = True` and report keys
+    written by other processes through `keys_since`; their calls block on
+    I/O, so async code makes them through `run_io`.
+    """
+
+    backend = "base"
+    shared = False
+    metrics = None
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._eviction_listeners = []
+
+    def add_eviction_listener(self, listener):
+        """
+        Register `listener(key)` to be called when this process evicts or
+        expires an entry. Evictions made by other processes sharing the
+        backend are not reported; callers must still check liveness.
+        """
+        self._eviction_listeners.append(listener)
+
+    async def run_io(self, func, *args):
+        """
+        Call `func(*args)` from async code: in the threadpool for shared
+        backends, whose queries can wait seconds on another worker's write
+        lock, and inline for in-process ones.
+        """
+        if self.shared:
+            return await run_in_threadpool(func, *args)
+        return func(*args)
+
+    def _evicted(self, key: str):
+        self.evictions += 1
+        if self.metrics is not None:
+            self.metrics.evicted.inc()
+        for listener in self._eviction_listeners:
+            listener(key)
+
+    def _get(self, key: str):
+        raise NotImplementedError
+
+    def get(self, key: str):
+        """
+        Return the cached chunks for `key`, or None, counting hit or miss.
+        """
+        value = self._get(key)
+        if value is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        if self.metrics is not None:
+            self.metrics.lookup(value is not None)
+        return value
+
+    def set(self, key: str, chunks: list):
+        raise NotImplementedError
+
+    def delete(self, key: str):
+        raise NotImplementedError
+
+    def keys(self) -> list:
+        raise NotImplementedError
+
+    def keys_since(self, timestamp: float) -> list:
+        """
+        Keys written at or after `timestamp` (wall clock), by any process.
+        """
+        return []
+
+    def clear(self):
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __contains__(self, key: str) -> bool:
+        raise NotImplementedError
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend,
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+class EvictionCountingTTLCache(TTLCache):
+    """TTLCache reporting every size or TTL eviction to a callback."""
+
+    def __init__(self, maxsize, ttl, on_evict):
+        super().__init__(maxsize=maxsize, ttl=ttl)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        item = super().popitem()
+        self._on_evict(item[0])
+        return item
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, _ in expired:
+            self._on_evict(key)
+        return expired
+
+
+class MemoryAnswerCache(AnswerCache):
+    """
+    Per-process LRU/TTL cache; lost on restart and not shared by workers.
+    """
+
+    backend = "memory"
+
+    def __init__(self, maxsize: int, ttl: float):
+        super().__init__(maxsize, ttl)
+        self._cache = EvictionCountingTTLCache(maxsize, ttl, self._evicted)
+
+    def _get(self, key: str):
+        packed = self._cache.get(key)
+        return unpack_chunks(*packed) if packed is not None else None
+
+    def set(self, key: str, chunks: list):
+        self._cache[key] = pack_chunks(chunks)
+
+    def delete(self, key: str):
+        self._cache.pop(key, None)
+
+    def keys(self) -> list:
+        return list(self._cache.keys())
+
+    def clear(self):
+        # Cache.clear() goes through popitem(), which would count evictions.
+        self._cache = EvictionCountingTTLCache(
+            self.maxsize, self.ttl, self._evicted
+        )
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._cache
+
+
+class SQLiteAnswerCache(AnswerCache):
+    """
+    On-disk cache in a SQLite file (WAL mode) shared by every worker process
+    on the host and kept across restarts.
+
+    Entries expire `ttl` seconds after they were written; when the table
+    grows past `maxsize` the least recently read entries are evicted. The
+    row count is kept up to date by triggers, so writes need not count the
+    table.
+    """
+
+    backend = "sqlite"
+    shared = True
+
+    # Purge expired rows at most this often (seconds)
+    PURGE_INTERVAL = 60
+
+    def __init__(self, path: str, maxsize: int, ttl: float, timer=time.time):
+        super().__init__(maxsize, ttl)
+        self.path = path
+        self.timer = timer
+        self._local = threading.local()
+        self._purged_at = 0.0
+        conn = self._connection()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS assist_answers ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, boundaries BLOB, "
+            "created_at REAL NOT NULL, expires_at REAL NOT NULL, "
+            "accessed_at REAL NOT NULL)"
+        )
+        columns = {
+            row[1]
+            for row in conn.execute("PRAGMA table_info(assist_answers)")
+        }
+        if "boundaries" not in columns:
+            # Files written before answers kept their chunks.
+            conn.execute(
+                "ALTER TABLE assist_answers ADD COLUMN boundaries BLOB"
+            )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_assist_answers_accessed_at "
+            "ON assist_answers (accessed_at)"
+        )
+        conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_assist_answers_created_at "
+            "ON assist_answers (created_at)"
+        )
+        # Created with the count in one transaction, so no row written by
+        # another worker meanwhile is missed.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS assist_answers_count ("
+                "id INTEGER PRIMARY KEY CHECK (id = 0), "
+                "row_count INTEGER NOT NULL)"
+            )
+            conn.execute(
+                "INSERT OR IGNORE INTO assist_answers_count (id, row_count) "
+                "SELECT 0, COUNT(*) FROM assist_answers"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS assist_answers_counted_insert "
+                "AFTER INSERT ON assist_answers BEGIN "
+                "UPDATE assist_answers_count SET row_count = row_count + 1; END"
+            )
+            conn.execute(
+                "CREATE TRIGGER IF NOT EXISTS assist_answers_counted_delete "
+                "AFTER DELETE ON assist_answers BEGIN "
+                "UPDATE assist_answers_count SET row_count = row_count - 1; END"
+            )
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connection(self) -> sqlite3.Connection:
+        # sqlite3 connections must stay on the thread that opened them.
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _get(self, key: str):
+        now = self.timer()
+        conn = self._connection()
+        row = conn.execute(
+            "SELECT value, boundaries FROM assist_answers "
+            "WHERE key = ? AND expires_at > ?",
+            (key, now),
+        ).fetchone()
+        if row is None:
+            return None
+        conn.execute(
+            "UPDATE assist_answers SET accessed_at = ? WHERE key = ?",
+            (now, key),
+        )
+        return unpack_chunks(*row)
+
+    def set(self, key: str, chunks: list):
+        now = self.timer()
+        conn = self._connection()
+        text, boundaries = pack_chunks(chunks)
+        # An upsert rather than INSERT OR REPLACE, whose implicit delete
+        # would not fire the counting trigger
+        conn.execute(
+            "INSERT INTO assist_answers "
+            "(key, value, boundaries, created_at, expires_at, accessed_at) "
+            "VALUES (?, ?, ?, ?, ?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value, "
+            "boundaries = excluded.boundaries, "
+            "created_at = excluded.created_at, "
+            "expires_at = excluded.expires_at, "
+            "accessed_at = excluded.accessed_at",
+            (key, text, boundaries, now, now + self.ttl, now),
+        )
+        evicted = []
+        if now - self._purged_at > self.PURGE_INTERVAL:
+            self._purged_at = now
+            evicted += conn.execute(
+                "DELETE FROM assist_answers WHERE expires_at <= ? "
+                "RETURNING key",
+                (now,),
+            ).fetchall()
+        (count,) = conn.execute(
+            "SELECT row_count FROM assist_answers_count"
+        ).fetchone()
+        if count > self.maxsize:
+            evicted += conn.execute(
+                "DELETE FROM assist_answers WHERE key IN ("
+                "SELECT key FROM assist_answers ORDER BY accessed_at "
+                "LIMIT ?) RETURNING key",
+                (count - self.maxsize,),
+            ).fetchall()
+        for (evicted_key,) in evicted:
+            self._evicted(evicted_key)
+
+    def delete(self, key: str):
+        self._connection().execute(
+            "DELETE FROM assist_answers WHERE key = ?", (key,)
+        )
+
+    def keys(self) -> list:
+        rows = self._connection().execute(
+            "SELECT key FROM assist_answers WHERE expires_at > ?",
+            (self.timer(),),
+        )
+        return [row[0] for row in rows]
+
+    def keys_since(self, timestamp: float) -> list:
+        rows = self._connection().execute(
+            "SELECT key FROM assist_answers "
+            "WHERE created_at >= ? AND expires_at > ?",
+            (timestamp, self.timer()),
+        )
+        return [row[0] for row in rows]
+
+    def clear(self):
+        self._connection().execute("DELETE FROM assist_answers")
+
+    def __len__(self) -> int:
+        return self._connection().execute(
+            "SELECT COUNT(*) FROM assist_answers WHERE expires_at > ?",
+            (self.timer(),),
+        ).fetchone()[0]
+
+    def __contains__(self, key: str) -> bool:
+        return self._connection().execute(
+            "SELECT 1 FROM assist_answers WHERE key = ? AND expires_at > ?",
+            (key, self.timer()),
+        ).fetchone() is not None
+
+
+def create_answer_cache() -> AnswerCache:
+    """
+    Build the answer cache selected by the ASSIST_CACHE_* environment
+    variables (backend "memory" or "sqlite").
+    """
+    backend = os.getenv("ASSIST_CACHE_BACKEND", "memory")
+    maxsize = int(os.getenv("ASSIST_CACHE_MAXSIZE", "10000"))
+    ttl = float(os.getenv("ASSIST_CACHE_TTL", "3600"))
+    if backend == "sqlite":
+        path = os.getenv("ASSIST_CACHE_PATH", "./assist_cache.sqlite3")
+        logger.info(f"Using SQLite assist answer cache at {path}")
+        cache = SQLiteAnswerCache(path, maxsize=maxsize, ttl=ttl)
+    elif backend == "memory":
+        cache = MemoryAnswerCache(maxsize=maxsize, ttl=ttl)
+    else:
+        raise ValueError(f"Unknown ASSIST_CACHE_BACKEND: {backend}")
+    cache.metrics = CacheMetrics("assist_answers")
+    return cache
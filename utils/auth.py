@@ -4,12 +4,13 @@ import os
 from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from sqlalchemy.orm import Session
 from models.init_db import Client, Employee
 from utils.dependencies import get_db
+from utils.auth_cache import auth_cache
+from utils.passwords import pwd_context
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -21,7 +22,6 @@ if not SECRET_KEY:
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 
@@ -64,6 +64,10 @@ def get_current_user(
     """
     Decode JWT token and retrieve user ID and role.
 
+    Verified tokens and user existence checks are cached (see
+    utils/auth_cache.py), so repeated requests with the same token skip both
+    the signature check and the database.
+
     Args:
         token (str): JWT token.
         db (Session): Database session.
@@ -79,26 +83,36 @@ def get_current_user(
         detail="Could not validate credentials.",
         headers={"WWW-Authenticate": "Bearer"},
     )
-    try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        user_id: int = payload.get("id")
-        role: str = payload.get("role")
-        if user_id is None or role is None:
+    principal = auth_cache.get_principal(token)
+    if principal is None:
+        try:
+            payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+            user_id: int = payload.get("id")
+            role: str = payload.get("role")
+            if user_id is None or role is None:
+                raise credentials_exception
+        except JWTError:
             raise credentials_exception
-    except JWTError:
-        raise credentials_exception
+        principal = (role, user_id)
+        # Tokens from create_access_token always carry "exp".
+        if "exp" in payload:
+            auth_cache.set_principal(token, principal, payload["exp"])
+    role, user_id = principal
 
     # Verify that the user exists in the respective table
+    if auth_cache.user_exists(principal):
+        return {"id": user_id, "role": role}
     if role == "customer":
-        user = db.query(Client).filter(Client.id == user_id).first()
+        user = db.query(Client.id).filter(Client.id == user_id).first()
         if not user:
             raise credentials_exception
     elif role == "employee":
-        user = db.query(Employee).filter(Employee.id == user_id).first()
+        user = db.query(Employee.id).filter(Employee.id == user_id).first()
         if not user:
             raise credentials_exception
     else:
         # Invalid role
         raise credentials_exception
+    auth_cache.set_user_exists(principal)
 
     return {"id": user_id, "role": role}
@@ -0,0 +1,192 @@
+# backend/utils/auth_cache.py
+
+import os
+import hashlib
+import logging
+import threading
+import time
+from collections import defaultdict
+from cachetools import TLRUCache, TTLCache
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.init_db import Client, Employee
+
+logger = logging.getLogger(__name__)
+
+ROLES = {Client: "customer", Employee: "employee"}
+
+
+class EvictionReportingTLRUCache(TLRUCache):
+    """TLRUCache reporting every size or expiry eviction to a callback."""
+
+    def __init__(self, maxsize, ttu, timer, on_evict):
+        super().__init__(maxsize=maxsize, ttu=ttu, timer=timer)
+        self._on_evict = on_evict
+
+    def popitem(self):
+        key, value = super().popitem()
+        self._on_evict(key, value)
+        return key, value
+
+    def expire(self, time=None):
+        expired = super().expire(time)
+        for key, value in expired:
+            self._on_evict(key, value)
+        return expired
+
+
+class AuthCache:
+    """
+    Caches for get_current_user: verified token -> principal, and
+    principal -> "exists in the database".
+
+    Tokens are keyed by their SHA-256 digest, never stored in clear, and
+    kept at most `ttl` seconds and never past their own ``exp`` claim. The
+    existence check is cached for `ttl` seconds too. `revoke_user` drops
+    both for a user, and is called automatically when a Client or Employee
+    deletion is committed in this process; other processes see it within
+    `ttl`.
+
+    A `ttl` of 0 disables caching.
+    """
+
+    def __init__(self, maxsize: int = 10000, ttl: float = 60,
+                 timer=time.time):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._tokens = EvictionReportingTLRUCache(
+            maxsize, self._token_expiry, timer, self._token_evicted
+        )
+        self._users = TTLCache(maxsize=maxsize, ttl=ttl or 1, timer=timer)
+        # (role, user_id) -> digests of that user's cached tokens
+        self._user_tokens = defaultdict(set)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0
+
+    def _token_expiry(self, key, value, now):
+        _, expires_at = value
+        return min(expires_at, now + self.ttl)
+
+    def _token_evicted(self, key, value):
+        # Called by the token cache, under the lock
+        principal = value[0]
+        tokens = self._user_tokens.get(principal)
+        if tokens is not None:
+            tokens.discard(key)
+            if not tokens:
+                del self._user_tokens[principal]
+
+    @staticmethod
+    def token_key(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get_principal(self, token: str):
+        """
+        Return the cached (role, user_id) of a verified token, or None.
+        """
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._tokens.get(self.token_key(token))
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    def set_principal(self, token: str, principal: tuple, expires_at: float):
+        if not self.enabled:
+            return
+        key = self.token_key(token)
+        with self._lock:
+            self._tokens[key] = (principal, expires_at)
+            self._user_tokens[principal].add(key)
+
+    def user_exists(self, principal: tuple) -> bool:
+        if not self.enabled:
+            return False
+        with self._lock:
+            return principal in self._users
+
+    def set_user_exists(self, principal: tuple):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._users[principal] = True
+
+    def revoke_user(self, role: str, user_id: int):
+        """
+        Forget every cached token and the existence check of a user, e.g.
+        after it was deleted or disabled.
+        """
+        principal = (role, user_id)
+        with self._lock:
+            self._users.pop(principal, None)
+            for key in self._user_tokens.pop(principal, ()):
+                self._tokens.pop(key, None)
+        logger.info(f"Revoked cached credentials of {role} {user_id}")
+
+    def clear(self):
+        with self._lock:
+            self._tokens.clear()
+            self._users.clear()
+            self._user_tokens.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "tokens": len(self._tokens),
+            "users": len(self._users),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+auth_cache = AuthCache(
+    maxsize=int(os.getenv("AUTH_CACHE_MAXSIZE", "10000")),
+    ttl=float(os.getenv("AUTH_CACHE_TTL", "60")),
+)
+
+_PENDING = "auth_cache_revocations"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_deleted_users(session, flush_context):
+    revoked = [
+        (ROLES[type(obj)], obj.id)
+        for obj in session.deleted
+        if type(obj) in ROLES
+    ]
+    if revoked:
+        session.info.setdefault(_PENDING, []).extend(revoked)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_user_writes(orm_execute_state):
+    # A bulk delete does not say which users it removed.
+    if orm_execute_state.is_delete:
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in ROLES:
+            orm_execute_state.session.info.setdefault(_PENDING, []).append(
+                None
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _revoke_committed(session):
+    for principal in session.info.pop(_PENDING, ()):
+        if principal is None:
+            auth_cache.clear()
+        else:
+            auth_cache.revoke_user(*principal)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_revocations(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING, None)
@@ -0,0 +1,359 @@
+# backend/utils/availability.py
+
+import os
+import math
+import logging
+import threading
+from time import monotonic
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from models.init_db import Appointment, Employee
+
+logger = logging.getLogger(__name__)
+
+# Appointment statuses that do not occupy the technician
+NON_BLOCKING_STATUSES = frozenset({"Cancelled"})
+
+
+class AvailabilityIndex:
+    """
+    In-memory calendar of technician bookings.
+
+    The working day is cut into slots of `slot_minutes`; the booked slots of
+    one technician on one day are the bits of a Python int, so a day's free
+    slots are ``full_day & ~booked``. Appointments block
+    `appointment_minutes` from their start time.
+
+    The index is loaded from the database once, kept up to date from
+    committed ORM changes (see the Session listeners below), and reloaded
+    every `refresh_interval` seconds to pick up writes made by other
+    processes. A load builds a fresh calendar without holding the lock and
+    swaps it in; changes committed meanwhile are replayed on top of it.
+    """
+
+    def __init__(self, slot_minutes: int = 30, day_start: time = time(8),
+                 day_end: time = time(18), appointment_minutes: int = 60,
+                 refresh_interval: float = 60, clock=monotonic):
+        self.slot_minutes = slot_minutes
+        self.day_start = day_start
+        self.day_end = day_end
+        self.appointment_minutes = appointment_minutes
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self.slots_per_day = (
+            _minutes(day_end) - _minutes(day_start)
+        ) // slot_minutes
+        self.full_day = (1 << self.slots_per_day) - 1
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._loaded_at = None
+        # Changes committed while a load runs, replayed once it is swapped in
+        self._loading = False
+        self._queued = []
+        self._invalidations = 0
+        self._employees = set()
+        # appointment id -> (employee_id, day, slot mask)
+        self._appointments = {}
+        # day -> employee_id -> {appointment id: slot mask}
+        self._masks = defaultdict(lambda: defaultdict(dict))
+        # day -> employee_id -> booked slot bitmap
+        self._booked = defaultdict(dict)
+
+    def slot_time(self, slot: int) -> time:
+        minutes = _minutes(self.day_start) + slot * self.slot_minutes
+        return time(minutes // 60, minutes % 60)
+
+    def slot_mask(self, start: time) -> int:
+        """
+        Bitmap of the slots an appointment starting at `start` occupies;
+        0 if it is outside working hours.
+        """
+        offset = _minutes(start) - _minutes(self.day_start)
+        first = offset // self.slot_minutes
+        last = math.ceil(
+            (offset + self.appointment_minutes) / self.slot_minutes
+        )
+        first, last = max(first, 0), min(last, self.slots_per_day)
+        if first >= last:
+            return 0
+        return ((1 << (last - first)) - 1) << first
+
+    # Incremental updates
+
+    def set_appointment(self, appointment_id: int, employee_id: int,
+                        day: date, start: time, status: str):
+        with self._lock:
+            self._drop_appointment(appointment_id)
+            if status in NON_BLOCKING_STATUSES:
+                return
+            mask = self.slot_mask(start)
+            if not mask:
+                return
+            self._appointments[appointment_id] = (employee_id, day, mask)
+            self._masks[day][employee_id][appointment_id] = mask
+            self._booked[day][employee_id] = (
+                self._booked[day].get(employee_id, 0) | mask
+            )
+
+    def remove_appointment(self, appointment_id: int):
+        with self._lock:
+            self._drop_appointment(appointment_id)
+
+    def _drop_appointment(self, appointment_id: int):
+        entry = self._appointments.pop(appointment_id, None)
+        if entry is None:
+            return
+        employee_id, day, _ = entry
+        masks = self._masks[day][employee_id]
+        masks.pop(appointment_id, None)
+        # Overlapping bookings may share slots, so recompute from the rest.
+        booked = 0
+        for mask in masks.values():
+            booked |= mask
+        if booked:
+            self._booked[day][employee_id] = booked
+        else:
+            self._booked[day].pop(employee_id, None)
+            del self._masks[day][employee_id]
+
+    def add_employee(self, employee_id: int):
+        with self._lock:
+            self._employees.add(employee_id)
+
+    def remove_employee(self, employee_id: int):
+        with self._lock:
+            self._employees.discard(employee_id)
+
+    # Loading
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def invalidate(self):
+        """
+        Force a full reload on the next query.
+        """
+        with self._lock:
+            self._invalidations += 1
+            self._loaded_at = None
+
+    def committed(self, changes: list):
+        """
+        Apply the (method, args) changes of a committed session: queued
+        for replay while a load runs, dropped before the first load, which
+        reads them anyway.
+        """
+        with self._lock:
+            if self._loading:
+                self._queued.extend(changes)
+            elif not self.loaded:
+                return
+            for apply, args in changes:
+                apply(*args)
+
+    def load(self, db: Session):
+        """
+        Rebuild the index from the employees and the appointments from today
+        on, selecting only the columns it needs.
+        """
+        with self._lock:
+            self._loading = True
+            self._queued = []
+            invalidations = self._invalidations
+        try:
+            fresh = AvailabilityIndex(
+                slot_minutes=self.slot_minutes,
+                day_start=self.day_start,
+                day_end=self.day_end,
+                appointment_minutes=self.appointment_minutes,
+            )
+            for row in db.query(Employee.id):
+                fresh.add_employee(row.id)
+            appointments = db.query(
+                Appointment.id,
+                Appointment.employee_id,
+                Appointment.date,
+                Appointment.time,
+                Appointment.status,
+            ).filter(Appointment.date >= date.today())
+            count = 0
+            for row in appointments:
+                fresh.set_appointment(*row)
+                count += 1
+        except Exception:
+            with self._lock:
+                self._loading = False
+                self._queued = []
+            raise
+        with self._lock:
+            self._employees = fresh._employees
+            self._appointments = fresh._appointments
+            self._masks = fresh._masks
+            self._booked = fresh._booked
+            for apply, args in self._queued:
+                apply(*args)
+            self._loading = False
+            self._queued = []
+            # Bulk writes made during the load may not all be in it
+            if invalidations == self._invalidations:
+                self._loaded_at = self.clock()
+        logger.info(
+            f"Availability index loaded: {len(fresh._employees)} employees, "
+            f"{count} appointments"
+        )
+
+    def _due(self) -> bool:
+        loaded_at = self._loaded_at
+        return (
+            loaded_at is None
+            or self.clock() - loaded_at > self.refresh_interval
+        )
+
+    def ensure_loaded(self, db: Session):
+        """
+        Load the index unless it is loaded and fresh. While a refresh is
+        running, other callers keep using the current calendar.
+        """
+        if not self._due():
+            return
+        if not self._load_lock.acquire(blocking=not self.loaded):
+            return
+        try:
+            if self._due():
+                self.load(db)
+        finally:
+            self._load_lock.release()
+
+    # Queries
+
+    def free_slots(self, date_from: date, date_to: date,
+                   employee_ids=None) -> list:
+        """
+        Slots between `date_from` and `date_to` (inclusive) where at least
+        one technician is free.
+
+        Args:
+            date_from (date): First day.
+            date_to (date): Last day.
+            employee_ids (list): Only consider these technicians; the free
+                ones are listed per slot. Default: every technician, counted.
+
+        Returns:
+            list: dicts with date, time, available and, when
+            `employee_ids` is given, the free employee_ids.
+        """
+        now = datetime.now()
+        results = []
+        with self._lock:
+            if employee_ids is not None:
+                employees = [e for e in employee_ids if e in self._employees]
+            else:
+                employees = None
+            day = date_from
+            while day <= date_to:
+                booked = self._booked.get(day, {})
+                if employees is None:
+                    busy = [0] * self.slots_per_day
+                    for employee_id, bitmap in booked.items():
+                        if employee_id not in self._employees:
+                            continue
+                        while bitmap:
+                            low = bitmap & -bitmap
+                            busy[low.bit_length() - 1] += 1
+                            bitmap ^= low
+                    total = len(self._employees)
+                    for slot in range(self.slots_per_day):
+                        if total - busy[slot] > 0:
+                            results.append({
+                                "date": day,
+                                "time": self.slot_time(slot),
+                                "available": total - busy[slot],
+                            })
+                else:
+                    free = {
+                        employee_id: self.full_day & ~booked.get(employee_id, 0)
+                        for employee_id in employees
+                    }
+                    for slot in range(self.slots_per_day):
+                        bit = 1 << slot
+                        ids = [e for e in employees if free[e] & bit]
+                        if ids:
+                            results.append({
+                                "date": day,
+                                "time": self.slot_time(slot),
+                                "available": len(ids),
+                                "employee_ids": ids,
+                            })
+                day += timedelta(days=1)
+        return [
+            slot for slot in results
+            if datetime.combine(slot["date"], slot["time"]) >= now
+        ]
+
+
+def _minutes(value: time) -> int:
+    return value.hour * 60 + value.minute
+
+
+availability_index = AvailabilityIndex(
+    slot_minutes=int(os.getenv("AVAILABILITY_SLOT_MINUTES", "30")),
+    day_start=time.fromisoformat(os.getenv("AVAILABILITY_DAY_START", "08:00")),
+    day_end=time.fromisoformat(os.getenv("AVAILABILITY_DAY_END", "18:00")),
+    appointment_minutes=int(
+        os.getenv("AVAILABILITY_APPOINTMENT_MINUTES", "60")
+    ),
+    refresh_interval=float(os.getenv("AVAILABILITY_REFRESH_SECONDS", "60")),
+)
+
+_PENDING = "availability_changes"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_changes(session, flush_context):
+    changes = []
+    for obj in list(session.new) + list(session.dirty):
+        if isinstance(obj, Appointment):
+            changes.append((
+                availability_index.set_appointment,
+                (obj.id, obj.employee_id, obj.date, obj.time, obj.status),
+            ))
+        elif isinstance(obj, Employee):
+            changes.append((availability_index.add_employee, (obj.id,)))
+    for obj in session.deleted:
+        if isinstance(obj, Appointment):
+            changes.append((availability_index.remove_appointment, (obj.id,)))
+        elif isinstance(obj, Employee):
+            changes.append((availability_index.remove_employee, (obj.id,)))
+    if changes:
+        session.info.setdefault(_PENDING, []).extend(changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_change(orm_execute_state):
+    # Bulk statements bypass the flush; reload rather than guess.
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in (Appointment, Employee):
+            orm_execute_state.session.info.setdefault(_PENDING, []).append(
+                (availability_index.invalidate, ())
+            )
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_changes(session):
+    changes = session.info.pop(_PENDING, None)
+    if changes:
+        availability_index.committed(changes)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_changes(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING, None)
@@ -0,0 +1,155 @@
+# backend/utils/dashboard_rollup.py
+
+import os
+import logging
+from collections import Counter
+from sqlalchemy import delete, event, func, insert, select
+from sqlalchemy.orm import Session
+from models.init_db import Appointment, AppointmentRollup
+
+logger = logging.getLogger(__name__)
+
+# Serve the dashboard summary from the rollup table rather than grouping the
+# appointments table on every request
+USE_ROLLUP = os.getenv("DASHBOARD_ROLLUP", "true").lower() in ("1", "true", "yes")
+
+# Columns the rollup groups appointments by
+ROLLUP_KEY = ("date", "status", "service_type", "employee_id")
+
+_DELTAS = "rollup_deltas"
+_STALE = "rollup_stale"
+
+
+def rebuild_rollup(connection):
+    """
+    Recompute the whole rollup table from the appointments table.
+    """
+    columns = [getattr(Appointment, name) for name in ROLLUP_KEY]
+    connection.execute(delete(AppointmentRollup))
+    connection.execute(
+        insert(AppointmentRollup).from_select(
+            [*ROLLUP_KEY, "count"],
+            select(*columns, func.count()).group_by(*columns),
+        )
+    )
+    logger.info("Rebuilt the appointment rollup table")
+
+
+def _upsert_statement(dialect_name: str):
+    if dialect_name == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect_name == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+    statement = dialect_insert(AppointmentRollup)
+    return statement.on_conflict_do_update(
+        index_elements=list(ROLLUP_KEY),
+        set_={"count": AppointmentRollup.count + statement.excluded["count"]},
+    )
+
+
+def apply_deltas(connection, deltas: Counter):
+    """
+    Add count deltas keyed by ROLLUP_KEY tuples to the rollup table with one
+    upsert, dropping rows that reach zero. Backends without ON CONFLICT get
+    a full rebuild instead.
+    """
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    statement = _upsert_statement(connection.dialect.name)
+    if statement is None:
+        rebuild_rollup(connection)
+        return
+    connection.execute(statement, [
+        {**dict(zip(ROLLUP_KEY, key)), "count": delta}
+        for key, delta in deltas.items()
+    ])
+    if any(delta < 0 for delta in deltas.values()):
+        connection.execute(
+            delete(AppointmentRollup).where(
+                AppointmentRollup.count <= 0,
+                AppointmentRollup.date.in_({key[0] for key in deltas}),
+            )
+        )
+
+
+def _stored_keys(session, appointment_ids) -> dict:
+    """
+    The ROLLUP_KEY values currently stored for these appointments. Read
+    from the database because attribute history lacks the old values of
+    attributes that were expired (e.g. by a commit) before being changed.
+    """
+    if not appointment_ids:
+        return {}
+    columns = [getattr(Appointment, name) for name in ROLLUP_KEY]
+    rows = session.connection().execute(
+        select(Appointment.id, *columns)
+        .where(Appointment.id.in_(appointment_ids))
+    )
+    return {row[0]: tuple(row[1:]) for row in rows}
+
+
+def _current_key(appointment: Appointment) -> tuple:
+    return tuple(getattr(appointment, name) for name in ROLLUP_KEY)
+
+
+@event.listens_for(Session, "before_flush")
+def _collect_deltas(session, flush_context, instances):
+    # Before the flush the database still holds the previous values.
+    deltas = Counter()
+    for obj in session.new:
+        if isinstance(obj, Appointment):
+            deltas[_current_key(obj)] += 1
+    changed = [
+        obj for obj in session.dirty
+        if isinstance(obj, Appointment) and session.is_modified(obj)
+    ]
+    deleted = [obj for obj in session.deleted if isinstance(obj, Appointment)]
+    stored = _stored_keys(session, [obj.id for obj in changed + deleted])
+    for obj in changed:
+        previous, current = stored.get(obj.id), _current_key(obj)
+        if previous is not None and previous != current:
+            deltas[previous] -= 1
+            deltas[current] += 1
+    for obj in deleted:
+        if obj.id in stored:
+            deltas[stored[obj.id]] -= 1
+    if deltas:
+        session.info.setdefault(_DELTAS, Counter()).update(deltas)
+
+
+@event.listens_for(Session, "after_flush")
+def _apply_deltas(session, flush_context):
+    deltas = session.info.pop(_DELTAS, None)
+    if deltas:
+        # Same connection and transaction as the appointment writes
+        apply_deltas(session.connection(), deltas)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _bulk_change(orm_execute_state):
+    # Bulk statements bypass the flush; rebuild before commit.
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ is Appointment:
+            orm_execute_state.session.info[_STALE] = True
+
+
+@event.listens_for(Session, "before_commit")
+def _rebuild_if_stale(session):
+    if session.info.pop(_STALE, False):
+        session.flush()
+        rebuild_rollup(session.connection())
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_deltas(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_DELTAS, None)
+        session.info.pop(_STALE, None)
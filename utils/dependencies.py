@@ -1,15 +1,162 @@
 # backend/utils/dependencies.py
+import os
+import time
+from functools import partial
+from fastapi import Depends, Request, Response
+from starlette.concurrency import run_in_threadpool
 from models.init_db import SessionLocal
 from dotenv import load_dotenv
 
 # Load environment variables from .env.prod
 load_dotenv(dotenv_path="../.env.prod")  # Adjust the path if necessary
 
+# Methods whose requests may read from a replica
+READ_ONLY_METHODS = frozenset({"GET", "HEAD"})
+# Cookie keeping a client's reads on the primary after it wrote, and for how
+# many seconds (should exceed the replication lag)
+PRIMARY_COOKIE = "db_primary_until"
+PRIMARY_STICKY_SECONDS = int(os.getenv("DB_REPLICA_STICKY_SECONDS", "5"))
 
-def get_db():
-    """Provides a database session for requests."""
-    db = SessionLocal()
+# Route areas whose read endpoints use the async engine: "all", or a
+# comma-separated list such as "customers,appointments"
+ASYNC_READS = {
+    area.strip()
+    for area in os.getenv("DB_ASYNC_READS", "").lower().split(",")
+    if area.strip()
+}
+
+
+class LazySession:
+    """
+    Stands in for a Session and only creates it on first use, so requests
+    that never touch the database (e.g. served from a cache) create no
+    session; like any Session it checks out a connection on first query.
+    """
+
+    def __init__(self, factory=SessionLocal):
+        self._factory = factory
+        self._session = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name):
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
+
+    def close(self):
+        if self._session is not None:
+            self._session.close()
+
+
+def routing_info(request: Request = None, response: Response = None) -> dict:
+    """
+    Session `info` routing a request's queries: reads of GET and HEAD
+    requests may go to a replica unless the client wrote within the last
+    PRIMARY_STICKY_SECONDS, and committing a write sets that cookie.
+    """
+    info = {}
+    if request is not None and request.method in READ_ONLY_METHODS:
+        try:
+            primary_until = float(request.cookies.get(PRIMARY_COOKIE, 0))
+        except ValueError:
+            primary_until = 0
+        info["read_only"] = primary_until < time.time()
+    if response is not None and PRIMARY_STICKY_SECONDS > 0:
+        info["on_write_commit"] = partial(
+            response.set_cookie,
+            PRIMARY_COOKIE,
+            str(int(time.time()) + PRIMARY_STICKY_SECONDS),
+            max_age=PRIMARY_STICKY_SECONDS,
+            httponly=True,
+        )
+    return info
+
+
+def get_db(request: Request = None, response: Response = None):
+    """
+    Provides a database session for requests, created on first use and
+    routed to a read replica when the request is read-only.
+    """
+    db = LazySession(partial(SessionLocal, info=routing_info(request, response)))
     try:
         yield db
     finally:
         db.close()
+
+
+class ReadSession:
+    """
+    Awaitable read access for async route handlers, over either an
+    AsyncSession or a regular Session whose calls run in the threadpool.
+    Results are fully fetched before they are returned.
+    """
+
+    def __init__(self, session, is_async: bool):
+        self.session = session
+        self.is_async = is_async
+
+    @property
+    def used_replica(self) -> bool:
+        """Whether the reads so far went to a read replica."""
+        if self.is_async:
+            return False
+        if isinstance(self.session, LazySession) and not self.session.started:
+            return False
+        return self.session.info.get("replica") is not None
+
+    async def rows(self, statement) -> list:
+        """Execute a select and return all its rows."""
+        if self.is_async:
+            return (await self.session.execute(statement)).all()
+        return await run_in_threadpool(
+            lambda: self.session.execute(statement).all()
+        )
+
+    async def scalars(self, statement, unique: bool = False) -> list:
+        """
+        Execute a select and return the first column of every row; set
+        `unique` when it joins collections in eagerly.
+        """
+        if self.is_async:
+            result = await self.session.scalars(statement)
+            return (result.unique() if unique else result).all()
+
+        def fetch():
+            result = self.session.scalars(statement)
+            return (result.unique() if unique else result).all()
+
+        return await run_in_threadpool(fetch)
+
+    async def run_sync(self, fn, *args):
+        """Call fn(session, *args) with a synchronous Session."""
+        if self.is_async:
+            return await self.session.run_sync(fn, *args)
+        return await run_in_threadpool(fn, self.session, *args)
+
+
+async def get_sync_read_db(db=Depends(get_db)):
+    """Read access through the regular (threadpool) session."""
+    yield ReadSession(db, is_async=False)
+
+
+async def get_async_read_db():
+    """Read access through an AsyncSession on the async engine."""
+    from models.async_db import get_async_sessionmaker
+
+    async with get_async_sessionmaker()() as session:
+        yield ReadSession(session, is_async=True)
+
+
+def uses_async_reads(area: str) -> bool:
+    return bool(ASYNC_READS & {"all", "1", "true", area})
+
+
+def read_db(area: str):
+    """
+    The read-session dependency for the route area `area`, chosen by
+    DB_ASYNC_READS so the async engine can be rolled out area by area.
+    """
+    return get_async_read_db if uses_async_reads(area) else get_sync_read_db
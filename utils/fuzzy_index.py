@@ -0,0 +1,169 @@
+# backend/utils/fuzzy_index.py
+
+import math
+from collections import Counter, defaultdict
+from fuzzywuzzy import fuzz
+from fuzzywuzzy.utils import full_process
+
+
+def trigrams(text: str) -> set:
+    """
+    Padded character trigrams of an already processed string, so that
+    strings shorter than three characters still produce some.
+    """
+    padded = f"  {text} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class FuzzyIndex:
+    """
+    Trigram inverted index for approximate lookups over cached queries.
+
+    Matches have the same meaning as
+    ``process.extractOne(query, keys, scorer=fuzz.ratio)`` with a score above
+    ``threshold``: both sides go through fuzzywuzzy's default processor and
+    every candidate is verified with ``fuzz.ratio``. The index only decides
+    which keys are worth verifying:
+
+    * length filter: ``fuzz.ratio`` can never exceed
+      ``200 * min(len) / (len_a + len_b)``, so keys whose length is too far
+      off are skipped exactly;
+    * overlap filter: shared trigrams are counted from the posting lists,
+      leaving out very common trigrams (found in more than
+      ``stop_fraction`` of the keys), so a lookup touches the rare postings
+      rather than every key. The keys with the highest counts must then
+      share at least ``min_overlap`` of the query's trigrams.
+
+    The best-overlapping candidates, at most ``max_candidates`` of them, are
+    finally verified with ``fuzz.ratio``.
+    """
+
+    def __init__(
+        self,
+        threshold: int = 85,
+        min_overlap: float = 0.5,
+        max_candidates: int = 32,
+        stop_fraction: float = 0.02,
+    ):
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.max_candidates = max_candidates
+        self.stop_fraction = stop_fraction
+        # processed text -> original keys that process to it
+        self._keys = defaultdict(set)
+        # processed text -> its trigram set
+        self._grams = {}
+        # trigram -> processed texts containing it
+        self._postings = defaultdict(set)
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys.get(full_process(key), ())
+
+    def add(self, key: str):
+        text = full_process(key)
+        keys = self._keys[text]
+        if key in keys:
+            return
+        keys.add(key)
+        self._size += 1
+        if text in self._grams:
+            return
+        grams = trigrams(text)
+        self._grams[text] = grams
+        for gram in grams:
+            self._postings[gram].add(text)
+
+    def discard(self, key: str):
+        text = full_process(key)
+        keys = self._keys.get(text)
+        if not keys or key not in keys:
+            return
+        keys.discard(key)
+        self._size -= 1
+        if keys:
+            return
+        del self._keys[text]
+        for gram in self._grams.pop(text):
+            postings = self._postings[gram]
+            postings.discard(text)
+            if not postings:
+                del self._postings[gram]
+
+    def clear(self):
+        self._keys.clear()
+        self._grams.clear()
+        self._postings.clear()
+        self._size = 0
+
+    def rebuild(self, keys):
+        """
+        Replace the indexed keys, e.g. after the cache evicted entries.
+        """
+        self.clear()
+        for key in keys:
+            self.add(key)
+
+    def _candidates(self, text: str) -> list:
+        grams = trigrams(text)
+        required = max(1, math.ceil(len(grams) * self.min_overlap))
+
+        # Count shared trigrams straight off the posting lists. Trigrams
+        # found in more than `stop_fraction` of the texts say little about
+        # similarity and dominate the cost, so beyond the rarest `required`
+        # ones they are left out of the count.
+        ranked = sorted(grams, key=lambda g: len(self._postings.get(g, ())))
+        stop_size = max(64, int(len(self._grams) * self.stop_fraction))
+        counts = Counter()
+        for position, gram in enumerate(ranked):
+            postings = self._postings.get(gram)
+            if not postings:
+                continue
+            if position >= required and len(postings) > stop_size:
+                break
+            counts.update(postings)
+
+        length = len(text)
+        scored = []
+        for candidate, _ in counts.most_common(4 * self.max_candidates):
+            other = len(candidate)
+            if 200 * min(length, other) <= self.threshold * (length + other):
+                continue
+            overlap = len(grams & self._grams[candidate])
+            if overlap >= required:
+                scored.append((overlap, candidate))
+        scored.sort(reverse=True)
+        return [candidate for _, candidate in scored[:self.max_candidates]]
+
+    def best_match(self, query: str, is_live=None):
+        """
+        Return the indexed key most similar to `query`, or None.
+
+        Args:
+            query (str): The incoming query.
+            is_live (callable): Optional predicate; keys it rejects (e.g.
+                expired from the cache) are dropped from the index and
+                skipped.
+
+        Returns:
+            str: The best key scoring above the threshold, if any.
+        """
+        text = full_process(query)
+        if not text:
+            return None
+
+        best_key, best_score = None, self.threshold
+        for candidate in self._candidates(text):
+            score = fuzz.ratio(text, candidate)
+            if score <= best_score:
+                continue
+            for key in list(self._keys.get(candidate, ())):
+                if is_live is not None and not is_live(key):
+                    self.discard(key)
+                    continue
+                best_key, best_score = key, score
+                break
+        return best_key
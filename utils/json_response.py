@@ -0,0 +1,39 @@
+# backend/utils/json_response.py
+
+import orjson
+from fastapi import Response
+
+
+def dump_rows(rows, fields=None) -> bytes:
+    """
+    Serialize result rows straight to a JSON array of objects with orjson,
+    skipping per-row Pydantic models and `jsonable_encoder`. Dates and
+    times are written in ISO format, as Pydantic would.
+
+    Args:
+        rows: Rows of a column select (`db.execute(select(...)).all()`).
+        fields (tuple): Names of the leading columns to output (default:
+            every column); later columns, e.g. a cursor key, are left out.
+
+    Returns:
+        bytes: The JSON document.
+    """
+    if not rows:
+        return b"[]"
+    if fields is None:
+        fields = rows[0]._fields
+    return orjson.dumps([dict(zip(fields, row)) for row in rows])
+
+
+class FastJSONResponse(Response):
+    """
+    JSON response rendered with orjson; pass bytes from `dump_rows` (or any
+    content orjson can serialize).
+    """
+
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return orjson.dumps(content)
@@ -0,0 +1,236 @@
+# backend/utils/metrics.py
+
+import os
+import time
+import logging
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+)
+from prometheus_client import multiprocess
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# With several worker processes, prometheus_client keeps every process's
+# samples in memory-mapped files under this directory, which must exist and
+# be emptied before the server starts; /metrics then aggregates them.
+MULTIPROCESS_DIR = os.getenv("PROMETHEUS_MULTIPROC_DIR")
+
+# Request latencies (seconds) span cached reads to streamed LLM answers
+LATENCY_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+)
+# Pool checkout waits are near zero unless the pool is exhausted
+POOL_WAIT_BUCKETS = (
+    0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0,
+)
+
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP requests handled, by route template and status code.",
+    ["method", "route", "status"],
+)
+HTTP_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time to handle an HTTP request, including streaming the body.",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+HTTP_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled.",
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUTS = Counter(
+    "db_pool_checkouts_total",
+    "Connections checked out of the primary database pool, by outcome.",
+    ["outcome"],
+)
+DB_POOL_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection, including opening it.",
+    buckets=POOL_WAIT_BUCKETS,
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_connections_checked_out",
+    "Connections of the primary database pool currently in use.",
+    multiprocess_mode="livesum",
+)
+
+CACHE_LOOKUPS = Counter(
+    "cache_lookups_total",
+    "Cache lookups, by cache and result (hit or miss).",
+    ["cache", "result"],
+)
+CACHE_EVICTIONS = Counter(
+    "cache_evictions_total",
+    "Entries evicted from a cache for size or expiry.",
+    ["cache"],
+)
+
+LLM_LATENCY = Histogram(
+    "llm_request_duration_seconds",
+    "Duration of upstream LLM completion streams, by outcome.",
+    ["model", "outcome"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_FIRST_TOKEN = Histogram(
+    "llm_time_to_first_token_seconds",
+    "Time from sending an LLM request to its first streamed token.",
+    ["model"],
+    buckets=LATENCY_BUCKETS,
+)
+LLM_TOKENS = Counter(
+    "llm_tokens_total",
+    "Tokens used by upstream LLM requests, by kind (prompt or completion).",
+    ["model", "kind"],
+)
+
+# Children of the fixed label sets, resolved once: labels() takes a lock
+_POOL_OK = DB_POOL_CHECKOUTS.labels("ok")
+_POOL_TIMEOUT = DB_POOL_CHECKOUTS.labels("timeout")
+
+
+def record_pool_wait(seconds: float, timed_out: bool = False):
+    """PoolMetrics listener exporting checkout waits."""
+    (_POOL_TIMEOUT if timed_out else _POOL_OK).inc()
+    DB_POOL_WAIT.observe(seconds)
+
+
+def instrument_pool(engine, pool_metrics):
+    """
+    Export the checkout waits recorded by `pool_metrics` and the number of
+    connections `engine` has checked out.
+    """
+    pool_metrics.add_listener(record_pool_wait)
+    event.listen(engine, "checkout", lambda *args: DB_POOL_CHECKED_OUT.inc())
+    event.listen(engine, "checkin", lambda *args: DB_POOL_CHECKED_OUT.dec())
+
+
+class CacheMetrics:
+    """Hit, miss and eviction counters of one named cache."""
+
+    __slots__ = ("hit", "miss", "evicted")
+
+    def __init__(self, cache: str):
+        self.hit = CACHE_LOOKUPS.labels(cache, "hit")
+        self.miss = CACHE_LOOKUPS.labels(cache, "miss")
+        self.evicted = CACHE_EVICTIONS.labels(cache)
+
+    def lookup(self, hit: bool):
+        (self.hit if hit else self.miss).inc()
+
+
+class LLMCallMetrics:
+    """
+    Timing of one upstream LLM stream: call `token()` for every streamed
+    token chunk, `usage()` with the reported usage, then `finish()`.
+    """
+
+    __slots__ = ("model", "started", "first_token")
+
+    def __init__(self, model: str):
+        self.model = model
+        self.started = time.perf_counter()
+        self.first_token = None
+
+    def token(self):
+        if self.first_token is None:
+            self.first_token = time.perf_counter()
+            LLM_FIRST_TOKEN.labels(self.model).observe(
+                self.first_token - self.started
+            )
+
+    def usage(self, usage):
+        if usage is None:
+            return
+        LLM_TOKENS.labels(self.model, "prompt").inc(usage.prompt_tokens or 0)
+        LLM_TOKENS.labels(self.model, "completion").inc(
+            usage.completion_tokens or 0
+        )
+
+    def finish(self, failed: bool = False):
+        LLM_LATENCY.labels(self.model, "error" if failed else "ok").observe(
+            time.perf_counter() - self.started
+        )
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware counting requests and timing them by method, route
+    template (never the raw path, to bound label cardinality) and status.
+    The time includes streaming the response body.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    @staticmethod
+    def _route_template(scope) -> str:
+        route = scope.get("route")
+        if route is None:
+            return "unmatched"
+        # Older FastAPI releases copy included routes with their full path;
+        # newer ones match the router's own route, whose path is relative to
+        # the include prefix. Either way the route path covers the last
+        # segments of the request path (no route uses a {name:path}
+        # parameter), so whatever comes before them is the prefix.
+        segments = route.path.count("/")
+        prefix = scope["path"].rsplit("/", segments)[0] if segments else ""
+        return prefix + route.path
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        started = time.perf_counter()
+        response = {"status": 500}
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        HTTP_IN_PROGRESS.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        except Exception:
+            response["status"] = 500
+            raise
+        finally:
+            HTTP_IN_PROGRESS.dec()
+            # The router stores the matched route in the shared scope
+            labels = (
+                scope["method"],
+                self._route_template(scope),
+                str(response["status"]),
+            )
+            HTTP_REQUESTS.labels(*labels).inc()
+            HTTP_LATENCY.labels(*labels).observe(
+                time.perf_counter() - started
+            )
+
+
+def metrics_registry() -> CollectorRegistry:
+    """
+    The registry to expose: this process's, or one aggregating every worker
+    process in multiprocess mode.
+    """
+    if not MULTIPROCESS_DIR:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    return registry
+
+
+def render_metrics() -> tuple:
+    """The metrics in the Prometheus text format, with its content type."""
+    return generate_latest(metrics_registry()), CONTENT_TYPE_LATEST
@@ -0,0 +1,95 @@
+# backend/utils/passwords.py
+
+import os
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from passlib.context import CryptContext
+from starlette.concurrency import run_in_threadpool
+
+logger = logging.getLogger(__name__)
+
+# bcrypt cost factor for new hashes; verified hashes below it are upgraded
+BCRYPT_ROUNDS = int(os.getenv("PASSWORD_BCRYPT_ROUNDS", "12"))
+# Processes verifying passwords (0 verifies in the calling thread)
+PASSWORD_WORKERS = int(os.getenv("PASSWORD_WORKERS", str(os.cpu_count() or 1)))
+# Verifications queued or running at once before logins are turned away
+MAX_PENDING_VERIFICATIONS = int(
+    os.getenv("PASSWORD_MAX_PENDING", str(max(PASSWORD_WORKERS, 1) * 4))
+)
+
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=BCRYPT_ROUNDS,
+    bcrypt__min_rounds=BCRYPT_ROUNDS,
+)
+
+_executor = None
+_executor_lock = threading.Lock()
+_pending = threading.BoundedSemaphore(MAX_PENDING_VERIFICATIONS)
+
+
+class VerificationBusy(Exception):
+    """Raised when too many password verifications are already pending."""
+
+
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple:
+    """
+    Verify a password and return (valid, new_hash); new_hash is set when the
+    stored hash uses outdated settings and should be replaced.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
+
+def get_executor() -> ProcessPoolExecutor:
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            logger.info(
+                f"Starting password verification pool with "
+                f"{PASSWORD_WORKERS} processes"
+            )
+            # Spawned rather than forked: a fork mid-request would hand the
+            # workers this process's sockets, holding client connections
+            # and the listening port open
+            _executor = ProcessPoolExecutor(
+                max_workers=PASSWORD_WORKERS,
+                mp_context=multiprocessing.get_context("spawn"),
+            )
+        return _executor
+
+
+async def verify_password_offloaded(plain_password: str,
+                                    hashed_password: str) -> tuple:
+    """
+    Run `verify_and_update` in the password process pool, so bcrypt uses
+    every core and never holds this process's GIL or its event loop.
+
+    At most MAX_PENDING_VERIFICATIONS run or wait in the pool at once; a
+    slot is released when its verification finishes, even if the caller
+    has gone away.
+
+    Raises:
+        VerificationBusy: If every slot is taken.
+    """
+    if not _pending.acquire(blocking=False):
+        raise VerificationBusy()
+    if PASSWORD_WORKERS <= 0:
+        try:
+            return await run_in_threadpool(
+                verify_and_update, plain_password, hashed_password
+            )
+        finally:
+            _pending.release()
+    try:
+        future = get_executor().submit(
+            verify_and_update, plain_password, hashed_password
+        )
+    except Exception:
+        _pending.release()
+        raise
+    future.add_done_callback(lambda _: _pending.release())
+    return await asyncio.wrap_future(future)
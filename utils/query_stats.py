@@ -0,0 +1,176 @@
+# backend/utils/query_stats.py
+
+import os
+import time
+import logging
+from contextvars import ContextVar
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text kept in logs
+MAX_LOGGED_STATEMENT = 500
+
+_current = ContextVar("query_stats", default=None)
+# Called with (scope, QueryStats) as each request finishes
+_listeners = []
+
+
+class QueryStats:
+    """
+    Queries run on behalf of one request: how many, the total time spent
+    in the database and the slowest statement.
+    """
+
+    __slots__ = ("count", "seconds", "slowest_seconds", "slowest_statement")
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = None
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        if seconds >= self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement
+
+    def server_timing(self) -> str:
+        """The stats as a Server-Timing header value."""
+        return (
+            f'db;dur={self.seconds * 1000:.1f};desc="{self.count} queries", '
+            f"db-slowest;dur={self.slowest_seconds * 1000:.1f}"
+        )
+
+    def log_fields(self) -> dict:
+        return {
+            "queries": self.count,
+            "db_ms": f"{self.seconds * 1000:.1f}",
+            "db_slowest_ms": f"{self.slowest_seconds * 1000:.1f}",
+        }
+
+
+def current_query_stats():
+    """The QueryStats of the request being handled, or None outside one."""
+    return _current.get()
+
+
+def add_listener(listener):
+    """
+    Register `listener(scope, stats)` to be called with the QueryStats of
+    every request once it finishes, e.g. to assert query budgets in tests.
+    """
+    _listeners.append(listener)
+
+
+def remove_listener(listener):
+    _listeners.remove(listener)
+
+
+# Engine-class listeners see every engine: the primary, the replicas and
+# the sync engines behind the async ones. The current request's stats
+# reach worker threads and greenlets through the copied context.
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context,
+                           executemany):
+    if _current.get() is not None:
+        conn.info["query_started"] = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context,
+                          executemany):
+    stats = _current.get()
+    started = conn.info.pop("query_started", None)
+    if stats is not None and started is not None:
+        stats.record(statement, time.perf_counter() - started)
+
+
+@event.listens_for(Engine, "handle_error")
+def _handle_error(exception_context):
+    # Failed statements count too; after_cursor_execute never sees them
+    conn = exception_context.connection
+    stats = _current.get()
+    started = conn.info.pop("query_started", None) if conn else None
+    if stats is not None and started is not None:
+        stats.record(
+            exception_context.statement, time.perf_counter() - started
+        )
+
+
+class QueryStatsMiddleware:
+    """
+    Pure ASGI middleware attributing the queries run while handling a
+    request to it.
+
+    The count, total DB time and slowest statement go out in a
+    `Server-Timing` header (covering the queries run before the response
+    starts, i.e. all of them unless the body is streamed) and are logged
+    with a warning once the request finishes if it ran more than
+    `max_queries` queries or a statement took `slow_query_ms` or longer.
+    """
+
+    def __init__(self, app, server_timing: bool = True,
+                 max_queries: int = 50, slow_query_ms: float = 500.0,
+                 logger=logger):
+        self.app = app
+        self.server_timing = server_timing
+        self.max_queries = max_queries
+        self.slow_query_ms = slow_query_ms
+        self.logger = logger
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start" and self.server_timing:
+                MutableHeaders(scope=message).append(
+                    "Server-Timing", stats.server_timing()
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            self._check(scope, stats)
+            for listener in list(_listeners):
+                listener(scope, stats)
+
+    def _check(self, scope, stats: QueryStats):
+        too_many = stats.count > self.max_queries
+        too_slow = stats.slowest_seconds * 1000 >= self.slow_query_ms
+        if not (too_many or too_slow):
+            return
+        fields = {"method": scope["method"], "path": scope["path"]}
+        fields.update(stats.log_fields())
+        statement = " ".join((stats.slowest_statement or "").split())
+        fields["slowest"] = repr(statement[:MAX_LOGGED_STATEMENT])
+        problem = "many queries" if too_many else "slow query"
+        self.logger.warning(
+            f"{problem}: "
+            + " ".join(f"{key}={value}" for key, value in fields.items())
+        )
+
+
+def query_stats_settings() -> dict:
+    """
+    QueryStatsMiddleware options from the QUERY_STATS_* environment
+    variables.
+    """
+    return {
+        "server_timing": os.getenv(
+            "QUERY_STATS_SERVER_TIMING", "true"
+        ).lower() in ("1", "true", "yes"),
+        "max_queries": int(os.getenv("QUERY_STATS_MAX_QUERIES", "50")),
+        "slow_query_ms": float(os.getenv("QUERY_STATS_SLOW_MS", "500")),
+    }
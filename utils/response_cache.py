@@ -0,0 +1,223 @@
+# backend/utils/response_cache.py
+
+import os
+import logging
+import threading
+from collections import defaultdict
+from time import monotonic
+from fastapi import Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from utils.answer_cache import EvictionCountingTTLCache
+from utils.metrics import CacheMetrics
+
+logger = logging.getLogger(__name__)
+
+
+class CachedResponse:
+    """
+    A serialized JSON response: body bytes plus extra headers.
+    """
+
+    __slots__ = ("body", "headers")
+
+    def __init__(self, body: bytes, headers: dict = None):
+        self.body = body
+        self.headers = headers or {}
+
+    def to_response(self) -> Response:
+        return Response(
+            content=self.body,
+            media_type="application/json",
+            headers=self.headers,
+        )
+
+
+class ResponseCache:
+    """
+    Read-through cache of serialized responses, keyed by a namespace and the
+    request parameters.
+
+    Each namespace is tied to ORM models with `invalidate_on`; committing a
+    session that inserted, updated or deleted one of them drops every entry
+    of the namespace. A generation counter per namespace keeps a response
+    computed before such a commit from being stored after it.
+
+    Invalidation only reaches this process, so entries also expire after
+    `ttl` seconds to bound staleness across workers. Lookups and evictions
+    are exported per namespace through CacheMetrics.
+
+    A read replica may not have the invalidating write yet, so a response
+    read from one within `replica_lag` seconds of an invalidation is served
+    but not stored.
+
+    Thread-safe: async endpoints use it on the event loop while commits in
+    threadpool endpoints invalidate it.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 600,
+                 replica_lag: float = 5, clock=monotonic):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.replica_lag = replica_lag
+        self.clock = clock
+        self._cache = EvictionCountingTTLCache(maxsize, ttl, self._evicted)
+        self._generations = defaultdict(int)
+        self._invalidated_at = {}
+        self._namespaces = defaultdict(set)
+        self._metrics = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _namespace_metrics(self, namespace: str) -> CacheMetrics:
+        metrics = self._metrics.get(namespace)
+        if metrics is None:
+            metrics = self._metrics[namespace] = CacheMetrics(
+                f"response_{namespace}"
+            )
+        return metrics
+
+    def _evicted(self, key: tuple):
+        self.evictions += 1
+        self._namespace_metrics(key[0]).evicted.inc()
+
+    def generation(self, namespace: str) -> int:
+        """
+        Current generation of `namespace`; read it before querying and pass
+        it to `set`.
+        """
+        with self._lock:
+            return self._generations[namespace]
+
+    def get(self, namespace: str, params: tuple):
+        with self._lock:
+            entry = self._cache.get((namespace, params))
+            if entry is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+            metrics = self._namespace_metrics(namespace)
+        metrics.lookup(entry is not None)
+        return entry
+
+    def set(self, namespace: str, params: tuple, entry: CachedResponse,
+            generation: int, replica: bool = False):
+        """
+        Store `entry` unless `namespace` was invalidated since `generation`
+        was read, or, when it was read from a replica (`replica`), within
+        the last `replica_lag` seconds.
+        """
+        with self._lock:
+            if generation != self._generations[namespace]:
+                # The namespace was invalidated while the response was built.
+                return
+            invalidated_at = self._invalidated_at.get(namespace)
+            if (
+                replica
+                and invalidated_at is not None
+                and self.clock() - invalidated_at < self.replica_lag
+            ):
+                return
+            self._cache[(namespace, params)] = entry
+
+    def invalidate(self, namespace: str):
+        with self._lock:
+            self._generations[namespace] += 1
+            self._invalidated_at[namespace] = self.clock()
+            for key in [
+                key for key in self._cache.keys() if key[0] == namespace
+            ]:
+                self._cache.pop(key, None)
+        logger.debug("Invalidated response cache namespace %s", namespace)
+
+    def clear(self):
+        with self._lock:
+            now = self.clock()
+            for namespace in list(self._generations):
+                self._generations[namespace] += 1
+                self._invalidated_at[namespace] = now
+            # Cache.clear() goes through popitem(), which would count
+            # evictions.
+            self._cache = EvictionCountingTTLCache(
+                self.maxsize, self.ttl, self._evicted
+            )
+
+    def invalidate_on(self, namespace: str, *models):
+        """
+        Invalidate `namespace` whenever a commit writes one of `models`.
+        """
+        for model in models:
+            self._namespaces[model].add(namespace)
+
+    def namespaces_for(self, models) -> set:
+        """
+        Namespaces invalidated by writes to any of `models`.
+        """
+        namespaces = set()
+        for model in models:
+            for cls in model.__mro__:
+                namespaces |= self._namespaces.get(cls, set())
+        return namespaces
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        with self._lock:
+            size = len(self._cache)
+        return {
+            "size": size,
+            "maxsize": self._cache.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+        }
+
+
+response_cache = ResponseCache(
+    maxsize=int(os.getenv("RESPONSE_CACHE_MAXSIZE", "1024")),
+    ttl=float(os.getenv("RESPONSE_CACHE_TTL", "600")),
+    # Same bound on the replication lag as the primary read cookie
+    replica_lag=float(os.getenv("DB_REPLICA_STICKY_SECONDS", "5")),
+)
+
+_PENDING = "response_cache_namespaces"
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_models(session, flush_context):
+    written = list(session.new) + list(session.dirty) + list(session.deleted)
+    namespaces = response_cache.namespaces_for({type(obj) for obj in written})
+    if namespaces:
+        session.info.setdefault(_PENDING, set()).update(namespaces)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_writes(orm_execute_state):
+    # Bulk insert/update/delete statements and query.update()/.delete()
+    # bypass the flush.
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None:
+            namespaces = response_cache.namespaces_for([mapper.class_])
+            if namespaces:
+                orm_execute_state.session.info.setdefault(
+                    _PENDING, set()
+                ).update(namespaces)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session):
+    for namespace in session.info.pop(_PENDING, ()):
+        response_cache.invalidate(namespace)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING, None)
@@ -0,0 +1,776 @@
+# backend/utils/search_index.py
+
+import os
+import re
+import math
+import heapq
+import bisect
+import logging
+import threading
+from collections import Counter, defaultdict
+from time import monotonic
+from typing import NamedTuple
+from fuzzywuzzy import fuzz
+from sqlalchemy import event, inspect, select
+from sqlalchemy.orm import Session
+from models.init_db import Client, ServiceHistory, Vehicle
+from utils.fuzzy_index import trigrams
+
+logger = logging.getLogger(__name__)
+
+# Indexed fields: the kind of record they belong to, the model attribute
+# and the weight of a match in them
+FIELDS = {
+    "name": ("customer", Client.name, 3.0),
+    "email": ("customer", Client.email, 2.0),
+    "phone": ("customer", Client.phone, 2.0),
+    "vin": ("vehicle", Vehicle.vin, 3.0),
+    "model": ("vehicle", Vehicle.model, 1.0),
+    "notes": ("service_record", ServiceHistory.notes, 0.5),
+}
+KINDS = {
+    "customer": (Client, Client.id),
+    "vehicle": (Vehicle, Vehicle.vin),
+    "service_record": (ServiceHistory, ServiceHistory.id),
+}
+KIND_FIELDS = {
+    kind: tuple(field for field, spec in FIELDS.items() if spec[0] == kind)
+    for kind in KINDS
+}
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+# Joins a record's indexed values
+SEPARATOR = "\x1f"
+
+
+def tokenize(text: str) -> list:
+    """Lowercase alphanumeric runs of `text`."""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+def field_terms(field: str, value: str) -> set:
+    """
+    Terms indexed for a field value: its tokens, plus all the digits of a
+    phone number as one term so it matches however it is punctuated.
+    """
+    tokens = tokenize(value)
+    terms = set(tokens)
+    if field == "phone" and len(tokens) > 1:
+        terms.add("".join(tokens))
+    return terms
+
+
+class SearchDocument(NamedTuple):
+    kind: str
+    id: object
+    fields: dict
+
+
+class SearchHit(NamedTuple):
+    kind: str
+    id: object
+    score: float
+
+
+def document_for(obj):
+    """The SearchDocument of a Client, Vehicle or ServiceHistory, or None."""
+    for kind, (model, key) in KINDS.items():
+        if isinstance(obj, model):
+            return SearchDocument(kind, getattr(obj, key.key), {
+                field: getattr(obj, FIELDS[field][1].key)
+                for field in KIND_FIELDS[kind]
+            })
+    return None
+
+
+def load_documents(db: Session, batch_size: int = 10000):
+    """Yield the SearchDocument of every indexed row."""
+    for kind, (_, key) in KINDS.items():
+        fields = KIND_FIELDS[kind]
+        result = db.execute(
+            select(key, *(FIELDS[field][1] for field in fields))
+            .execution_options(yield_per=batch_size)
+        )
+        for row in result:
+            yield SearchDocument(kind, row[0], dict(zip(fields, row[1:])))
+
+
+class SearchIndex:
+    """
+    Interface of the customer/vehicle/service record search backends.
+
+    Backends implement `fill`, `apply` and `search`. The index is filled
+    from the database on first use (`ensure_loaded`), then kept up to date
+    with the documents written by each committed session (`committed`).
+    Changes committed while it is being filled are queued and replayed
+    once it is, so none is lost to a read that already went past them.
+
+    With `refresh_interval` set, the index is also filled again every
+    `refresh_interval` seconds to pick up writes made by other processes.
+    """
+
+    backend = "base"
+
+    def __init__(self, refresh_interval: float = 0, clock=monotonic):
+        self.refresh_interval = refresh_interval
+        self.clock = clock
+        self._loaded_at = None
+        self._load_lock = threading.Lock()
+        # Guards the fields below, which hand committed changes to a load
+        self._changes_lock = threading.Lock()
+        self._loading = False
+        self._queued = []
+        self._invalidations = 0
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded_at is not None
+
+    def _due(self) -> bool:
+        loaded_at = self._loaded_at
+        return loaded_at is None or bool(
+            self.refresh_interval
+            and self.clock() - loaded_at > self.refresh_interval
+        )
+
+    def ensure_loaded(self, db: Session):
+        """
+        Fill the index from `db` unless it is loaded and fresh. While a
+        refresh is running, other callers keep using the current index
+        rather than waiting for it.
+        """
+        if not self._due():
+            return
+        if not self._load_lock.acquire(blocking=not self.loaded):
+            return
+        try:
+            if self._due():
+                self._load(db)
+        finally:
+            self._load_lock.release()
+
+    def _load(self, db: Session):
+        with self._changes_lock:
+            self._loading = True
+            self._queued = []
+            invalidations = self._invalidations
+        try:
+            self.fill(db)
+        except Exception:
+            with self._changes_lock:
+                self._loading = False
+                self._queued = []
+                self._loaded_at = None
+            raise
+        with self._changes_lock:
+            for changes in self._queued:
+                self.apply(changes)
+            self._loading = False
+            self._queued = []
+            # Bulk writes made during the load may not all be in it
+            if invalidations == self._invalidations:
+                self._loaded_at = self.clock()
+
+    def invalidate(self):
+        """Reload the index on next use, e.g. after bulk writes."""
+        with self._changes_lock:
+            self._invalidations += 1
+            self._loaded_at = None
+
+    def committed(self, changes: dict):
+        """
+        Take in the changes of a committed session (see `apply`): applied
+        when the index is loaded, queued while it is being filled, and
+        dropped before its first load, which reads them anyway.
+        """
+        with self._changes_lock:
+            if self._loading:
+                self._queued.append(changes)
+                return
+            if not self.loaded:
+                return
+        self.apply(changes)
+
+    def fill(self, db: Session):
+        """Fill the index with every indexed row of `db`."""
+        raise NotImplementedError
+
+    def load(self, documents):
+        """Replace the contents of the index with `documents`."""
+        raise NotImplementedError
+
+    def apply(self, changes: dict):
+        """
+        Apply committed changes: a map of (kind, id) to the document's new
+        SearchDocument, or None when it was deleted.
+        """
+        raise NotImplementedError
+
+    def search(self, query: str, kinds=None, limit: int = 20) -> list:
+        """
+        Documents matching every token of `query`, by exact, prefix or
+        (for longer alphabetic tokens) typo-tolerant term match, best first.
+
+        Args:
+            query (str): Free text: names, emails, phone numbers, VINs...
+            kinds (iterable): Restrict the results to these kinds.
+            limit (int): Maximum number of hits.
+
+        Returns:
+            list: SearchHit tuples.
+        """
+        raise NotImplementedError
+
+
+def _contains(posting, doc_id) -> bool:
+    return doc_id in posting if type(posting) is set else posting == doc_id
+
+
+def _members(posting):
+    return posting if type(posting) is set else (posting,)
+
+
+def _size(posting) -> int:
+    return len(posting) if type(posting) is set else 1
+
+
+class LocalSearchIndex(SearchIndex):
+    """
+    In-process inverted index.
+
+    Every field has postings from term to the IDs of the records containing
+    it (a bare ID while there is only one, which saves a set per unique
+    term such as a VIN or phone number). A query token expands to the
+    indexed terms it matches:
+
+    * the term itself, scoring 1;
+    * up to `max_expansions` terms it is a prefix of (from a vocabulary
+      kept sorted in buckets by first letters), scoring 0.5 to 0.9 as the
+      token covers more of the term;
+    * for alphabetic tokens of `min_fuzzy` or more characters, terms
+      sharing trigrams with it whose fuzz.ratio is at least
+      `fuzzy_threshold`, scoring at most 0.4.
+
+    A record's score is the sum over the query tokens of its best match,
+    weighted by field. Records are collected from the most selective token's
+    postings, best first, until no remaining one can beat the current top
+    `limit`, so common terms do not cost a full scan.
+
+    Reads and writes are serialized by one lock. A load builds the new
+    index aside and swaps it in, so searches go on during a refresh (which
+    briefly takes twice the memory).
+    """
+
+    backend = "local"
+
+    # Leading characters grouping the sorted vocabulary
+    BUCKET = 4
+    # Other tokens matching up to this many records have their best score
+    # per record collected up front; larger ones are checked per record
+    MAX_COLLECTED = 5000
+
+    def __init__(self, max_expansions: int = 50, min_prefix: int = 2,
+                 min_fuzzy: int = 4, fuzzy_threshold: int = 75,
+                 refresh_interval: float = 0, clock=monotonic):
+        super().__init__(refresh_interval, clock)
+        self.max_expansions = max_expansions
+        self.min_prefix = min_prefix
+        self.min_fuzzy = min_fuzzy
+        self.fuzzy_threshold = fuzzy_threshold
+        self._lock = threading.RLock()
+        self._reset()
+
+    # Attributes holding the indexed data, replaced as a whole by a load
+    _STATE = ("_postings", "_values", "_buckets", "_bucket_keys", "_grams")
+
+    def _reset(self):
+        # field -> term -> record ID or set of record IDs
+        self._postings = {field: {} for field in FIELDS}
+        # kind -> record ID -> indexed values, in KIND_FIELDS order, joined
+        # into one string (much smaller than a tuple of strings)
+        self._values = {kind: {} for kind in KINDS}
+        # term[:BUCKET] -> sorted terms, and the sorted bucket keys
+        self._buckets = {}
+        self._bucket_keys = []
+        # trigram -> alphabetic terms containing it, for typo tolerance
+        self._grams = defaultdict(set)
+
+    def __len__(self) -> int:
+        return sum(len(values) for values in self._values.values())
+
+    # Vocabulary
+
+    def _indexed(self, term: str) -> bool:
+        return any(term in postings for postings in self._postings.values())
+
+    def _add_term(self, term: str):
+        key = term[:self.BUCKET]
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = self._buckets[key] = []
+            bisect.insort(self._bucket_keys, key)
+        bisect.insort(bucket, term)
+        if term.isalpha() and len(term) >= 3:
+            for gram in trigrams(term):
+                self._grams[gram].add(term)
+
+    def _drop_term(self, term: str):
+        key = term[:self.BUCKET]
+        bucket = self._buckets[key]
+        del bucket[bisect.bisect_left(bucket, term)]
+        if not bucket:
+            del self._buckets[key]
+            del self._bucket_keys[bisect.bisect_left(self._bucket_keys, key)]
+        if term.isalpha() and len(term) >= 3:
+            for gram in trigrams(term):
+                terms = self._grams[gram]
+                terms.discard(term)
+                if not terms:
+                    del self._grams[gram]
+
+    # Postings
+
+    def _post(self, field: str, term: str, doc_id):
+        postings = self._postings[field]
+        posting = postings.get(term)
+        if posting is None:
+            if not self._indexed(term):
+                self._add_term(term)
+            postings[term] = doc_id
+        elif type(posting) is set:
+            posting.add(doc_id)
+        elif posting != doc_id:
+            postings[term] = {posting, doc_id}
+
+    def _unpost(self, field: str, term: str, doc_id):
+        postings = self._postings[field]
+        posting = postings.get(term)
+        if type(posting) is set:
+            posting.discard(doc_id)
+            if len(posting) == 1:
+                postings[term] = next(iter(posting))
+        elif posting == doc_id:
+            del postings[term]
+            if not self._indexed(term):
+                self._drop_term(term)
+
+    def _index(self, kind: str, doc_id, values: str, add: bool):
+        for field, value in zip(KIND_FIELDS[kind], values.split(SEPARATOR)):
+            for term in field_terms(field, value):
+                if add:
+                    self._post(field, term, doc_id)
+                else:
+                    self._unpost(field, term, doc_id)
+
+    def _upsert(self, document: SearchDocument):
+        values = SEPARATOR.join(
+            (document.fields.get(field) or "").replace(SEPARATOR, " ")
+            for field in KIND_FIELDS[document.kind]
+        )
+        stored = self._values[document.kind]
+        old = stored.get(document.id)
+        if old == values:
+            return
+        if old is not None:
+            self._index(document.kind, document.id, old, add=False)
+        stored[document.id] = values
+        self._index(document.kind, document.id, values, add=True)
+
+    def _remove(self, kind: str, doc_id):
+        old = self._values[kind].pop(doc_id, None)
+        if old is not None:
+            self._index(kind, doc_id, old, add=False)
+
+    def fill(self, db: Session):
+        self.load(load_documents(db))
+
+    def load(self, documents):
+        fresh = LocalSearchIndex(
+            self.max_expansions, self.min_prefix, self.min_fuzzy,
+            self.fuzzy_threshold,
+        )
+        for document in documents:
+            fresh._upsert(document)
+        with self._lock:
+            for name in self._STATE:
+                setattr(self, name, getattr(fresh, name))
+        logger.info(f"Search index loaded with {len(self)} documents")
+
+    def apply(self, changes: dict):
+        with self._lock:
+            for (kind, doc_id), document in changes.items():
+                if document is None:
+                    self._remove(kind, doc_id)
+                else:
+                    self._upsert(document)
+
+    # Queries
+
+    def _prefixed(self, token: str) -> list:
+        """Indexed terms starting with `token`, in order, capped."""
+        terms = []
+        if len(token) >= self.BUCKET:
+            bucket = self._buckets.get(token[:self.BUCKET], ())
+            start = bisect.bisect_left(bucket, token)
+            for term in bucket[start:start + self.max_expansions + 1]:
+                if not term.startswith(token):
+                    break
+                terms.append(term)
+            return terms
+        start = bisect.bisect_left(self._bucket_keys, token)
+        for key in self._bucket_keys[start:]:
+            if not key.startswith(token):
+                break
+            for term in self._buckets[key]:
+                terms.append(term)
+                if len(terms) > self.max_expansions:
+                    return terms
+        return terms
+
+    def _similar(self, token: str) -> list:
+        """Alphabetic terms within `fuzzy_threshold` of `token`."""
+        grams = trigrams(token)
+        counts = Counter()
+        for gram in grams:
+            counts.update(self._grams.get(gram, ()))
+        required = max(2, math.ceil(len(grams) * 0.4))
+        length = len(token)
+        similar = []
+        for term, shared in counts.items():
+            # fuzz.ratio cannot exceed 200 * min(len) / (len_a + len_b)
+            other = len(term)
+            if (shared < required or 200 * min(length, other)
+                    < self.fuzzy_threshold * (length + other)):
+                continue
+            score = fuzz.ratio(token, term)
+            if score >= self.fuzzy_threshold:
+                similar.append((term, score))
+        return similar
+
+    def _expand(self, token: str) -> dict:
+        """Indexed terms matching a query token, with their match quality."""
+        matches = {}
+        if self._indexed(token):
+            matches[token] = 1.0
+        if len(token) >= self.min_prefix:
+            for term in self._prefixed(token):
+                if term != token and len(matches) <= self.max_expansions:
+                    matches[term] = 0.5 + 0.4 * len(token) / len(term)
+        # Typos are only looked for when the token is not a word itself
+        if (len(token) >= self.min_fuzzy and token.isalpha()
+                and not matches.get(token)):
+            for term, score in self._similar(token):
+                matches.setdefault(term, 0.4 * score / 100)
+        return matches
+
+    def _entries(self, token: str, fields) -> list:
+        """
+        The postings matching a token as (score, kind, posting), best first.
+        """
+        entries = []
+        for term, quality in self._expand(token).items():
+            for field in fields:
+                posting = self._postings[field].get(term)
+                if posting is not None:
+                    kind, _, weight = FIELDS[field]
+                    entries.append((quality * weight, kind, posting))
+        entries.sort(key=lambda entry: entry[0], reverse=True)
+        return entries
+
+    def search(self, query: str, kinds=None, limit: int = 20) -> list:
+        tokens = list(dict.fromkeys(tokenize(query)))
+        if not tokens:
+            return []
+        fields = [
+            field for field, (kind, _, _) in FIELDS.items()
+            if kinds is None or kind in kinds
+        ]
+        with self._lock:
+            matches = [self._entries(token, fields) for token in tokens]
+            if not all(matches):
+                return []
+            sizes = [
+                sum(_size(posting) for _, _, posting in entries)
+                for entries in matches
+            ]
+            driver = min(range(len(tokens)), key=sizes.__getitem__)
+            others = []
+            for i, entries in enumerate(matches):
+                if i == driver:
+                    continue
+                if sizes[i] <= self.MAX_COLLECTED:
+                    # Best score of every record matching this token
+                    best = defaultdict(dict)
+                    for score, kind, posting in reversed(entries):
+                        for doc_id in _members(posting):
+                            best[kind][doc_id] = score
+                    others.append(best)
+                else:
+                    others.append(entries)
+            bonus = sum(matches[i][0][0] for i in range(len(tokens))
+                        if i != driver)
+            return self._top(matches[driver], others, bonus, limit)
+
+    def _top(self, entries, others, bonus: float, limit: int) -> list:
+        heap = []
+        seen = set()
+        for score, kind, posting in entries:
+            bound = score + bonus
+            for doc_id in _members(posting):
+                if len(heap) == limit and heap[0][0] >= bound:
+                    break
+                if (kind, doc_id) in seen:
+                    continue
+                seen.add((kind, doc_id))
+                total = score
+                for other in others:
+                    if isinstance(other, dict):
+                        found = (other[kind].get(doc_id)
+                                 if kind in other else None)
+                    else:
+                        found = next((
+                            other_score
+                            for other_score, other_kind, posting in other
+                            if other_kind == kind
+                            and _contains(posting, doc_id)
+                        ), None)
+                    if found is None:
+                        break
+                    total += found
+                else:
+                    item = (total, kind, doc_id)
+                    if len(heap) < limit:
+                        heapq.heappush(heap, item)
+                    elif total > heap[0][0]:
+                        heapq.heapreplace(heap, item)
+            else:
+                continue
+            break
+        hits = sorted(heap, key=lambda item: (-item[0], item[1], str(item[2])))
+        return [SearchHit(kind, doc_id, round(total, 4))
+                for total, kind, doc_id in hits]
+
+
+class ElasticsearchSearchIndex(SearchIndex):
+    """
+    Index in Elasticsearch, shared by every worker process.
+
+    Documents hold the same terms the local index uses, space-separated in
+    search_as_you_type fields, and are matched with a bool_prefix
+    multi_match (every token required, fuzziness AUTO) boosted by the field
+    weights. Bulk actions that fail are logged and counted in
+    `failed_actions`.
+    """
+
+    backend = "elasticsearch"
+
+    def __init__(self, client, index: str = "lucid-search"):
+        super().__init__()
+        self.client = client
+        self.index = index
+        self.failed_actions = 0
+
+    def fill(self, db: Session):
+        # The index is shared and outlives this process: only fill it when
+        # it is new. Every worker's commits keep it up to date.
+        if not self.client.indices.exists(index=self.index):
+            self._create()
+            self._bulk(
+                self._index_action(document)
+                for document in load_documents(db)
+            )
+
+    def _create(self):
+        properties = {
+            field: {"type": "search_as_you_type"} for field in FIELDS
+        }
+        properties.update(kind={"type": "keyword"}, ref={"type": "keyword"})
+        self.client.indices.create(
+            index=self.index, mappings={"properties": properties}
+        )
+
+    def committed(self, changes: dict):
+        # The shared index is not rebuilt by a load, so there is nothing to
+        # queue for: every commit is written through, loaded or not.
+        self.apply(changes)
+
+    def _bulk(self, actions):
+        from elasticsearch import helpers
+
+        _, errors = helpers.bulk(self.client, actions, raise_on_error=False)
+        # Deleting a record that was never indexed is not a failure
+        errors = [
+            error for error in errors
+            if error.get("delete", {}).get("status") != 404
+        ]
+        if errors:
+            self.failed_actions += len(errors)
+            logger.error(
+                f"{len(errors)} search index bulk actions failed, "
+                f"first: {errors[0]}"
+            )
+
+    def _index_action(self, document: SearchDocument) -> dict:
+        source = {
+            field: " ".join(sorted(field_terms(field, value)))
+            for field, value in document.fields.items()
+        }
+        source.update(kind=document.kind, ref=str(document.id))
+        return {
+            "_op_type": "index",
+            "_index": self.index,
+            "_id": f"{document.kind}:{document.id}",
+            "_source": source,
+        }
+
+    def load(self, documents):
+        if self.client.indices.exists(index=self.index):
+            self.client.indices.delete(index=self.index)
+        self._create()
+        self._bulk(self._index_action(document) for document in documents)
+
+    def apply(self, changes: dict):
+        self._bulk(
+            self._index_action(document) if document is not None else {
+                "_op_type": "delete",
+                "_index": self.index,
+                "_id": f"{kind}:{doc_id}",
+            }
+            for (kind, doc_id), document in changes.items()
+        )
+
+    def search(self, query: str, kinds=None, limit: int = 20) -> list:
+        text = " ".join(tokenize(query))
+        if not text:
+            return []
+        fields = []
+        for field, (kind, _, weight) in FIELDS.items():
+            fields += [f"{field}^{weight}", f"{field}._2gram^{weight}"]
+        search = {
+            "bool": {
+                "must": {
+                    "multi_match": {
+                        "query": text,
+                        "type": "bool_prefix",
+                        "fields": fields,
+                        "operator": "and",
+                        "fuzziness": "AUTO",
+                    }
+                }
+            }
+        }
+        if kinds is not None:
+            search["bool"]["filter"] = {"terms": {"kind": list(kinds)}}
+        response = self.client.search(
+            index=self.index, query=search, size=limit
+        )
+        hits = []
+        for hit in response["hits"]["hits"]:
+            kind = hit["_source"]["kind"]
+            ref = hit["_source"]["ref"]
+            hits.append(SearchHit(
+                kind, ref if kind == "vehicle" else int(ref), hit["_score"]
+            ))
+        return hits
+
+
+def create_search_index() -> SearchIndex:
+    """
+    Build the search index selected by SEARCH_BACKEND ("local" or
+    "elasticsearch", the latter at ELASTICSEARCH_URL).
+
+    The local index is per process and reloads every SEARCH_REFRESH_SECONDS
+    (0 disables it) to pick up other workers' writes; a reload costs about
+    as much as the first load, so keep it long for large tables.
+    """
+    backend = os.getenv("SEARCH_BACKEND", "local")
+    if backend == "elasticsearch":
+        from elasticsearch import Elasticsearch
+
+        url = os.getenv("ELASTICSEARCH_URL", "http://localhost:9200")
+        logger.info(f"Using Elasticsearch search index at {url}")
+        return ElasticsearchSearchIndex(
+            Elasticsearch(url),
+            index=os.getenv("SEARCH_INDEX_NAME", "lucid-search"),
+        )
+    if backend != "local":
+        raise ValueError(f"Unknown SEARCH_BACKEND: {backend}")
+    return LocalSearchIndex(
+        refresh_interval=float(os.getenv("SEARCH_REFRESH_SECONDS", "300"))
+    )
+
+
+search_index = create_search_index()
+
+_PENDING = "search_index_changes"
+_STALE = "search_index_stale"
+_INDEXED_ATTRIBUTES = {
+    model: [FIELDS[field][1].key for field in KIND_FIELDS[kind]]
+    for kind, (model, _) in KINDS.items()
+}
+
+
+def _changed(obj) -> bool:
+    state = inspect(obj)
+    return any(
+        state.attrs[name].history.has_changes()
+        for name in _INDEXED_ATTRIBUTES[type(obj)]
+    )
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_search_changes(session, flush_context):
+    # Collected even before the index is loaded: a load may start before
+    # this session commits, and miss its rows.
+    changes = {}
+    for obj in session.new:
+        document = document_for(obj)
+        if document is not None:
+            changes[(document.kind, document.id)] = document
+    for obj in session.dirty:
+        if type(obj) in _INDEXED_ATTRIBUTES and _changed(obj):
+            document = document_for(obj)
+            changes[(document.kind, document.id)] = document
+    for obj in session.deleted:
+        document = document_for(obj)
+        if document is not None:
+            changes[(document.kind, document.id)] = None
+    if changes:
+        session.info.setdefault(_PENDING, {}).update(changes)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_writes(orm_execute_state):
+    # Bulk statements bypass the flush; the index reloads after them.
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        mapper = orm_execute_state.bind_mapper
+        if mapper is not None and mapper.class_ in _INDEXED_ATTRIBUTES:
+            orm_execute_state.session.info[_STALE] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_committed(session):
+    changes = session.info.pop(_PENDING, None)
+    if session.info.pop(_STALE, False):
+        search_index.invalidate()
+    elif changes:
+        try:
+            search_index.committed(changes)
+        except Exception as e:
+            # The data is committed; a stale index must not fail the request
+            logger.error(f"Failed to update the search index: {e}")
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_rolled_back(session, previous_transaction):
+    if not session.in_transaction():
+        session.info.pop(_PENDING, None)
+        session.info.pop(_STALE, None)
+    elif _PENDING in session.info:
+        # A savepoint rolled back some of the pending changes, which cannot
+        # be told apart from the rest: reload once the transaction commits
+        session.info[_STALE] = True
@@ -0,0 +1,280 @@
+# backend/utils/semantic_cache.py
+
+import re
+import os
+import logging
+import time
+import zlib
+from collections import deque
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+class Embedder:
+    """
+    Turns a batch of texts into L2-normalized float32 vectors.
+    """
+
+    dimension = None
+
+    async def embed(self, texts: list) -> np.ndarray:
+        raise NotImplementedError
+
+
+class HashingEmbedder(Embedder):
+    """
+    Local, deterministic embedder: words and character trigrams hashed into
+    a fixed number of signed buckets. No network, so it is used for tests
+    and as a cheap default; it catches reworded questions that share their
+    key terms, not true synonyms.
+    """
+
+    def __init__(self, dimension: int = 512):
+        self.dimension = dimension
+
+    def _vector(self, text: str) -> np.ndarray:
+        vector = np.zeros(self.dimension, dtype=np.float32)
+        words = _WORD_RE.findall(text.lower())
+        features = [f"w:{word}" for word in words]
+        for word in words:
+            padded = f" {word} "
+            features.extend(
+                f"g:{padded[i:i + 3]}" for i in range(len(padded) - 2)
+            )
+        for feature in features:
+            # crc32 is stable across processes, unlike hash().
+            digest = zlib.crc32(feature.encode())
+            sign = 1.0 if digest & 1 else -1.0
+            # Whole words carry more meaning than their trigrams.
+            weight = 2.0 if feature.startswith("w:") else 1.0
+            vector[(digest >> 1) % self.dimension] += sign * weight
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    async def embed(self, texts: list) -> np.ndarray:
+        return np.stack([self._vector(text) for text in texts])
+
+
+class OpenAIEmbedder(Embedder):
+    """
+    Embeddings from the OpenAI API (one request per batch).
+    """
+
+    def __init__(self, client, model: str = "text-embedding-3-small",
+                 dimension: int = 1536):
+        self.client = client
+        self.model = model
+        self.dimension = dimension
+
+    async def embed(self, texts: list) -> np.ndarray:
+        response = await self.client.embeddings.create(
+            model=self.model, input=texts
+        )
+        vectors = np.array(
+            [item.embedding for item in response.data], dtype=np.float32
+        )
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1.0
+        return vectors / norms
+
+
+class VectorIndex:
+    """
+    Brute-force cosine nearest-neighbour index over normalized vectors,
+    stored in one contiguous NumPy matrix so a lookup is a single
+    matrix-vector product. Removed rows are zeroed and reused.
+    """
+
+    def __init__(self, dimension: int, capacity: int = 1024):
+        self.dimension = dimension
+        self._matrix = np.zeros((capacity, dimension), dtype=np.float32)
+        self._keys = []
+        self._rows = {}
+        self._free = []
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rows
+
+    def keys(self) -> list:
+        return list(self._rows)
+
+    def add_batch(self, keys: list, vectors: np.ndarray):
+        for key, vector in zip(keys, vectors):
+            row = self._rows.get(key)
+            if row is None:
+                if self._free:
+                    row = self._free.pop()
+                    self._keys[row] = key
+                else:
+                    row = len(self._keys)
+                    if row == len(self._matrix):
+                        self._matrix = np.concatenate(
+                            [self._matrix, np.zeros_like(self._matrix)]
+                        )
+                    self._keys.append(key)
+                self._rows[key] = row
+            self._matrix[row] = vector
+
+    def remove(self, key: str):
+        row = self._rows.pop(key, None)
+        if row is None:
+            return
+        self._matrix[row] = 0.0
+        self._keys[row] = None
+        self._free.append(row)
+
+    def search(self, vector: np.ndarray, k: int = 1) -> list:
+        """
+        Return up to `k` (key, cosine similarity) pairs, best first.
+        """
+        used = len(self._keys)
+        if not self._rows:
+            return []
+        scores = self._matrix[:used] @ vector
+        k = min(k, used)
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top])]
+        return [
+            (self._keys[row], float(scores[row]))
+            for row in top
+            if self._keys[row] is not None
+        ]
+
+
+class SemanticCache:
+    """
+    Embedding-based lookup in front of an AnswerCache.
+
+    Queries are embedded and matched against the embeddings of cached
+    queries; a neighbour above `threshold` cosine similarity whose answer is
+    still in the answer store is a hit. New keys are queued and embedded in
+    batches, and the index follows the answer store's evictions.
+    """
+
+    def __init__(self, embedder: Embedder, answers, threshold: float = 0.9,
+                 batch_size: int = 32, candidates: int = 4):
+        self.embedder = embedder
+        self.answers = answers
+        self.threshold = threshold
+        self.batch_size = batch_size
+        self.candidates = candidates
+        self.index = VectorIndex(embedder.dimension)
+        self.hits = 0
+        self.misses = 0
+        self._pending = []
+        self._latencies = deque(maxlen=1000)
+        answers.add_eviction_listener(self.remove)
+
+    def add(self, key: str):
+        """
+        Queue `key` for embedding; it is indexed on the next flush.
+        """
+        self._pending.append(key)
+
+    async def add_batch(self, keys: list):
+        """
+        Embed and index `keys` in a single embedder call.
+        """
+        keys = [key for key in dict.fromkeys(keys) if key not in self.index]
+        if keys:
+            self.index.add_batch(keys, await self.embedder.embed(keys))
+
+    async def flush(self):
+        pending, self._pending = self._pending, []
+        for start in range(0, len(pending), self.batch_size):
+            try:
+                await self.add_batch(pending[start:start + self.batch_size])
+            except Exception:
+                # Keep the unindexed keys for the next flush instead of
+                # losing them to a transient embedder failure.
+                self._pending[:0] = pending[start:]
+                raise
+        # Evictions made by other processes are only noticed on lookup;
+        # compact once dead keys clearly outnumber the live ones.
+        if len(self.index) > 2 * self.answers.maxsize:
+            keys = self.index.keys()
+            for key in await self.answers.run_io(self._dead, keys):
+                self.remove(key)
+
+    def _dead(self, keys: list) -> list:
+        return [key for key in keys if key not in self.answers]
+
+    def remove(self, key: str):
+        self.index.remove(key)
+
+    async def lookup(self, query: str):
+        """
+        Return the cached query semantically closest to `query`, or None.
+        """
+        start = time.perf_counter()
+        await self.flush()
+        match = None
+        if len(self.index):
+            vector = (await self.embedder.embed([query]))[0]
+            for key, score in self.index.search(vector, self.candidates):
+                if score < self.threshold:
+                    break
+                if await self.answers.run_io(self.answers.__contains__, key):
+                    match = key
+                    break
+                # Evicted by another worker sharing the answer store.
+                self.remove(key)
+        self._latencies.append(time.perf_counter() - start)
+        if match is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return match
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        latencies = sorted(self._latencies)
+        return {
+            "indexed": len(self.index),
+            "threshold": self.threshold,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "lookup_ms_p50": round(latencies[len(latencies) // 2] * 1000, 3)
+            if latencies else None,
+            "lookup_ms_p95": round(
+                latencies[int(len(latencies) * 0.95)] * 1000, 3
+            ) if latencies else None,
+        }
+
+
+def create_semantic_cache(answers, openai_client=None):
+    """
+    Build the semantic cache configured by the ASSIST_SEMANTIC_* environment
+    variables, or return None when it is disabled.
+    """
+    if os.getenv("ASSIST_SEMANTIC_CACHE", "0").lower() not in ("1", "true"):
+        return None
+    threshold = float(os.getenv("ASSIST_SEMANTIC_THRESHOLD", "0.9"))
+    embedder_name = os.getenv("ASSIST_SEMANTIC_EMBEDDER", "hashing")
+    if embedder_name == "openai":
+        embedder = OpenAIEmbedder(
+            openai_client,
+            model=os.getenv(
+                "ASSIST_SEMANTIC_MODEL", "text-embedding-3-small"
+            ),
+        )
+    elif embedder_name == "hashing":
+        embedder = HashingEmbedder()
+    else:
+        raise ValueError(f"Unknown ASSIST_SEMANTIC_EMBEDDER: {embedder_name}")
+    logger.info(
+        f"Semantic assist cache enabled ({embedder_name}, "
+        f"threshold {threshold})"
+    )
+    semantic_cache = SemanticCache(embedder, answers, threshold=threshold)
+    # Index what the (possibly persistent) answer store already holds.
+    for key in answers.keys():
+        semantic_cache.add(key)
+    return semantic_cache
@@ -0,0 +1,144 @@
+# backend/utils/singleflight.py
+
+import asyncio
+import inspect
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class Flight:
+    """
+    Chunks produced so far by one in-flight upstream stream.
+
+    Any number of subscribers can iterate it; each one first replays the
+    chunks already produced and then follows the live stream.
+    """
+
+    def __init__(self):
+        self.chunks = []
+        self.done = False
+        self.error = None
+        self.subscribers = 0
+        self.task = None
+        self._changed = asyncio.Event()
+
+    def _notify(self):
+        # Wake everyone waiting on the current event and hand out a fresh one
+        # for the next change.
+        changed, self._changed = self._changed, asyncio.Event()
+        changed.set()
+
+    def publish(self, chunk: str):
+        self.chunks.append(chunk)
+        self._notify()
+
+    def finish(self, error: Exception = None):
+        self.done = True
+        self.error = error
+        self._notify()
+
+    async def wait_started(self):
+        """
+        Wait until the first chunk is available or the stream has ended.
+
+        Raises:
+            Exception: The upstream error if the stream failed before
+            producing anything.
+        """
+        while not self.chunks and not self.done:
+            await self._changed.wait()
+        if not self.chunks and self.error is not None:
+            raise self.error
+
+    async def subscribe(self):
+        """
+        Async generator yielding every chunk of the stream from the start.
+        """
+        self.subscribers += 1
+        index = 0
+        while True:
+            while index < len(self.chunks):
+                yield self.chunks[index]
+                index += 1
+            if self.done:
+                if self.error is not None:
+                    raise self.error
+                return
+            await self._changed.wait()
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent producers for the same key into a single flight.
+
+    The first caller for a key starts the producer as a background task, so
+    the upstream stream keeps going for the other subscribers even if the
+    caller that started it disconnects.
+    """
+
+    def __init__(self):
+        self._flights = {}
+
+    def __contains__(self, key) -> bool:
+        return key in self._flights
+
+    def __len__(self) -> int:
+        return len(self._flights)
+
+    def get(self, key) -> Flight:
+        return self._flights.get(key)
+
+    def start(self, key, producer, on_complete=None, on_finally=None) -> Flight:
+        """
+        Start a flight for `key` fed by the async iterable `producer`.
+
+        Args:
+            key: Coalescing key, e.g. the normalized query.
+            producer: Async iterable of chunks; consumed exactly once.
+            on_complete: Called with the list of chunks after the producer
+                finished successfully and the subscribers were released,
+                but before the flight is unregistered; awaited if it
+                returns an awaitable.
+            on_finally: Called once the flight has ended either way.
+
+        Returns:
+            Flight: The new flight, already registered under `key`.
+        """
+        flight = Flight()
+        self._flights[key] = flight
+        flight.task = asyncio.create_task(
+            self._run(key, flight, producer, on_complete, on_finally)
+        )
+        return flight
+
+    async def _run(self, key, flight, producer, on_complete, on_finally):
+        try:
+            try:
+                async for chunk in producer:
+                    flight.publish(chunk)
+            except Exception as e:
+                logger.error(f"In-flight stream for {key!r} failed: {e}")
+                flight.finish(e)
+                return
+            flight.finish()
+            if on_complete is not None:
+                # Requests arriving meanwhile still join this flight and
+                # replay its chunks rather than calling upstream again.
+                try:
+                    result = on_complete(flight.chunks)
+                    if inspect.isawaitable(result):
+                        await result
+                except Exception as e:
+                    logger.error(
+                        f"Completion callback for {key!r} failed: {e}"
+                    )
+        finally:
+            if not flight.done:
+                # Cancelled (e.g. on shutdown): release the subscribers too.
+                flight.finish(RuntimeError("Upstream stream was cancelled."))
+                if hasattr(producer, "aclose"):
+                    await producer.aclose()
+            self._flights.pop(key, None)
+            if on_finally is not None:
+                on_finally()
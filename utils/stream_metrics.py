@@ -0,0 +1,103 @@
+# backend/utils/stream_metrics.py
+
+import logging
+import time
+from collections import defaultdict, deque
+
+logger = logging.getLogger(__name__)
+
+# Recent samples kept per source for percentile estimates
+SAMPLE_SIZE = 2048
+
+
+def _percentiles(samples) -> dict:
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    ordered = sorted(samples)
+    last = len(ordered) - 1
+    return {
+        f"p{p}": round(ordered[min(last, int(len(ordered) * p / 100))], 2)
+        for p in (50, 95, 99)
+    }
+
+
+class StreamMetrics:
+    """
+    Per-source statistics of streamed /assist responses: time to first
+    byte, total stream duration, chunk count and bytes sent.
+
+    Sources are "upstream" (this request called OpenAI), "coalesced" (it
+    joined another request's stream), "cache" and "semantic".
+
+    Not thread-safe: record and snapshot from the event loop only.
+    """
+
+    def __init__(self):
+        self._streams = defaultdict(int)
+        self._failed = defaultdict(int)
+        self._chunks = defaultdict(int)
+        self._bytes = defaultdict(int)
+        self._ttfb_ms = defaultdict(lambda: deque(maxlen=SAMPLE_SIZE))
+        self._duration_ms = defaultdict(lambda: deque(maxlen=SAMPLE_SIZE))
+
+    def record(self, source: str, ttfb: float, duration: float, chunks: int,
+               size: int, failed: bool = False):
+        self._streams[source] += 1
+        self._chunks[source] += chunks
+        self._bytes[source] += size
+        if failed:
+            self._failed[source] += 1
+        if ttfb is not None:
+            self._ttfb_ms[source].append(ttfb * 1000)
+        self._duration_ms[source].append(duration * 1000)
+
+    def snapshot(self) -> dict:
+        return {
+            source: {
+                "streams": count,
+                "failed": self._failed[source],
+                "chunks": self._chunks[source],
+                "bytes": self._bytes[source],
+                "ttfb_ms": _percentiles(self._ttfb_ms[source]),
+                "duration_ms": _percentiles(self._duration_ms[source]),
+            }
+            for source, count in self._streams.items()
+        }
+
+    def reset(self):
+        self.__init__()
+
+    async def instrument(self, chunks, source: str, started: float):
+        """
+        Wrap an async chunk iterator, recording its metrics once the stream
+        ends (completed, failed or abandoned by the client).
+
+        Args:
+            chunks: Async iterable of str chunks sent to the client.
+            source (str): Where the answer comes from.
+            started (float): time.perf_counter() when the request arrived.
+        """
+        ttfb = None
+        count = 0
+        size = 0
+        failed = True
+        try:
+            async for chunk in chunks:
+                if ttfb is None:
+                    ttfb = time.perf_counter() - started
+                count += 1
+                size += len(chunk.encode("utf-8"))
+                yield chunk
+            failed = False
+        finally:
+            duration = time.perf_counter() - started
+            self.record(source, ttfb, duration, count, size, failed=failed)
+            logger.info(
+                f"assist stream source={source} "
+                f"ttfb_ms={ttfb * 1000 if ttfb is not None else -1:.1f} "
+                f"duration_ms={duration * 1000:.1f} chunks={count} "
+                f"bytes={size} failed={failed}"
+            )
+
+
+stream_metrics = StreamMetrics()